@@ -13,8 +13,9 @@ class Predictor(YaBaseAPIHandler):
         'complete': "complete"
     })
 
-    def __init__(self, api_key: str, xml: bool=False, version: str='1'):
-        super(Predictor, self).__init__(api_key, xml, version)
+    def __init__(self, api_key: str, xml: bool=False, version: str='1',
+                 **kwargs):
+        super(Predictor, self).__init__(api_key, xml, version, **kwargs)
         self._url = self._base_url.format(version=self._v, json=self._json)
 
     def get_langs(self, **params) -> ...:
@@ -39,8 +40,15 @@ class Predictor(YaBaseAPIHandler):
             Wrapper for 'complete' API method.
 
             https://tech.yandex.ru/predictor/doc/dg/reference/complete-docpage/
+
+            Use CompletionCache as 'cache' to answer consecutive prefixes
+            without requests (JSON or typed results only).
         """
-        if lang not in self.get_langs():
+        key = self._complete_key(lang, q, limit, parameters)
+        cached = self._cached_completion(key)
+        if cached is not None:
+            return cached
+        if not self._lang_supported(lang):
             raise YaTranslateException(501)
         params = super(Predictor, self)._form_params(
             lang=lang,
@@ -48,6 +56,23 @@ class Predictor(YaBaseAPIHandler):
             limit=limit,
             **parameters
         )
-        return super(Predictor, self).make_combined_request(
+        response = super(Predictor, self).make_combined_request(
             "complete", post, **params
         )
+        self._cache_set(key, response)
+        return response
+
+    def _complete_key(self, lang: str, q: str, limit: int,
+                      parameters: dict) -> tuple or None:
+        """Key of CompletionCache (JSON or typed results only)."""
+        if self._cache is not None and (self._json or self._typed) and \
+                not parameters:
+            return lang, q, limit
+        return None
+
+    def _cached_completion(self, key: tuple or None) -> ...:
+        cached = self._cache_get(key, "complete")
+        if self._typed and isinstance(cached, dict):
+            from .results import Completion
+            return Completion.from_json(cached)
+        return cached
@@ -1,6 +1,13 @@
 import re
+from collections import deque
 
-from . import YaBaseAPIHandler
+try:
+    from collections.abc import Callable
+except ImportError:  # Python 3.2 and older
+    from collections import Callable
+
+from . import YaBaseAPIHandler, YaTranslateException
+from .utils import parallel_map
 
 
 class Translator(YaBaseAPIHandler):
@@ -16,8 +23,22 @@ class Translator(YaBaseAPIHandler):
         'translate': "translate"
     })
 
-    def __init__(self, api_key: str, xml: bool=False, version: str='1.5'):
-        super(Translator, self).__init__(api_key, xml, version)
+    # max size of texts for one request: POST limit is in symbols,
+    # GET one is in bytes of URL-encoded texts (browser can handle long
+    # GET requests up to approximately 9Kb, the rest is left for other
+    # params)
+    _GET_LIMIT = 8 * 1024
+    _POST_LIMIT = 10000
+
+    def __init__(self, api_key: str, xml: bool=False, version: str='1.5',
+                 **kwargs):
+        self._workers = kwargs.pop("workers", 4)  # for long and bulk texts
+        # offline language detection before detect requests (disabled)
+        self._detector = kwargs.pop("local_detect", None)
+        if self._detector is True:
+            from .langid import LanguageDetector
+            self._detector = LanguageDetector()
+        super(Translator, self).__init__(api_key, xml, version, **kwargs)
         self._url = self._base_url.format(version=self._v, json=self._json)
 
     def get_langs(self, lang: str='en', **params) -> ...:
@@ -57,54 +78,218 @@ class Translator(YaBaseAPIHandler):
             Wrapper for detect API method.
 
             https://tech.yandex.com/translate/doc/dg/reference/detect-docpage/
+
+            With 'local_detect' language is detected offline when detector
+            is confident, otherwise its most probable languages are sent
+            as 'hint'.
+        """
+        key = self._cache_key("detect", text, hint, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        detected, params = self._detect_params(text, hint, parameters)
+        if detected is not None:
+            return detected
+        response = self._detected(super(Translator, self)
+                                  .make_combined_request("detect", post,
+                                                         **params))
+        self._cache_set(key, response)
+        return response
+
+    def _detect_params(self, text: str, hint: list or None,
+                       parameters: dict) -> tuple:
+        """
+            Returns (language detected offline, None) or (None, params
+            of detect request).
         """
         if hint and not isinstance(hint, list):
             raise ValueError("'hint' should be type {}".format(type(list)))
-        params = super(Translator, self)._form_params(
-            text=text,
-            hint=hint,
-            **parameters
+        if self._detector is not None and "callback" not in parameters:
+            lang, __ = self._detector.detect(text, hint)
+            if lang is not None:
+                return lang if self._json else self._detected_xml(lang), None
+            hint = hint or self._detector.candidates(text) or None
+        return None, self._form_params(text=text, hint=hint, **parameters)
+
+    def _detected(self, response: ...) -> ...:
+        """Result of detect request: language for JSON."""
+        if self._json:
+            return response['lang']
+        return response
+
+    @staticmethod
+    def _detected_xml(lang: str) -> ...:
+        """Detect response in XML for language detected offline."""
+        from xml.etree import ElementTree
+        return ElementTree.Element("DetectedLang", code="200", lang=lang)
+
+    def _request_limit(self, post: bool) -> tuple:
+        """(limit, function measuring text) for texts of one request."""
+        if post:
+            return self._POST_LIMIT, len
+        return self._GET_LIMIT, self._url_size
+
+    @staticmethod
+    def _url_size(text: str) -> int:
+        """
+            Size of text param in URL (non-ASCII symbol takes 6-12 bytes).
+        """
+        from urllib.parse import quote_plus
+        return len("&text=") + len(quote_plus(text))
+
+    def _translate_long_get(self, text: str, language: str,
+                            **params) -> ...:
+        """Translates text longer then GET limit by parts."""
+        return self._translate_long(text, language, post=False, **params)
+
+    def _translate_long_post(self, text: str, language: str,
+                             **params) -> ...:
+        """Translates text longer then POST limit by parts."""
+        return self._translate_long(text, language, post=True, **params)
+
+    def _translate_long(self, text: str, language: str,
+                        formatting: str="plain", options: int=1,
+                        post: bool=False, **parameters) -> ...:
+        """
+            Splits text by sentences (HTML by elements), translates parts
+            concurrently and joins them back (whitespaces between parts
+            and not translated markup are kept).
+
+            Returns response of the same structure as for short text.
+        """
+        parts, cores = self._long_parts(text, formatting, post)
+        if not cores:
+            return self._translate("", language, formatting, options, post,
+                                   **parameters)
+        translated, responses = self._translate_packs(
+            cores, language, formatting, options, post, **parameters
         )
-        response = super(Translator, self).make_combined_request(
-            "detect", post, **params
+        return self._join_long(parts, translated, responses[0])
+
+    def _long_parts(self, text: str, formatting: str, post: bool) -> tuple:
+        """
+            Splits long text into parts for _translate_long.
+
+            Returns ((leading spaces, text, trailing spaces) parts, not blank
+            texts of parts to translate) pair.
+        """
+        limit, size = self._request_limit(post)
+        if formatting == "html":
+            chunks = self._separate_html(text, limit, size)
+        else:
+            chunks = [(chunk, True)
+                      for chunk in self._separate_text(text, limit, size)]
+        parts = []  # (leading spaces, text, trailing spaces)
+        for chunk, translate in chunks:
+            core = chunk.strip() if translate else ""
+            if not core:
+                parts.append((chunk, "", ""))
+                continue
+            start = chunk.index(core)
+            parts.append((chunk[:start], core, chunk[start + len(core):]))
+        return parts, [core for __, core, __ in parts if core]
+
+    def _join_long(self, parts: list, translated: list,
+                   response: ...) -> ...:
+        """Response for long text made of response for its first part."""
+        translated = iter(translated)
+        result = "".join(
+            lead + (next(translated) if core else "") + trail
+            for lead, core, trail in parts
         )
+        if self._typed:
+            from .results import Translation
+            return Translation(response.lang, (result, ))
         if self._json:
-            return response['lang']
+            response['text'] = [result]
+            return response
+        from xml.etree import ElementTree
+        for node in response.findall('text'):
+            response.remove(node)
+        node = ElementTree.SubElement(response, 'text')
+        node.text = result
         return response
 
-    # @TODO: 2..10Kb for GET
-    def _translate_long_get(self, text: str) -> ...:
-        return NotImplemented
+    # separators by priority: paragraphs, lines, sentences, words
+    _SEPARATORS = (
+        re.compile(r"\n\s*\n\s*"),
+        re.compile(r"\n\s*"),
+        re.compile(r"[.!?\u2026]+[\"'\u00bb)\]]*\s+"),
+        re.compile(r"[;:,]\s+"),
+        re.compile(r"\s+"),
+    )
 
-    # @TODO: 10K symbols for POST
-    def _translate_long_post(self, text: str) -> ...:
-        return NotImplemented
+    @staticmethod
+    def _separate_text(text: str, limit: int, size: Callable=len) -> list:
+        """
+            Splits text into parts not bigger then limit ('size' of part is
+            its length by default).
+
+            Text is separated by paragraphs, sentences or words when possible,
+            joining all parts gives original text.
+        """
+        parts = []
+        start = 0
+        while True:
+            window = text[start:start + limit]
+            # multibyte symbols: shrink window proportionally until it fits
+            while len(window) > 1 and size(window) > limit:
+                window = window[:max(1, len(window) * limit // size(window))]
+            if start + len(window) >= len(text):
+                break
+            cut = 0
+            for separator in Translator._SEPARATORS:
+                ends = [match.end() for match in separator.finditer(window)]
+                if not ends:
+                    continue
+                cut = max(cut, ends[-1])
+                # don't make parts too small if less priority cut is better
+                if cut >= len(window) // 2:
+                    break
+            if not cut:
+                cut = len(window)
+            parts.append(text[start:start + cut])
+            start += cut
+        if start < len(text) or not parts:
+            parts.append(text[start:])
+        return parts
 
-    # @TODO: add semantic separation
     @staticmethod
-    def _separate_text(text: str, limit: int) -> list:
-        size = len(text)
-        parts_count = int((size + limit - 1) // limit)
-        return [text[part:part + limit] for part in range(0, size, limit)]
+    def _separate_html(text: str, limit: int, size: Callable=len) -> list:
+        """
+            Splits HTML into parts not longer then limit between elements
+            (blocks when possible), so markup of every part is balanced.
+
+            Returns (part, translate) pairs, tags of elements split into
+            several parts aren't translated.
+        """
+        from .markup import split_html
+        return split_html(text, limit, Translator._separate_text, size)
 
-    # @TODO: add list separation by contained text
     @staticmethod
-    def _separate_texts(texts: list, limit: int) -> list:
-        separated_list = [[]]
-        partion_size = 0
-        idx = 0
-        for text in texts:
-            if len(text) <= limit - partion_size:
-                separated_list[idx].append(text)
-                continue
-            text_parts = Translator._separate_text(text, limit - partion_size)
-            separated_list[idx].append((text_parts[0]))
-            separated_list.append([])
-            idx += 1
-            separated_list[idx].append(("".join(text_parts[1:])))
-            separated_list.append([])
-            idx += 1
-        return NotImplemented
+    def _separate_texts(texts: list, limit: int, max_count: int=None,
+                        size: Callable=len) -> list:
+        """
+            Packs texts into groups with total size not more then limit.
+
+            Returns list of groups of texts indexes (texts order is kept).
+            Texts bigger then limit are placed into separate groups.
+        """
+        packs = []
+        pack = []
+        pack_size = 0
+        for idx, text in enumerate(texts):
+            text_size = size(text)
+            if pack and (pack_size + text_size > limit or
+                         (max_count and len(pack) >= max_count)):
+                packs.append(pack)
+                pack = []
+                pack_size = 0
+            pack.append(idx)
+            pack_size += text_size
+        if pack:
+            packs.append(pack)
+        return packs
 
     # @FIXME: some cases of parsing are incorrect
     @staticmethod
@@ -122,29 +307,208 @@ class Translator(YaBaseAPIHandler):
             Wrapper for translate API method.
 
            https://tech.yandex.com/translate/doc/dg/reference/translate-docpage
+
+            Texts longer then request limit are translated by parts,
+            HTML (formatting="html") is split between elements.
         """
-        params = super(Translator, self)._form_params(
+        key = self._cache_key("translate", text, language, formatting,
+                              options, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        response = self._translate(text, language, formatting, options, post,
+                                   **parameters)
+        self._cache_set(key, response)
+        return response
+
+    def _translate(self, text: str or list, language: str,
+                   formatting: str="plain", options: int=1, post: bool=False,
+                   **parameters) -> ...:
+        """Makes translate request without caching."""
+        params = self._translate_params(text, language, formatting, options,
+                                        post, parameters)
+        if params is None:
+            return self._translate_long(text, language, formatting, options,
+                                        post, **parameters)
+        return self._translated(super(Translator, self).make_combined_request(
+            "translate", post, **params
+        ))
+
+    def _translate_params(self, text: str or list, language: str,
+                          formatting: str, options: int, post: bool,
+                          parameters: dict) -> dict or None:
+        """
+            Params of translate request (None if text is too long for one
+            request).
+        """
+        limit, size = self._request_limit(post)
+        if isinstance(text, str) and size(text) > limit:
+            return None
+        return super(Translator, self)._form_params(
             text=text,
             list_exceptions={"text"},
             lang=language,
             format=formatting,
             options=options,
-            ** parameters
-        )
-        # assume that unicode character is 2 bytes long and browser can handle
-        # long GET requests (up to approximately 9Kb)
-        if not post and isinstance(text, str) and len(text) >= (9 * 1024) / 2:
-            self._logger.warning("Long text processing still not implemented!")
-            ...
-        elif post and isinstance(text, str) and len(text) >= 10000:
-            self._logger.warning("Long text processing still not implemented!")
-            ...
-        response = super(Translator, self).make_combined_request(
-            "translate", post, **params
+            **parameters
         )
-        if self._json:
+
+    def _translated(self, response: ...) -> ...:
+        if self._json and not self._typed:
             del response['code']  # this information is redundant
-            if isinstance(text, list) and len(response['text']) == 1:
-                self._logger.warning("List parsing still not implemented!")
-                # response['text'] = self._str2list(response['text'][0])
         return response
+
+    def _response_texts(self, response: ...) -> list:
+        """Extracts list of translated texts from translate response."""
+        if self._typed:
+            return list(response.text)
+        if self._json:
+            return response['text']
+        return [node.text or "" for node in response.findall('text')]
+
+    def _translate_packs(self, texts: list, language: str,
+                         formatting: str="plain", options: int=0,
+                         post: bool=True, workers: int=None,
+                         max_count: int=None, **parameters) -> tuple:
+        """
+            Packs texts into requests and sends them concurrently.
+
+            Returns (list of translated texts, list of responses) pair.
+        """
+        limit, size = self._request_limit(post)
+        packs = self._separate_texts(texts, limit, max_count, size)
+
+        def translate_pack(pack: list) -> ...:
+            if len(pack) == 1 and size(texts[pack[0]]) > limit:
+                return self._translate_long(
+                    texts[pack[0]], language, formatting=formatting,
+                    options=options, post=post, **parameters
+                )
+            return self._translate(
+                [texts[idx] for idx in pack], language,
+                formatting=formatting, options=options, post=post,
+                **parameters
+            )
+
+        responses = parallel_map(translate_pack, packs,
+                                 workers or self._workers)
+        return self._packs_texts(len(texts), packs, responses), responses
+
+    def _packs_texts(self, count: int, packs: list, responses: list) -> list:
+        """Translated texts in input order from responses for packs."""
+        results = [None] * count
+        for pack, response in zip(packs, responses):
+            translated = self._response_texts(response)
+            if len(translated) != len(pack):
+                raise YaTranslateException(422)
+            for idx, text in zip(pack, translated):
+                results[idx] = text
+        return results
+
+    def translate_many(self, texts: list, language: str,
+                       formatting: str="plain", post: bool=True,
+                       workers: int=None, max_count: int=None,
+                       **parameters) -> list:
+        """
+            Translates many texts using as few requests as possible.
+
+            Texts are packed into requests (multiple 'text' params) up to
+            request size limit, packs are sent concurrently by 'workers'
+            threads. Returns list of translated texts in input order.
+            Only texts missed in cache (if enabled) and not blank are sent.
+        """
+        texts = list(texts)
+        keys, results, missed = self._cached_texts(texts, language,
+                                                   formatting, parameters)
+        if not missed:
+            return results
+        translated = self._translate_packs(
+            [texts[idx] for idx in missed], language, formatting, 0, post,
+            workers, max_count, **parameters
+        )[0]
+        self._store_texts(keys, results, missed, translated)
+        return results
+
+    def _cached_texts(self, texts: list, language: str, formatting: str,
+                      parameters: dict) -> tuple:
+        """
+            Returns (cache keys, results with None for texts to translate,
+            indexes of texts to translate) for translate_many.
+        """
+        keys = [self._cache_key("translate_text", text, language, formatting,
+                                **parameters) for text in texts]
+        # blank texts don't need translation
+        results = [self._cache_get(key) if text.strip() else text
+                   for key, text in zip(keys, texts)]
+        missed = [idx for idx, result in enumerate(results) if result is None]
+        return keys, results, missed
+
+    def _store_texts(self, keys: list, results: list, missed: list,
+                     translated: list) -> None:
+        for idx, text in zip(missed, translated):
+            results[idx] = text
+            self._cache_set(keys[idx], text)
+
+    def _stream_packs(self, texts: ..., post: bool, max_count: int) -> ...:
+        """Groups iterable of texts into lists not bigger then size limit."""
+        limit, size = self._request_limit(post)
+        pack = []
+        pack_size = 0
+        for text in texts:
+            text_size = size(text)
+            if pack and (pack_size + text_size > limit or
+                         len(pack) >= max_count):
+                yield pack
+                pack = []
+                pack_size = 0
+            pack.append(text)
+            pack_size += text_size
+        if pack:
+            yield pack
+
+    def translate_stream(self, texts: ..., language: str,
+                         formatting: str="plain", post: bool=True,
+                         workers: int=None, ordered: bool=True,
+                         max_count: int=50, **parameters) -> ...:
+        """
+            Translates (possibly endless) iterable of texts lazily.
+
+            Texts are packed by up to 'max_count' into requests, not more
+            then 'workers' requests are in flight, so memory usage doesn't
+            depend on input size. Yields translated texts in input order
+            or (index, translated text) pairs as soon as they are ready
+            if not 'ordered'.
+        """
+        from concurrent.futures import (
+            FIRST_COMPLETED, ThreadPoolExecutor, wait
+        )
+        workers = workers or self._workers
+        pending = deque()  # (index of first text, future)
+
+        def translate_pack(pack: list) -> list:
+            return self.translate_many(pack, language, formatting, post,
+                                       workers=1, **parameters)
+
+        def pop_ready() -> list:
+            """Results of the first pack (or of any finished packs)."""
+            if ordered:
+                return pending.popleft()[1].result()
+            done = wait([future for __, future in pending],
+                        return_when=FIRST_COMPLETED).done
+            ready = []
+            for pack in [pack for pack in pending if pack[1] in done]:
+                pending.remove(pack)
+                ready.extend(enumerate(pack[1].result(), pack[0]))
+            return ready
+
+        start = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for pack in self._stream_packs(texts, post, max_count):
+                pending.append((start, pool.submit(translate_pack, pack)))
+                start += len(pack)
+                if len(pending) >= workers:
+                    for item in pop_ready():
+                        yield item
+            while pending:
+                for item in pop_ready():
+                    yield item
@@ -1,3 +1,5 @@
+from threading import Event, Lock
+
 from . import YaTranslateException, YaBaseAPIHandler
 
 
@@ -22,8 +24,9 @@ class Dictionary(YaBaseAPIHandler):
     # word and translation:
     POS_FILTER = 8
 
-    def __init__(self, api_key: str, xml: bool=False, version: str='1'):
-        super(Dictionary, self).__init__(api_key, xml, version)
+    def __init__(self, api_key: str, xml: bool=False, version: str='1',
+                 **kwargs):
+        super(Dictionary, self).__init__(api_key, xml, version, **kwargs)
         self._url = self._base_url.format(version=self._v, json=self._json)
 
     def get_langs(self, **params) -> ...:
@@ -62,7 +65,11 @@ class Dictionary(YaBaseAPIHandler):
             text - text of the entry, translation, or synonym (mandatory)
             pos - part of speech (may be omitted)
         """
-        if lang not in self.get_langs():
+        key = self._cache_key("lookup", text, lang, ui, flags, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        if not self._lang_supported(lang):
             raise YaTranslateException(501)
         params = super(Dictionary, self)._form_params(
             text=text,
@@ -71,10 +78,14 @@ class Dictionary(YaBaseAPIHandler):
             flags=flags,
             **parameters
         )
-        response = super(Dictionary, self).make_combined_request(
-            "lookup", post, **params
-        )
-        if self._json:
+        response = self._looked_up(super(Dictionary, self)
+                                   .make_combined_request("lookup", post,
+                                                          **params))
+        self._cache_set(key, response)
+        return response
+
+    def _looked_up(self, response: ...) -> ...:
+        if self._json and not self._typed:
             del response['head']  # depreciated attribute
         return response
 
@@ -87,6 +98,8 @@ class Dictionary(YaBaseAPIHandler):
         """
         if "callback" in params:
             raise ValueError("Wrong usage of callback")
+        elif self._typed:
+            return self.lookup(text, lang, **params).entries
         elif not self._json:
             return NotImplemented
         return self.lookup(text, lang, **params).get("def", None)
@@ -124,7 +137,8 @@ class Speller(YaBaseAPIHandler):
     ERROR_TOO_MANY_ERRORS = 4
 
     def __init__(self, xml: bool=False, encoding: str='utf-8', **kwargs):
-        super(Speller, self).__init__(kwargs.get('api_key', '_'), xml)
+        api_key = kwargs.pop('api_key', '_')
+        super(Speller, self).__init__(api_key, xml, **kwargs)
         if encoding.lower() not in self.encodings:
             raise ValueError("Wrong encoding: {}".format(encoding.lower()))
         self._ie = encoding.lower()
@@ -166,23 +180,30 @@ class Speller(YaBaseAPIHandler):
             col – number or column with error
             len – length of incorrect word
         """
-        if endpoint not in self._endpoints:
-            raise ValueError("wrong endpoint {}".format(endpoint))
         if post:
             return NotImplemented
+        return super(Speller, self).make_combined_request(
+            endpoint, post=False, **self._check_params(
+                endpoint, text, lang, options, fmt, parameters
+            )
+        )
+
+    def _check_params(self, endpoint: str, text: str or list, lang: list,
+                      options: int, fmt: str, parameters: dict) -> dict:
+        """Params of checkText and checkTexts requests."""
+        if endpoint not in self._endpoints:
+            raise ValueError("wrong endpoint {}".format(endpoint))
         if list(filter((lambda l: l not in self.get_langs()), lang)):
             raise YaTranslateException(501)
-        params = super(Speller, self)._form_params(
+        return super(Speller, self)._form_params(
             text=text,
+            list_exceptions={"text"},
             lang=",".join(lang),
             options=options,
             format=fmt,
             ie=self._ie,
             **parameters
         )
-        return super(Speller, self).make_combined_request(
-            endpoint, post=False, **params
-        )
 
     def check_text(self, text: str, lang: list=["ru", "en"], options: int=0,
                    fmt: str="plain", post: bool=False, **parameters) -> ...:
@@ -221,3 +242,103 @@ class Speller(YaBaseAPIHandler):
 
     def checkTexts(self, text: list, **params) -> ...:
         return self.check_texts(text, **params)
+
+
+class _SpellBatch(object):
+    """Texts collected for one checkTexts request."""
+    __slots__ = ("texts", "chars", "results", "error", "full", "done")
+
+    def __init__(self):
+        self.texts = []
+        self.chars = 0
+        self.results = None
+        self.error = None
+        self.full = Event()
+        self.done = Event()
+
+
+class SpellerBatcher(object):
+    """
+        Collects concurrent check_text calls into checkTexts requests.
+
+        The first caller of a batch waits up to 'window' seconds (or until
+        batch is full) for other callers with the same options, then sends
+        all collected texts in one request and every caller gets its own
+        result, same as returned by Speller.check_text.
+
+        window - time to collect texts (in seconds)
+        max_texts - max number of texts in one request
+        max_chars - max total length of texts in one request
+    """
+
+    def __init__(self, speller: Speller, window: float=0.01,
+                 max_texts: int=100, max_chars: int=4000):
+        self._speller = speller
+        self.window = window
+        self.max_texts = max_texts
+        self.max_chars = max_chars
+        self._batches = {}  # options -> collecting batch
+        self._lock = Lock()
+        self._stats = {'requests': 0, 'texts': 0}
+
+    def _send(self, texts: list, lang: list, options: int, fmt: str,
+              parameters: dict) -> list:
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['texts'] += len(texts)
+        if len(texts) == 1:
+            return [self._speller.check_text(texts[0], lang, options, fmt,
+                                             **parameters)]
+        response = self._speller.check_texts(texts, lang, options, fmt,
+                                             **parameters)
+        results = list(response)  # SpellResult elements for XML
+        if len(results) != len(texts):
+            raise YaTranslateException(422)
+        return results
+
+    def check_text(self, text: str, lang: list=["ru", "en"], options: int=0,
+                   fmt: str="plain", **parameters) -> ...:
+        """Batched equivalent of Speller.check_text."""
+        key = (tuple(lang), options, fmt, tuple(sorted(parameters.items())))
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is not None and \
+                    batch.chars + len(text) > self.max_chars:
+                del self._batches[key]
+                batch.full.set()
+                batch = None
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = _SpellBatch()
+            idx = len(batch.texts)
+            batch.texts.append(text)
+            batch.chars += len(text)
+            if len(batch.texts) >= self.max_texts:
+                del self._batches[key]
+                batch.full.set()
+        if not leader:
+            batch.done.wait()
+        else:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            try:
+                batch.results = self._send(batch.texts, lang, options, fmt,
+                                           parameters)
+            except Exception as err:
+                batch.error = err
+            finally:
+                batch.done.set()
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[idx]
+
+    def checkText(self, text: str, **params) -> ...:
+        return self.check_text(text, **params)
+
+    @property
+    def stats(self) -> dict:
+        """Number of sent requests and checked texts."""
+        with self._lock:
+            return self._stats.copy()
@@ -10,23 +10,31 @@
 """
 
 from .mixins import YaBaseAPIHandler
-from .exc import YaTranslateException
+from .exc import (
+    YaCircuitOpenException, YaNetworkException, YaTranslateException
+)
 from .utils import Logger
+from .transport import ConnectionPool
+from .metrics import Metrics
+from .keys import KeyPool
 
 
-def Translator(api_key: str, xml: bool=False, version: str='1.5'):
+def Translator(api_key: str, xml: bool=False, version: str='1.5',
+               **kwargs):
     from .Translate import Translator
-    return Translator(api_key=api_key, xml=xml, version=version)
+    return Translator(api_key=api_key, xml=xml, version=version, **kwargs)
 
 
-def Dictionary(api_key: str, xml: bool=False, version: str='1'):
+def Dictionary(api_key: str, xml: bool=False, version: str='1',
+               **kwargs):
     from .Vocabulary import Dictionary
-    return Dictionary(api_key=api_key, xml=xml, version=version)
+    return Dictionary(api_key=api_key, xml=xml, version=version, **kwargs)
 
 
-def Predictor(api_key: str, xml: bool=False, version: str='1'):
+def Predictor(api_key: str, xml: bool=False, version: str='1',
+              **kwargs):
     from .Prediction import Predictor
-    return Predictor(api_key=api_key, xml=xml, version=version)
+    return Predictor(api_key=api_key, xml=xml, version=version, **kwargs)
 
 
 def Speller(xml: bool=False, encoding: str='utf-8', **kwargs):
@@ -35,4 +43,5 @@ def Speller(xml: bool=False, encoding: str='utf-8', **kwargs):
 
 
 __all__ = ["Dictionary", "Translator", "YaTranslateException",
-           "Predictor", "Speller"]
+           "Predictor", "Speller", "ConnectionPool", "YaNetworkException",
+           "YaCircuitOpenException", "Metrics", "KeyPool"]
@@ -0,0 +1,750 @@
+"""
+    asyncio clients for Yandex Linguistics APIs (Python 3.6+).
+
+    Async clients share endpoints, parameters forming, caching, splitting
+    of long texts and response parsing with blocking ones, but make requests
+    through non-blocking keep-alive connections, so a single event loop can
+    keep many requests in flight.
+"""
+
+import asyncio
+import ssl
+from collections import deque
+from copy import deepcopy
+from time import perf_counter, time
+from urllib import parse
+from xml.etree import ElementTree
+
+from .decoding import loads_json, parse_xml
+from .exc import YaNetworkException, YaTranslateException
+from .Prediction import Predictor
+from .Translate import Translator
+from .transport import Response
+from .Vocabulary import Dictionary, Speller
+
+
+class AsyncConnectionPool(object):
+    """
+        Per-host pool of keep-alive connections built on asyncio streams.
+
+        maxsize - max number of idle connections stored for each host
+        timeout - timeout for the whole request (connect, send and read)
+        idle_timeout - idle connections older than this (in seconds) are closed
+    """
+
+    def __init__(self, maxsize: int=100, timeout: float=None,
+                 idle_timeout: float=60):
+        if maxsize < 1:
+            raise ValueError("maxsize should be positive, got {}".format(
+                maxsize))
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._idle = {}  # (scheme, host, port) -> deque of (streams, time)
+        self._loop = None  # streams can't be shared between event loops
+        self._ssl_context = None
+        self._stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+    @staticmethod
+    def _host_key(url: str) -> tuple:
+        parts = parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError("Unsupported URL scheme: {}".format(scheme))
+        port = parts.port or (443 if scheme == "https" else 80)
+        return scheme, parts.hostname, port
+
+    async def _new_connection(self, host_key: tuple) -> tuple:
+        scheme, host, port = host_key
+        context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            context = self._ssl_context
+        self._stats['created'] += 1
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    async def _get_connection(self, host_key: tuple) -> tuple:
+        """Returns ((reader, writer), reused) pair."""
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._stats['discarded'] += sum(len(idle) for idle
+                                            in self._idle.values())
+            self._idle.clear()
+            self._loop = loop
+        idle = self._idle.get(host_key)
+        now = time()
+        while idle:
+            streams, last_used = idle.pop()
+            if now - last_used > self.idle_timeout or \
+                    streams[0].at_eof():
+                self._stats['discarded'] += 1
+                streams[1].close()
+                continue
+            self._stats['reused'] += 1
+            return streams, True
+        return await self._new_connection(host_key), False
+
+    def _put_connection(self, host_key: tuple, streams: tuple) -> None:
+        idle = self._idle.setdefault(host_key, deque())
+        if len(idle) < self.maxsize:
+            idle.append((streams, time()))
+            return
+        self._stats['discarded'] += 1
+        streams[1].close()
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> tuple:
+        """Returns (response, keep alive) pair."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        parts = status_line.decode('latin-1').rstrip("\r\n").split(" ", 2)
+        version, code = parts[0], int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ""
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, value = line.decode('latin-1').split(":", 1)
+            headers.append((name.strip(), value.strip()))
+        fields = dict((name.lower(), value) for name, value in headers)
+        keep_alive = version == "HTTP/1.1" and \
+            fields.get("connection", "").lower() != "close"
+        if "chunked" in fields.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if not size:
+                    # skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n",
+                                                            b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)  # CRLF after chunk
+            body = b"".join(chunks)
+        elif "content-length" in fields:
+            body = await reader.readexactly(int(fields["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return Response(code, reason, headers, body), keep_alive
+
+    async def _request(self, method: str, url: str, body: bytes,
+                       headers: dict) -> Response:
+        host_key = self._host_key(url)
+        parts = parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        headers = dict(headers or {})
+        headers.setdefault("Host", parts.netloc)
+        headers.setdefault("Accept-Encoding", "identity")
+        if body is not None:
+            headers.setdefault("Content-Type",
+                               "application/x-www-form-urlencoded")
+            headers["Content-Length"] = str(len(body))
+        head = "{} {} HTTP/1.1\r\n{}\r\n".format(
+            method, path,
+            "".join("{}: {}\r\n".format(key, value)
+                    for key, value in headers.items())
+        ).encode('latin-1')
+        streams, reused = await self._get_connection(host_key)
+        for attempt in (True, False):
+            reader, writer = streams
+            try:
+                writer.write(head + (body or b""))
+                await writer.drain()
+                response, keep_alive = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not (attempt and reused):
+                    raise
+                # server has closed idle connection, try once on a fresh one
+                streams = await self._new_connection(host_key)
+                continue
+            except BaseException:
+                writer.close()
+                raise
+            break
+        if keep_alive:
+            self._put_connection(host_key, streams)
+        else:
+            writer.close()
+        return response
+
+    async def urlopen(self, method: str, url: str, body: bytes=None,
+                      headers: dict=None) -> Response:
+        """Makes request using pooled connection and reads whole response."""
+        if self.timeout is None:
+            return await self._request(method, url, body, headers)
+        return await asyncio.wait_for(
+            self._request(method, url, body, headers), self.timeout
+        )
+
+    def clear(self) -> None:
+        """Closes all idle connections."""
+        for idle in self._idle.values():
+            for streams, __ in idle:
+                streams[1].close()
+        self._idle.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Counters of created, reused and discarded connections."""
+        stats = self._stats.copy()
+        stats['idle'] = sum(len(idle) for idle in self._idle.values())
+        return stats
+
+
+class AsyncMixin(object):
+    """
+        Replaces blocking request methods of YaBaseAPIHandler by coroutines.
+
+        concurrency - max number of requests in flight for one client
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._concurrency = kwargs.pop("concurrency", 100)
+        async_pool = kwargs.pop("pool", None)
+        super(AsyncMixin, self).__init__(*args, **kwargs)
+        self._pool = async_pool or AsyncConnectionPool()
+        self._semaphore = None  # created lazily inside running loop
+        self._semaphore_loop = None
+        # identical requests in flight: key -> [task, waiting, callers]
+        self._inflight = {} if self._flight is not None else None
+
+    def prewarm(self, count: int=1) -> NotImplemented:
+        return NotImplemented
+
+    async def _make_request(self, url: str, post: bool=False,
+                            **params) -> Response:
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+            self._semaphore_loop = loop
+        method, full_url, body = self._prepare_request(url, post, params)
+        host = parse.urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if self._keys is not None:
+                params['key'] = self._keys.acquire()
+                method, full_url, body = self._prepare_request(url, post,
+                                                               params)
+            # open circuit rejects request before it's charged by limiter
+            trial = self._breaker is not None and self._breaker.before(host)
+            if self._limiter is not None:
+                try:
+                    delay = self._limiter.reserve(params.get('key'),
+                                                  self._billed_chars(params))
+                    if delay:
+                        await asyncio.sleep(delay)
+                except BaseException as err:
+                    if trial:  # only requests which are sent are trial
+                        self._breaker.release(host)
+                    if isinstance(err, YaTranslateException) and \
+                            self._failover(params, err):
+                        continue
+                    raise
+            started = perf_counter()
+            try:
+                async with self._semaphore:
+                    response = await self._pool.urlopen(
+                        method, full_url, body=body, headers=self._headers
+                    )
+            except (OSError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError) as err:
+                error = YaNetworkException(err)
+                error.__cause__ = err
+                response = None
+            except BaseException:  # cancelled
+                if trial:
+                    self._breaker.release(host)
+                raise
+            else:
+                error = None
+                if response.code != 200:
+                    error = YaTranslateException(response.code)
+            if self._metrics.enabled:
+                self._observe_request(url, full_url, body, params, response,
+                                      error, started)
+            if error is not None and self._failover(params, error):
+                if self._breaker is not None:
+                    self._breaker.record(host, error.status_code)
+                continue
+            delay = self._attempt_done(host, error, attempt)
+            if error is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _make_request_xml(self, url: str, post: bool=False,
+                                **params) -> ElementTree.Element:
+        response = await self._make_request(url, post, **params)
+        return parse_xml(response.read())
+
+    async def _make_request_json(self, url: str, post: bool=False,
+                                 **params) -> ...:
+        response = await self._make_request(url, post, **params)
+        return loads_json(response.read())
+
+    async def _make_request_typed(self, url: str, post: bool=False,
+                                  **params) -> ...:
+        from .results import TYPES
+        response = await self._make_request(url, post, **params)
+        return TYPES[url.rsplit("/", 1)[-1]].from_body(response.read(),
+                                                       xml=not self._json)
+
+    async def _make_request_langs(self, url: str, post: bool=False,
+                                  **params) -> list:
+        response = await self._make_request(url, post, **params)
+        return self._parse_langs(response.read())
+
+    async def make_combined_request(self, endpoint: str, post: bool=False,
+                                    **params) -> ...:
+        parameters = {
+            'url': self._make_url(endpoint),
+            'post': post
+        }
+        parameters.update(params)
+        if not self._hooks['before'] and not self._hooks['after']:
+            return await self._combined_request(parameters)
+        self._run_hooks("before", endpoint, parameters)
+        started = perf_counter()
+        try:
+            result = await self._combined_request(parameters)
+        except Exception as err:
+            self._run_hooks("after", endpoint, parameters, None, err,
+                            perf_counter() - started)
+            raise
+        self._run_hooks("after", endpoint, parameters, result, None,
+                        perf_counter() - started)
+        return result
+
+    async def _combined_request(self, parameters: dict) -> ...:
+        if "callback" in parameters:
+            return await self._make_request(**parameters)
+        request = self._request_func(parameters['url'])
+        if self._inflight is None:
+            return await request(**parameters)
+        key = self._request_key(**parameters)
+        entry = self._inflight.get(key)
+        if entry is None:
+            # request is made by own task, so cancelled caller doesn't
+            # cancel it for others waiting for the same result
+            entry = self._inflight[key] = [None, 0, 0]
+            entry[0] = asyncio.ensure_future(
+                self._shared_request(key, entry, request, parameters)
+            )
+        entry[1] += 1
+        entry[2] += 1
+        try:
+            result = await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if not entry[1]:  # nobody waits for result anymore
+                entry[0].cancel()
+                self._forget_request(key, entry)
+            raise
+        if entry[2] > 1:
+            return deepcopy(result)
+        return result
+
+    async def _shared_request(self, key: tuple, entry: list,
+                              request: ..., parameters: dict) -> ...:
+        try:
+            return await request(**parameters)
+        finally:
+            self._forget_request(key, entry)
+
+    def _forget_request(self, key: tuple, entry: list) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    async def _get_langs(self, base_url: str, update: bool=False,
+                         **params) -> ...:
+        parameters = {'post': False}
+        parameters.update(**self._form_params(**params))
+        if "callback" in params:
+            return await self._make_request(
+                url=self._make_url("langs", base_url), **parameters
+            )
+        key = self._langs_key(parameters)
+        if not update and not self._cache_langs:
+            self._restore_langs(key)
+        if update or not self._cache_langs:
+            langs = await self.make_combined_request(endpoint="langs",
+                                                     **parameters)
+            self._save_langs(key, langs)
+        return self._cache_langs
+
+    async def _lang_supported(self, lang: str) -> bool:
+        index = self._langs_index
+        if index is None or not self._cache_langs:
+            await self.get_langs()
+            index = self._langs_index
+        return lang in index
+
+    async def _ok(self, url: str=None, func=None, *args, **params) -> bool:
+        if self._key_checked():
+            return True
+        try:
+            if func:
+                __ = await func(*args, **params)
+            else:
+                __ = await self._get_langs(url, update=True, *args, **params)
+        except YaTranslateException as err:
+            self._logger.warning(err)
+            self._api_key = dict(self._api_key, correct=False)
+            return False
+        self._api_key = dict(self._api_key, correct=True, timestamp=time())
+        return True
+
+    async def close(self) -> None:
+        """Closes idle connections of client pool."""
+        self._pool.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class AsyncTranslator(AsyncMixin, Translator):
+    """
+        Non-blocking Yandex Translator API client
+
+        for more info look on https://tech.yandex.com/translate/
+    """
+
+    async def get_langs(self, lang: str='en', **params) -> ...:
+        return await self._get_langs(self._url, ui=lang, **params)
+
+    async def getLangs(self, lang: str='en', **params) -> ...:
+        return await self.get_langs(lang, **params)
+
+    @property
+    def directions(self) -> NotImplemented:
+        return NotImplemented
+
+    @property
+    def languages(self) -> NotImplemented:
+        return NotImplemented
+
+    @property
+    def ok(self) -> NotImplemented:
+        return NotImplemented
+
+    async def check(self) -> bool:
+        """API key is correct"""
+        return await self._ok(self._url)
+
+    async def detect(self, text: str, hint: list=None, post: bool=False,
+                     **parameters) -> ...:
+        key = self._cache_key("detect", text, hint, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        detected, params = self._detect_params(text, hint, parameters)
+        if detected is not None:
+            return detected
+        response = self._detected(await self.make_combined_request(
+            "detect", post, **params
+        ))
+        self._cache_set(key, response)
+        return response
+
+    async def translate(self, text: str or list, language: str,
+                        formatting: str="plain", options: int=1,
+                        post: bool=False, **parameters) -> ...:
+        key = self._cache_key("translate", text, language, formatting,
+                              options, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        response = await self._translate(text, language, formatting, options,
+                                         post, **parameters)
+        self._cache_set(key, response)
+        return response
+
+    async def _translate(self, text: str or list, language: str,
+                         formatting: str="plain", options: int=1,
+                         post: bool=False, **parameters) -> ...:
+        params = self._translate_params(text, language, formatting, options,
+                                        post, parameters)
+        if params is None:
+            return await self._translate_long(text, language, formatting,
+                                              options, post, **parameters)
+        return self._translated(await self.make_combined_request(
+            "translate", post, **params
+        ))
+
+    async def _translate_long(self, text: str, language: str,
+                              formatting: str="plain", options: int=1,
+                              post: bool=False, **parameters) -> ...:
+        parts, cores = self._long_parts(text, formatting, post)
+        if not cores:
+            return await self._translate("", language, formatting, options,
+                                         post, **parameters)
+        translated, responses = await self._translate_packs(
+            cores, language, formatting, options, post, **parameters
+        )
+        return self._join_long(parts, translated, responses[0])
+
+    async def _translate_packs(self, texts: list, language: str,
+                               formatting: str="plain", options: int=0,
+                               post: bool=True, workers: int=None,
+                               max_count: int=None, **parameters) -> tuple:
+        limit, size = self._request_limit(post)
+        packs = self._separate_texts(texts, limit, max_count, size)
+        semaphore = asyncio.Semaphore(workers or self._workers)
+
+        async def translate_pack(pack: list) -> ...:
+            async with semaphore:
+                if len(pack) == 1 and size(texts[pack[0]]) > limit:
+                    return await self._translate_long(
+                        texts[pack[0]], language, formatting=formatting,
+                        options=options, post=post, **parameters
+                    )
+                return await self._translate(
+                    [texts[idx] for idx in pack], language,
+                    formatting=formatting, options=options, post=post,
+                    **parameters
+                )
+
+        responses = await asyncio.gather(*[translate_pack(pack)
+                                           for pack in packs])
+        return self._packs_texts(len(texts), packs, responses), responses
+
+    async def translate_many(self, texts: list, language: str,
+                             formatting: str="plain", post: bool=True,
+                             workers: int=None, max_count: int=None,
+                             **parameters) -> list:
+        texts = list(texts)
+        keys, results, missed = self._cached_texts(texts, language,
+                                                   formatting, parameters)
+        if not missed:
+            return results
+        translated = (await self._translate_packs(
+            [texts[idx] for idx in missed], language, formatting, 0, post,
+            workers, max_count, **parameters
+        ))[0]
+        self._store_texts(keys, results, missed, translated)
+        return results
+
+    async def _stream_packs_async(self, texts: ..., post: bool,
+                                  max_count: int) -> ...:
+        if not hasattr(texts, "__aiter__"):
+            for pack in self._stream_packs(texts, post, max_count):
+                yield pack
+            return
+        limit, size = self._request_limit(post)
+        pack = []
+        pack_size = 0
+        async for text in texts:
+            text_size = size(text)
+            if pack and (pack_size + text_size > limit or
+                         len(pack) >= max_count):
+                yield pack
+                pack = []
+                pack_size = 0
+            pack.append(text)
+            pack_size += text_size
+        if pack:
+            yield pack
+
+    async def _translate_pack(self, pack: list, language: str,
+                              formatting: str, post: bool,
+                              **parameters) -> list:
+        # same as for blocking client: long texts are split, blank ones
+        # and cached ones aren't sent
+        return await self.translate_many(pack, language, formatting, post,
+                                         workers=1, **parameters)
+
+    async def translate_stream(self, texts: ..., language: str,
+                               formatting: str="plain", post: bool=True,
+                               workers: int=None, ordered: bool=True,
+                               max_count: int=50, **parameters) -> ...:
+        """
+            Translates (possibly endless) iterable or async iterable
+            of texts lazily.
+
+            Texts are packed by up to 'max_count' into requests, not more
+            then 'workers' requests are in flight. Yields translated texts
+            in input order or (index, translated text) pairs as soon as they
+            are ready if not 'ordered'.
+        """
+        workers = workers or self._workers
+        pending = deque()  # (index of first text, task)
+
+        async def pop_ready() -> list:
+            if ordered:
+                return await pending.popleft()[1]
+            done, __ = await asyncio.wait([task for __, task in pending],
+                                          return_when=asyncio.FIRST_COMPLETED)
+            ready = []
+            for pack in [pack for pack in pending if pack[1] in done]:
+                pending.remove(pack)
+                ready.extend(enumerate(pack[1].result(), pack[0]))
+            return ready
+
+        start = 0
+        try:
+            async for pack in self._stream_packs_async(texts, post,
+                                                       max_count):
+                pending.append((start, asyncio.ensure_future(
+                    self._translate_pack(pack, language, formatting, post,
+                                         **parameters)
+                )))
+                start += len(pack)
+                if len(pending) >= workers:
+                    for item in await pop_ready():
+                        yield item
+            while pending:
+                for item in await pop_ready():
+                    yield item
+        finally:
+            for __, task in pending:
+                task.cancel()
+
+
+class AsyncDictionary(AsyncMixin, Dictionary):
+    """
+        Non-blocking Yandex Dictionary API client
+
+        for more info look on https://tech.yandex.com/dictionary/
+    """
+
+    async def get_langs(self, **params) -> ...:
+        return await self._get_langs(self._url, **params)
+
+    async def getLangs(self, **params) -> ...:
+        return await self.get_langs(**params)
+
+    @property
+    def ok(self) -> NotImplemented:
+        return NotImplemented
+
+    async def check(self) -> bool:
+        """API key is correct"""
+        return await self._ok(self._url)
+
+    async def lookup(self, text: str, lang: str, ui: str='en', flags: int=0,
+                     post: bool=False, **parameters) -> ...:
+        key = self._cache_key("lookup", text, lang, ui, flags, **parameters)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        if not await self._lang_supported(lang):
+            raise YaTranslateException(501)
+        params = self._form_params(
+            text=text,
+            lang=lang,
+            ui=ui,
+            flags=flags,
+            **parameters
+        )
+        response = self._looked_up(await self.make_combined_request(
+            "lookup", post, **params
+        ))
+        self._cache_set(key, response)
+        return response
+
+    async def definitions(self, text: str, lang: str, **params) -> ...:
+        if "callback" in params:
+            raise ValueError("Wrong usage of callback")
+        elif self._typed:
+            return (await self.lookup(text, lang, **params)).entries
+        elif not self._json:
+            return NotImplemented
+        return (await self.lookup(text, lang, **params)).get("def", None)
+
+
+class AsyncPredictor(AsyncMixin, Predictor):
+    """
+        Non-blocking Yandex Predictor API client
+
+        for more info look on https://tech.yandex.ru/predictor/
+    """
+
+    async def get_langs(self, **params) -> ...:
+        return await self._get_langs(self._url, **params)
+
+    async def getLangs(self, **params) -> ...:
+        return await self.get_langs(**params)
+
+    @property
+    def ok(self) -> NotImplemented:
+        return NotImplemented
+
+    async def check(self) -> bool:
+        """API key is correct"""
+        return await self._ok(self._url)
+
+    async def complete(self, lang: str, q: str, limit: int=1,
+                       post: bool=False, **parameters) -> ...:
+        key = self._complete_key(lang, q, limit, parameters)
+        cached = self._cached_completion(key)
+        if cached is not None:
+            return cached
+        if not await self._lang_supported(lang):
+            raise YaTranslateException(501)
+        params = self._form_params(lang=lang, q=q, limit=limit, **parameters)
+        response = await self.make_combined_request("complete", post,
+                                                    **params)
+        self._cache_set(key, response)
+        return response
+
+
+class AsyncSpeller(AsyncMixin, Speller):
+    """
+        Non-blocking Yandex Speller API client
+
+        for more info look on https://tech.yandex.ru/speller/
+    """
+
+    @property
+    def ok(self) -> NotImplemented:
+        return NotImplemented
+
+    async def check(self) -> bool:
+        """Successfully connect"""
+        return await self._ok(None, self.check_text, "hello")
+
+    async def _check(self, endpoint: str, text: str or list,
+                     lang: list=["ru", "en"], options: int=0,
+                     fmt: str="plain", post: bool=False,
+                     **parameters) -> ...:
+        if post:
+            return NotImplemented
+        return await self.make_combined_request(
+            endpoint, post=False, **self._check_params(
+                endpoint, text, lang, options, fmt, parameters
+            )
+        )
+
+    async def check_text(self, text: str, lang: list=["ru", "en"],
+                         options: int=0, fmt: str="plain", post: bool=False,
+                         **parameters) -> ...:
+        return await self._check("text", text, lang, options, fmt, post,
+                                 **parameters)
+
+    async def checkText(self, text: str, **params) -> ...:
+        return await self.check_text(text, **params)
+
+    async def check_texts(self, text: list, lang: list=["ru", "en"],
+                          options: int=0, fmt: str="plain", post: bool=False,
+                          **parameters) -> ...:
+        return await self._check("texts", text, lang, options, fmt, post,
+                                 **parameters)
+
+    async def checkTexts(self, text: list, **params) -> ...:
+        return await self.check_texts(text, **params)
+
+
+__all__ = ["AsyncConnectionPool", "AsyncTranslator", "AsyncDictionary",
+           "AsyncPredictor", "AsyncSpeller"]
@@ -0,0 +1,373 @@
+"""
+    Caches for API responses.
+
+    Every cache implements get(key, default) / set(key, value) methods and
+    'stats' property, so they are interchangeable for clients.
+"""
+
+import sys
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+
+class LRUCache(object):
+    """
+        In-memory cache with least recently used eviction and expiration.
+
+        maxsize - max number of stored entries
+        ttl - time to live of entry in seconds (None for endless entries)
+    """
+
+    def __init__(self, maxsize: int=10000, ttl: float=None):
+        if maxsize < 1:
+            raise ValueError("maxsize should be positive, got {}".format(
+                maxsize))
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expiration time, value)
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                       'expirations': 0}
+
+    def get(self, key: tuple, default: ...=None) -> ...:
+        """Returns cached value or default if there is no fresh entry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return default
+            expires, value = entry
+            if expires is not None and expires < time():
+                del self._data[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key: tuple, value: ...) -> None:
+        """Stores value, evicts least recently used entries if needed."""
+        expires = time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> dict:
+        """Counters of hits, misses, evictions and expirations."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats['size'] = len(self._data)
+        return stats
+
+
+class SQLiteCache(object):
+    """
+        Persistent cache stored in local SQLite database.
+
+        Keeps JSON, XML responses and typed results between process
+        restarts and can be shared by several processes on the same host.
+
+        path - database file (':memory:' for temporary cache)
+        ttl - time to live of entry in seconds (None for endless entries)
+        maxsize - max number of stored entries (None for unlimited)
+        compact_every - number of inserts between automatic compactions
+    """
+    serializing = True  # stored values are copies already
+
+    def __init__(self, path: str, ttl: float=None, maxsize: int=None,
+                 compact_every: int=1000):
+        import sqlite3
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.compact_every = compact_every
+        self._inserts = 0
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                       'expirations': 0}
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)  # autocommit
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, kind TEXT, value TEXT, "
+            "created REAL, accessed REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)"
+        )
+
+    @staticmethod
+    def _dumps(value: ...) -> tuple:
+        """Returns (kind, serialized value) pair."""
+        import json
+        if hasattr(value, "tag") and hasattr(value, "attrib"):
+            from xml.etree import ElementTree
+            return "xml", ElementTree.tostring(value, encoding="unicode")
+        if hasattr(value, "to_json"):  # typed result
+            return (type(value).__name__,
+                    json.dumps(value.to_json(), ensure_ascii=False))
+        return "json", json.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def _loads(kind: str, data: str) -> ...:
+        if kind == "xml":
+            from xml.etree import ElementTree
+            return ElementTree.fromstring(data)
+        import json
+        if kind != "json":
+            from . import results
+            return getattr(results, kind).from_json(json.loads(data))
+        return json.loads(data)
+
+    def get(self, key: tuple, default: ...=None) -> ...:
+        """Returns cached value or default if there is no fresh entry."""
+        now = time()
+        key = repr(key)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT kind, value, created FROM entries WHERE key = ?",
+                (key, )
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return default
+            kind, data, created = row
+            if self.ttl is not None and created + self.ttl < now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key, ))
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return default
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?",
+                             (now, key))
+            self._stats['hits'] += 1
+        return self._loads(kind, data)
+
+    def set(self, key: tuple, value: ...) -> None:
+        """Stores value, compacts database every 'compact_every' inserts."""
+        now = time()
+        kind, data = self._dumps(value)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (repr(key), kind, data, now, now)
+            )
+            self._inserts += 1
+            if self._inserts < self.compact_every:
+                return
+        self.compact()
+
+    def compact(self, vacuum: bool=False) -> None:
+        """
+            Removes expired and least recently used entries above maxsize.
+
+            vacuum - also shrink database file
+        """
+        with self._lock:
+            self._inserts = 0
+            if self.ttl is not None:
+                removed = self._db.execute(
+                    "DELETE FROM entries WHERE created < ?",
+                    (time() - self.ttl, )
+                ).rowcount
+                self._stats['expirations'] += max(removed, 0)
+            if self.maxsize is not None:
+                removed = self._db.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM "
+                    "entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize, )
+                ).rowcount
+                self._stats['evictions'] += max(removed, 0)
+            if vacuum:
+                self._db.execute("VACUUM")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Counters of hits, misses, evictions and expirations."""
+        stats = self._stats.copy()
+        stats['size'] = len(self)
+        return stats
+
+
+class _TrieNode(object):
+    __slots__ = ("parent", "char", "children", "entry")
+
+    def __init__(self, parent: "_TrieNode"=None, char: str=""):
+        self.parent = parent
+        self.char = char
+        self.children = {}
+        self.entry = None  # (limit, endOfWord, pos, texts, size)
+
+
+class CompletionCache(object):
+    """
+        Prefix trie cache for Predictor.complete results (JSON only).
+
+        Besides exact hits, results for longer prefix of the same word are
+        derived from cached results of shorter prefix ("hel" -> "hell")
+        when they are still consistent: the shorter prefix returned less
+        completions than requested (so list is full) or enough completions
+        are left after filtering.
+
+        Keys are (lang, q, limit) tuples, values are 'complete' responses.
+
+        memory_budget - approximate max size of cached data (in bytes)
+    """
+    serializing = True  # values are copied by cache
+    _ENTRY_OVERHEAD = 200  # approximate size of node and entry objects
+
+    def __init__(self, memory_budget: int=4 * 1024 * 1024):
+        self.memory_budget = memory_budget
+        self.memory = 0
+        self._roots = {}  # lang -> root node
+        self._entries = OrderedDict()  # (lang, q) -> node, LRU order
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'derived': 0, 'misses': 0, 'evictions': 0}
+
+    def _find(self, lang: str, q: str) -> list:
+        """Returns nodes along the path of q (shorter then q if missed)."""
+        node = self._roots.get(lang)
+        path = []
+        if node is None:
+            return path
+        path.append(node)
+        for char in q:
+            node = node.children.get(char)
+            if node is None:
+                break
+            path.append(node)
+        return path
+
+    @staticmethod
+    def _last_word(text: str) -> str:
+        """Returns trailing word of text (empty if text ends with space)."""
+        if not text or text[-1].isspace():
+            return ""
+        return text.split()[-1]
+
+    @staticmethod
+    def _response(end_of_word: bool, pos: int, texts: tuple) -> dict:
+        return {'endOfWord': end_of_word, 'pos': pos, 'text': list(texts)}
+
+    def get(self, key: tuple, default: ...=None) -> ...:
+        """Returns cached or derived response for (lang, q, limit)."""
+        lang, q, limit = key
+        with self._lock:
+            path = self._find(lang, q)
+            # exact match
+            if len(path) == len(q) + 1 and path[-1].entry is not None:
+                cached_limit, end_of_word, pos, texts, __ = path[-1].entry
+                if cached_limit >= limit or len(texts) < cached_limit:
+                    self._entries.move_to_end((lang, q))
+                    self._stats['hits'] += 1
+                    return self._response(end_of_word, pos, texts[:limit])
+            # derive from shorter prefixes of the same word
+            word = self._last_word(q)
+            for depth in range(min(len(path), len(q)) - 1, -1, -1):
+                prefix_word = self._last_word(q[:depth])
+                if len(word) - len(prefix_word) < len(q) - depth:
+                    break  # whitespace between prefix and q
+                entry = path[depth].entry
+                if entry is None:
+                    continue
+                cached_limit, end_of_word, pos, texts, __ = entry
+                if end_of_word or pos != -len(prefix_word):
+                    continue
+                found = tuple(text for text in texts
+                              if text.startswith(word))
+                if word in found or not found:
+                    continue
+                if len(texts) < cached_limit or len(found) >= limit:
+                    self._entries.move_to_end((lang, q[:depth]))
+                    self._stats['derived'] += 1
+                    return self._response(False, -len(word), found[:limit])
+            self._stats['misses'] += 1
+            return default
+
+    def set(self, key: tuple, value: dict) -> None:
+        """Stores 'complete' response, evicts old ones above memory budget."""
+        lang, q, limit = key
+        if not isinstance(value, dict):  # typed result
+            value = value.to_json()
+        texts = tuple(value.get('text', ()))
+        size = self._ENTRY_OVERHEAD + sys.getsizeof(q) + \
+            sum(sys.getsizeof(text) for text in texts)
+        entry = (limit, value.get('endOfWord', False), value.get('pos', 0),
+                 texts, size)
+        with self._lock:
+            node = self._roots.setdefault(lang, _TrieNode())
+            for char in q:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode(node, char)
+                node = child
+            if node.entry is not None:
+                self.memory -= node.entry[-1]
+            node.entry = entry
+            self.memory += size
+            self._entries[(lang, q)] = node
+            self._entries.move_to_end((lang, q))
+            while self.memory > self.memory_budget and self._entries:
+                (old_lang, __), old_node = self._entries.popitem(last=False)
+                self._remove(old_lang, old_node)
+                self._stats['evictions'] += 1
+
+    def _remove(self, lang: str, node: _TrieNode) -> None:
+        self.memory -= node.entry[-1]
+        node.entry = None
+        # prune branches without entries
+        while node.parent is not None and not node.children and \
+                node.entry is None:
+            del node.parent.children[node.char]
+            node = node.parent
+        if node.parent is None and not node.children and node.entry is None:
+            del self._roots[lang]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roots.clear()
+            self._entries.clear()
+            self.memory = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        """Counters of exact hits, derived hits, misses and evictions."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats['size'] = len(self._entries)
+            stats['memory'] = self.memory
+        return stats
+
+
+__all__ = ["LRUCache", "SQLiteCache", "CompletionCache"]
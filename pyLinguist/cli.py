@@ -0,0 +1,222 @@
+"""
+    Command-line translator of large files.
+
+    python -m pyLinguist input.txt output.txt --lang en-ru
+
+    Files are translated line by line (plain text, JSON lines or TSV),
+    output is written incrementally and progress is saved to checkpoint
+    file, so interrupted job continues where it has stopped.
+
+    With --processes file is translated by several processes (see
+    pyLinguist.runner), progress is kept in job journal.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+
+FORMATS = ("text", "jsonl", "tsv")
+
+
+def _guess_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    elif extension in ("tsv", "tab"):
+        return "tsv"
+    return "text"
+
+
+class _Record(object):
+    """
+        Input line split into translated text and everything else.
+
+        JSON lines which aren't objects with string 'field' are kept as is.
+    """
+    __slots__ = ("text", "data", "ending")
+
+    def __init__(self, line: str, fmt: str, field: str, column: int):
+        stripped = line.rstrip("\r\n")
+        self.ending = line[len(stripped):]
+        if fmt == "jsonl":
+            self.data = json.loads(stripped) if stripped.strip() else None
+            if isinstance(self.data, dict) and \
+                    isinstance(self.data.get(field), str):
+                self.text = self.data[field]
+            else:
+                self.data = stripped
+                self.text = ""
+        elif fmt == "tsv":
+            self.data = stripped.split("\t")
+            self.text = self.data[column] if column < len(self.data) else ""
+        else:
+            self.data = None
+            self.text = stripped
+
+    def build(self, translation: str, fmt: str, field: str,
+              column: int) -> str:
+        if fmt == "jsonl":
+            if not isinstance(self.data, dict):
+                return self.data + self.ending
+            self.data[field] = translation
+            return json.dumps(self.data, ensure_ascii=False) + self.ending
+        elif fmt == "tsv":
+            if column < len(self.data):
+                self.data[column] = translation.replace("\t", " ")
+            return "\t".join(self.data) + self.ending
+        return translation.replace("\n", " ") + self.ending
+
+
+def _load_checkpoint(path: str, input_path: str) -> dict or None:
+    try:
+        with open(path, encoding='utf-8') as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get('input') != os.path.abspath(input_path):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: dict) -> None:
+    temp_path = "{}.tmp".format(path)
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(checkpoint, file)
+    os.replace(temp_path, path)
+
+
+def translate_file(translator: ..., input_path: str, output_path: str,
+                   language: str, fmt: str=None, field: str="text",
+                   column: int=0, formatting: str="plain", workers: int=None,
+                   max_count: int=50, checkpoint_path: str=None,
+                   checkpoint_every: int=1000, resume: bool=True) -> dict:
+    """
+        Translates file line by line and writes result to output_path.
+
+        Returns statistics: {'lines': total lines, 'translated': lines
+        translated now, 'resumed': lines skipped by checkpoint}.
+    """
+    fmt = fmt or _guess_format(input_path)
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format {}".format(fmt))
+    checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+    checkpoint = resume and _load_checkpoint(checkpoint_path, input_path)
+    if not checkpoint or not os.path.exists(output_path):
+        checkpoint = {'input': os.path.abspath(input_path), 'lines': 0,
+                      'input_offset': 0, 'output_offset': 0}
+    resumed = checkpoint['lines']
+    records = deque()  # records with translations in flight
+    offsets = deque()  # input offset after every record
+
+    with open(input_path, 'rb') as source, \
+            open(output_path, 'ab') as output:
+        source.seek(checkpoint['input_offset'])
+        output.truncate(checkpoint['output_offset'])
+        output.seek(checkpoint['output_offset'])
+
+        def texts() -> ...:
+            offset = checkpoint['input_offset']
+            for raw in source:
+                offset += len(raw)
+                record = _Record(raw.decode('utf-8'), fmt, field, column)
+                records.append(record)
+                offsets.append(offset)
+                yield record.text
+
+        translations = translator.translate_stream(
+            texts(), language, formatting=formatting, workers=workers,
+            max_count=max_count
+        )
+        for translation in translations:
+            record = records.popleft()
+            output.write(record.build(translation, fmt, field,
+                                      column).encode('utf-8'))
+            checkpoint['lines'] += 1
+            checkpoint['input_offset'] = offsets.popleft()
+            if checkpoint['lines'] % checkpoint_every:
+                continue
+            output.flush()
+            checkpoint['output_offset'] = output.tell()
+            _save_checkpoint(checkpoint_path, checkpoint)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # job is done
+    return {'lines': checkpoint['lines'],
+            'translated': checkpoint['lines'] - resumed, 'resumed': resumed}
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyLinguist",
+        description="Translates large files line by line with Yandex "
+                    "Translate API. Interrupted job is resumed from "
+                    "checkpoint."
+    )
+    parser.add_argument("input", help="file to translate")
+    parser.add_argument("output", help="file to write translation to")
+    parser.add_argument("-l", "--lang", required=True,
+                        help="translation direction (e.g. 'en-ru') or "
+                             "target language")
+    parser.add_argument("-k", "--key",
+                        default=os.environ.get("API_KEY_YA_TRANSLATE"),
+                        help="API key (API_KEY_YA_TRANSLATE by default)")
+    parser.add_argument("-f", "--format", choices=FORMATS,
+                        help="input format (guessed by extension)")
+    parser.add_argument("--field", default="text",
+                        help="translated field of JSON lines")
+    parser.add_argument("--column", type=int, default=0,
+                        help="translated column of TSV (from 0)")
+    parser.add_argument("--html", action="store_true",
+                        help="texts contain HTML markup")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="concurrent requests")
+    parser.add_argument("--batch", type=int, default=50,
+                        help="max lines in one request")
+    parser.add_argument("--checkpoint",
+                        help="checkpoint file (OUTPUT.checkpoint by "
+                             "default)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000,
+                        help="lines between checkpoints")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore checkpoint and start from scratch")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="worker processes (0 for number of CPUs)")
+    parser.add_argument("--shard-lines", type=int, default=10000,
+                        help="lines in one shard of worker process")
+    return parser
+
+
+def main(argv: list=None) -> int:
+    args = _parser().parse_args(argv)
+    if not args.key:
+        sys.stderr.write("API key is required (--key)\n")
+        return 2
+    formatting = "html" if args.html else "plain"
+    if args.processes != 1:
+        from .runner import translate_corpus
+        stats = translate_corpus(
+            args.input, args.output, args.lang, api_key=args.key,
+            processes=args.processes or None, shard_lines=args.shard_lines,
+            fmt=args.format, field=args.field, column=args.column,
+            formatting=formatting, workers=args.workers, max_count=args.batch,
+            resume=not args.restart
+        )
+        sys.stderr.write("Translated {translated} lines ({resumed} were done "
+                         "before) by {shards} shards\n".format(**stats))
+        return 0
+    from .Translate import Translator
+    translator = Translator(args.key, workers=args.workers, retry=True)
+    stats = translate_file(
+        translator, args.input, args.output, args.lang, fmt=args.format,
+        field=args.field, column=args.column, formatting=formatting,
+        workers=args.workers, max_count=args.batch,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every, resume=not args.restart
+    )
+    sys.stderr.write("Translated {translated} lines ({resumed} were done "
+                     "before)\n".format(**stats))
+    return 0
+
+
+__all__ = ["main", "translate_file"]
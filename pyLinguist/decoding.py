@@ -0,0 +1,104 @@
+"""
+    Decoding of API responses straight from response bytes.
+
+    Bodies aren't decoded to str before parsing: expat and JSON parsers
+    work with UTF-8 bytes themselves, so there is no extra full copy of
+    every response. orjson is used for JSON if it is installed.
+
+    Parsers are imported with the first response, not with the package.
+"""
+
+import sys
+
+_CHUNK_SIZE = 16 * 1024  # bytes fed to incremental XML parser at once
+_BACKENDS = ("orjson", "json")
+_json_backend = None  # (name, loads function), selected on first use
+# json.loads accepts bytes since Python 3.6
+_JSON_BYTES = sys.version_info >= (3, 6)
+
+
+def _decoding_loads(loads: callable) -> callable:
+    """Wraps JSON parser which accepts only str."""
+    def decode_and_load(data: bytes) -> ...:
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return loads(data)
+    return decode_and_load
+
+
+def set_json_backend(name: str=None) -> str:
+    """
+        Selects JSON parser: 'orjson', 'json' or the fastest installed one
+        (if name is None).
+
+        Returns name of selected backend.
+    """
+    global _json_backend
+    if name is not None and name not in _BACKENDS:
+        raise ValueError("Unknown JSON backend {}".format(name))
+    for backend in _BACKENDS if name is None else (name, ):
+        try:
+            module = __import__(backend)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        loads = module.loads
+        if backend == "json" and not _JSON_BYTES:
+            loads = _decoding_loads(loads)
+        _json_backend = (backend, loads)
+        break
+    return _json_backend[0]
+
+
+def json_backend() -> str:
+    """Name of JSON parser used for responses."""
+    if _json_backend is None:
+        set_json_backend()
+    return _json_backend[0]
+
+
+def loads_json(data: bytes) -> ...:
+    """Parses JSON response body (bytes or str)."""
+    if _json_backend is None:
+        set_json_backend()
+    return _json_backend[1](data)
+
+
+def parse_xml(data: bytes) -> ...:
+    """Parses XML response body without decoding it to str."""
+    from xml.etree import ElementTree
+    return ElementTree.fromstring(data)
+
+
+def iter_xml_texts(data: bytes, tag: str) -> ...:
+    """
+        Yields texts of all 'tag' elements of XML document.
+
+        Document is parsed incrementally and parsed elements are dropped,
+        so the whole tree is never built.
+    """
+    from xml.etree import ElementTree
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    view = memoryview(data)
+    offsets = list(range(0, len(view), _CHUNK_SIZE)) + [None]
+    root = None
+    for start in offsets:
+        if start is None:
+            parser.close()  # raises ParseError for incomplete document
+        else:
+            parser.feed(view[start:start + _CHUNK_SIZE])
+        for event, element in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+            if element.tag == tag:
+                yield element.text or ""
+            element.clear()
+        if root is not None:
+            root.clear()  # root keeps references to all parsed elements
+
+
+__all__ = ["loads_json", "parse_xml", "iter_xml_texts", "set_json_backend",
+           "json_backend"]
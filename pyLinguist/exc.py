@@ -11,6 +11,24 @@ class YaTranslateException(Exception):
         message = self.error_codes.get(
             status_code, "Unknown code {}".format(status_code)
         )
+        self.status_code = status_code
         super(YaTranslateException, self).__init__(
             message, status_code, *args, **kwargs
         )
+
+
+class YaNetworkException(YaTranslateException):
+    """ Connection errors (refused connection, timeout and etc.) """
+
+    def __init__(self, error: Exception, *args, **kwargs):
+        self.error = error
+        super(YaNetworkException, self).__init__(503, error, *args, **kwargs)
+
+
+class YaCircuitOpenException(YaTranslateException):
+    """ Requests to host are stopped after series of failures """
+
+    def __init__(self, host: str, *args, **kwargs):
+        self.host = host
+        super(YaCircuitOpenException, self).__init__(503, host, *args,
+                                                     **kwargs)
@@ -0,0 +1,101 @@
+"""
+    Pool of API keys used by one or several clients.
+
+    Requests are spread across keys, so throughput isn't limited by quota
+    of a single key. Keys answered with 402 (blocked), 403 or 404 (daily
+    limits) are retired until the next daily window.
+"""
+
+from threading import Lock
+
+from .exc import YaTranslateException
+from .quota import _today
+
+
+class KeyPool(object):
+    """
+        Selects API key for every request.
+
+        keys - API keys
+        strategy - 'round_robin' or 'least_used' (fewest requests today)
+    """
+    ROUND_ROBIN = "round_robin"
+    LEAST_USED = "least_used"
+    RETIRE_CODES = frozenset((402, 403, 404))
+
+    def __init__(self, keys: list, strategy: str=ROUND_ROBIN):
+        self.keys = list(dict.fromkeys(keys))  # without duplicates
+        if not self.keys or not all(self.keys):
+            raise YaTranslateException(401)
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_USED):
+            raise ValueError("Unknown strategy {}".format(strategy))
+        self.strategy = strategy
+        self._lock = Lock()
+        self._next = 0
+        self._day = _today()
+        self._used = dict.fromkeys(self.keys, 0)  # requests today
+        self._retired = {}  # key -> (code, day)
+
+    def _revive(self) -> None:
+        """Brings all keys back with new daily window."""
+        today = _today()
+        if today == self._day:
+            return
+        self._day = today
+        self._retired.clear()
+        self._used = dict.fromkeys(self.keys, 0)
+
+    def acquire(self) -> str:
+        """
+            Returns key for the next request.
+
+            Raises YaTranslateException with code of the last retirement
+            if all keys are retired.
+        """
+        with self._lock:
+            self._revive()
+            active = [key for key in self.keys if key not in self._retired]
+            if not active:
+                codes = [code for code, __ in self._retired.values()]
+                raise YaTranslateException(codes[-1])
+            if self.strategy == self.LEAST_USED:
+                key = min(active, key=self._used.get)
+            else:
+                key = active[self._next % len(active)]
+                self._next += 1
+            self._used[key] += 1
+        return key
+
+    def retire(self, key: str, code: int) -> bool:
+        """
+            Retires key after error code until the next daily window.
+
+            Returns True if key was retired (code means problem of key).
+        """
+        if code not in self.RETIRE_CODES or key not in self._used:
+            return False
+        with self._lock:
+            self._revive()
+            self._retired[key] = (code, self._day)
+        return True
+
+    @property
+    def active(self) -> list:
+        """Keys which aren't retired."""
+        with self._lock:
+            self._revive()
+            return [key for key in self.keys if key not in self._retired]
+
+    @property
+    def stats(self) -> dict:
+        """Requests made today and retirement code (or None) of every key."""
+        with self._lock:
+            self._revive()
+            return {
+                key: {'requests': self._used[key],
+                      'retired': self._retired.get(key, (None, ))[0]}
+                for key in self.keys
+            }
+
+
+__all__ = ["KeyPool"]
@@ -0,0 +1,338 @@
+"""
+    Offline language identification.
+
+    Languages with own script (Greek, Korean and etc.) are recognised by
+    characters, Latin, Cyrillic and Hebrew ones (every such language of
+    Yandex APIs) are told apart by compact character n-gram model shipped
+    with the package (data/langid.json). Detector answers only when it is
+    confident, so ambiguous and short texts could still be sent to detect
+    API method. Texts that don't look like any language of model aren't
+    answered too, as text in other language (but with the same script)
+    is the most probable in some of them anyway. Such text has letters
+    missing from alphabet of the language, too many unfamiliar letter
+    pairs or no letters specific to the language (e.g. Turkish without
+    any of "ığşçöü"). Closely related languages outside of model
+    (Faroese for Icelandic) still could be mistaken sometimes.
+"""
+
+import math
+import os
+from collections import Counter
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "data", "langid.json")
+MAX_ORDER = 3  # n-grams from 1 to 3 characters
+
+# (first, last code point, script) for scripts of letters
+_SCRIPT_RANGES = (
+    (0x0041, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0530, 0x058F, "armenian"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x10A0, 0x10FF, "georgian"),
+    (0x1100, 0x11FF, "hangul"),
+    (0x1E00, 0x1EFF, "latin"),
+    (0x3040, 0x30FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xAC00, 0xD7AF, "hangul"),
+)
+# scripts used by single language (among languages of Yandex APIs)
+_SCRIPT_LANGUAGES = {
+    'greek': "el",
+    'armenian': "hy",
+    'thai': "th",
+    'georgian': "ka",
+    'hangul': "ko",
+    'kana': "ja",
+    'han': "zh",
+}
+
+_models = {}  # path -> loaded model
+_scripts = {}  # char -> script
+
+
+def _script(char: str) -> str or None:
+    script = _scripts.get(char, False)
+    if script is not False:
+        return script
+    code = ord(char)
+    script = None
+    for first, last, name in _SCRIPT_RANGES:
+        if first <= code <= last:
+            script = name
+            break
+    _scripts[char] = script
+    return script
+
+
+def _ngrams(text: str) -> list:
+    """Character n-grams of words of text (words are padded by spaces)."""
+    grams = []
+    for word in "".join(char if char.isalpha() else " "
+                        for char in text.lower()).split():
+        word = " {} ".format(word)
+        grams.extend(word[1:-1])
+        for order in range(2, MAX_ORDER + 1):
+            grams.extend([word[idx:idx + order]
+                          for idx in range(len(word) - order + 1)])
+    return grams
+
+
+def train(corpus: dict, size: int=300) -> dict:
+    """
+        Builds model from {language: text} samples.
+
+        size - number of most frequent n-grams of every order kept
+        for every language (others are treated as unseen)
+        Letters of text become alphabet of language, so samples should
+        have all of them.
+    """
+    languages = {}
+    for lang, text in sorted(corpus.items()):
+        scripts = {}
+        for char in text:
+            if char.isalpha():
+                script = _script(char)
+                scripts[script] = scripts.get(script, 0) + 1
+        counts = [{} for __ in range(MAX_ORDER)]
+        for gram in _ngrams(text):
+            order_counts = counts[len(gram) - 1]
+            order_counts[gram] = order_counts.get(gram, 0) + 1
+        ngrams = {}
+        unseen = []
+        for order_counts in counts:
+            total = sum(order_counts.values())
+            # add-one smoothing, probabilities of every order sum to 1
+            denominator = total + len(order_counts) + 1
+            top = sorted(order_counts.items(), key=lambda item: (-item[1],
+                                                                 item[0]))
+            for gram, count in top[:size]:
+                ngrams[gram] = round(math.log((count + 1) / denominator), 2)
+            unseen.append(round(math.log(1 / denominator), 2))
+        languages[lang] = {
+            'script': max(sorted(scripts, key=str), key=scripts.get),
+            'alphabet': "".join(sorted(counts[0])),
+            'unseen': unseen,
+            'ngrams': ngrams,
+        }
+    return {'version': 2, 'order': MAX_ORDER, 'languages': languages}
+
+
+def load_model(path: str=MODEL_PATH) -> dict:
+    """Loads model from JSON file (once for every path)."""
+    model = _models.get(path)
+    if model is None:
+        import json
+        with open(path, encoding='utf-8') as file:
+            model = _models[path] = json.load(file)
+    return model
+
+
+class LanguageDetector(object):
+    """
+        Detects language of text without requests to API.
+
+        model - model built by train() (shipped one by default)
+        threshold - min probability of language to trust the answer
+        min_letters - texts with less letters are not detected
+        min_seen - min share of letter pairs of text seen in samples
+        of language (texts in languages outside of model have less)
+        max_missing - expected number of letters specific to language
+        (missing in other languages with the same script) in text,
+        starting from which text without them isn't in the language
+    """
+
+    def __init__(self, model: dict=None, threshold: float=0.95,
+                 min_letters: int=15, min_seen: float=0.75,
+                 max_missing: float=4.0):
+        self.model = model or load_model()
+        self.threshold = threshold
+        self.min_letters = min_letters
+        self.min_seen = min_seen
+        self.max_missing = max_missing
+        self._indexes = {}  # script -> (languages, unseen, n-grams index)
+        self._specific = {}  # language -> (specific letters, frequency)
+
+    def _index(self, script: str) -> tuple:
+        """
+            Model of languages with script inverted for fast scoring:
+            (languages, unseen log probabilities of every language,
+            {n-gram: [(language index, log probability - unseen)]}).
+        """
+        index = self._indexes.get(script)
+        if index is not None:
+            return index
+        languages = []
+        unseen = []
+        ngrams = {}
+        for lang, data in sorted(self.model['languages'].items()):
+            if data['script'] != script:
+                continue
+            idx = len(languages)
+            languages.append(lang)
+            unseen.append(data['unseen'])
+            for gram, value in data['ngrams'].items():
+                ngrams.setdefault(gram, []).append(
+                    (idx, value - data['unseen'][len(gram) - 1])
+                )
+        index = self._indexes[script] = (languages, unseen, ngrams)
+        return index
+
+    @staticmethod
+    def _dominant_script(text: str) -> tuple:
+        """Returns (script, number of letters) pair."""
+        scripts = {}
+        letters = 0
+        for char in text:
+            if not char.isalpha():
+                continue
+            letters += 1
+            script = _script(char)
+            scripts[script] = scripts.get(script, 0) + 1
+        if not scripts:
+            return None, 0
+        if "kana" in scripts:  # japanese text mixes kana and han
+            return "kana", letters
+        return max(sorted(scripts, key=str), key=scripts.get), letters
+
+    def scores(self, text: str) -> list:
+        """
+            Returns (language, probability) pairs sorted by probability
+            for languages of model with the same script as text.
+        """
+        script = self._dominant_script(text)[0]
+        return self._scores(Counter(_ngrams(text)), script)
+
+    def _scores(self, counts: Counter, script: str) -> list:
+        languages, unseen, ngrams = self._index(script)
+        if not languages:
+            return []
+        orders = [0] * MAX_ORDER
+        for gram, count in counts.items():
+            orders[len(gram) - 1] += count
+        # every n-gram is unseen at first, then seen ones are corrected
+        likelihoods = [sum(count * value for count, value
+                           in zip(orders, lang_unseen))
+                       for lang_unseen in unseen]
+        for gram, count in counts.items():
+            for idx, delta in ngrams.get(gram, ()):
+                likelihoods[idx] += count * delta
+        # every letter is counted by each of n-gram orders, so likelihoods
+        # are too sharp to be used as probabilities as is
+        best = max(likelihoods)
+        weights = [math.exp((likelihood - best) / MAX_ORDER)
+                   for likelihood in likelihoods]
+        total = sum(weights)
+        return sorted(((lang, weight / total)
+                       for lang, weight in zip(languages, weights)),
+                      key=lambda item: -item[1])
+
+    def _specific_letters(self, lang: str) -> tuple:
+        """
+            Letters of language missing in some other language with
+            the same script and their total frequency in the language.
+        """
+        specific = self._specific.get(lang)
+        if specific is not None:
+            return specific
+        languages = self.model['languages']
+        data = languages[lang]
+        letters = set()
+        for other, other_data in languages.items():
+            if other != lang and other_data['script'] == data['script']:
+                letters.update(set(data['alphabet']) -
+                               set(other_data['alphabet']))
+        frequency = sum(math.exp(data['ngrams'][letter])
+                        for letter in letters if letter in data['ngrams'])
+        specific = self._specific[lang] = (letters, frequency)
+        return specific
+
+    def _foreign(self, counts: Counter, lang: str) -> bool:
+        """
+            Whether text looks written in other language than lang:
+            it has letters missing from alphabet of lang, too few of its
+            letter pairs were seen in samples of lang or it hasn't letters
+            specific to lang while they are expected.
+        """
+        data = self.model['languages'][lang]
+        specific, frequency = self._specific_letters(lang)
+        letters = pairs = seen = found = 0
+        for gram, count in counts.items():
+            if len(gram) == 1:
+                if gram not in data['alphabet']:
+                    return True
+                letters += count
+                if gram in specific:
+                    found += count
+            elif len(gram) == 2:
+                pairs += count
+                if gram in data['ngrams']:
+                    seen += count
+        if not found and frequency * letters >= self.max_missing:
+            return True
+        return seen < self.min_seen * pairs
+
+    def detect(self, text: str, hint: list=None) -> tuple:
+        """
+            Returns (language, confidence) pair.
+
+            Language is None if detector isn't confident (short text,
+            unknown script, text in language outside of model or several
+            probable languages).
+            hint - list of expected languages, it only chooses between
+            languages which are probable alike
+        """
+        script, letters = self._dominant_script(text)
+        if letters < self.min_letters:
+            return None, 0.0
+        lang = _SCRIPT_LANGUAGES.get(script)
+        if lang is not None:
+            return lang, 1.0
+        counts = Counter(_ngrams(text))
+        scores = self._scores(counts, script)
+        if not scores:
+            return None, 0.0
+        lang, confidence = scores[0]
+        if confidence < self.threshold:
+            choice = self._hinted(scores, hint) if hint else None
+            if choice is None:
+                return None, confidence
+            lang, confidence = choice
+        if self._foreign(counts, lang):
+            return None, 0.0
+        return lang, confidence
+
+    def _hinted(self, scores: list, hint: list) -> tuple or None:
+        """
+            The only hinted language among the most probable ones (which
+            probabilities sum up to threshold) with its probability.
+        """
+        total = 0.0
+        hinted = []
+        for lang, probability in scores:
+            if lang in hint:
+                hinted.append((lang, probability))
+            total += probability
+            if total >= self.threshold:
+                break
+        return hinted[0] if len(hinted) == 1 else None
+
+    def candidates(self, text: str, count: int=2) -> list:
+        """
+            Most probable languages (could be used as 'hint' for API),
+            empty for text which looks written in language outside of model.
+        """
+        script, __ = self._dominant_script(text)
+        if script in _SCRIPT_LANGUAGES:
+            return [_SCRIPT_LANGUAGES[script]]
+        counts = Counter(_ngrams(text))
+        scores = self._scores(counts, script)
+        if not scores or self._foreign(counts, scores[0][0]):
+            return []
+        return [lang for lang, __ in scores[:count]]
+
+
+__all__ = ["LanguageDetector", "train", "load_model", "MODEL_PATH"]
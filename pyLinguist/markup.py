@@ -0,0 +1,164 @@
+"""
+    Splitting of HTML documents for translation by parts.
+
+    Document is split only between whole nodes, so every translated part
+    has balanced markup. Parts are cut at block elements boundaries when
+    possible, elements too long for one part are opened up: their tags
+    are kept as is (not translated) and their content is split further.
+"""
+
+import re
+
+# elements which start new block of text (cuts don't break sentences)
+BLOCK_ELEMENTS = frozenset((
+    "address", "article", "aside", "blockquote", "body", "caption", "dd",
+    "details", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "head", "header",
+    "hr", "html", "li", "main", "nav", "ol", "p", "pre", "section",
+    "summary", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+))
+VOID_ELEMENTS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+))
+
+# comments, doctype, processing instructions, script and style elements
+# are single tokens, tags may contain quoted '>' in attributes
+_TOKENS = re.compile(
+    r"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<![^>]*>|<\?.*?>"
+    r"|<(script|style)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</\1\s*>"
+    r"|<(/?)([A-Za-z][^\s/>]*)(?:[^>\"']|\"[^\"]*\"|'[^']*')*>",
+    re.S | re.I
+)
+
+
+class _Node(object):
+    """
+        Text, tag or element of document.
+
+        Element spans from its opening tag till the end of closing one
+        (or of its last child if it isn't closed), 'name' is None for text
+        and for markup which is never split (comments, scripts and etc.).
+    """
+    __slots__ = ("start", "end", "name", "markup", "open_end",
+                 "close_start", "children")
+
+    def __init__(self, start: int, end: int, name: str=None,
+                 markup: bool=False):
+        self.start = start
+        self.end = end
+        self.name = name
+        self.markup = markup or name is not None
+        self.open_end = end
+        self.close_start = end
+        self.children = []
+
+    @property
+    def block(self) -> bool:
+        return self.name in BLOCK_ELEMENTS
+
+
+def parse(text: str) -> list:
+    """Returns top level nodes of HTML document (tolerant to errors)."""
+    root = _Node(0, len(text))
+    stack = [root]
+    position = 0
+    for match in _TOKENS.finditer(text):
+        parent = stack[-1]
+        if match.start() > position:
+            parent.children.append(_Node(position, match.start()))
+        position = match.end()
+        closing, name = match.group(2), match.group(3)
+        if name is None:  # comment, script and etc.
+            parent.children.append(_Node(match.start(), match.end(),
+                                         markup=True))
+            continue
+        name = name.lower()
+        if closing:
+            for depth in range(len(stack) - 1, 0, -1):
+                if stack[depth].name != name:
+                    continue
+                for element in stack[depth:]:  # not closed ones end here
+                    element.end = match.start()
+                    element.close_start = match.start()
+                element = stack[depth]
+                element.end = match.end()
+                del stack[depth:]
+                break
+            else:  # stray closing tag
+                parent.children.append(_Node(match.start(), match.end(),
+                                             markup=True))
+            continue
+        node = _Node(match.start(), match.end(), name)
+        parent.children.append(node)
+        if name not in VOID_ELEMENTS and not match.group(0).endswith("/>"):
+            stack.append(node)
+    if position < len(text):
+        stack[-1].children.append(_Node(position, len(text)))
+    for element in stack[1:]:  # not closed till the end of document
+        element.end = element.close_start = len(text)
+    return root.children
+
+
+def _split_nodes(text: str, nodes: list, limit: int, split_text: callable,
+                 size: callable, parts: list) -> None:
+    """Appends (part, translate) pairs made of consecutive nodes."""
+    # size of every part is measured once, for part made of several nodes
+    # it is the sum of their sizes (without size of empty text)
+    base = size("")
+    sizes = [size(text[node.start:node.end]) - base for node in nodes]
+    idx = 0
+    while idx < len(nodes):
+        node = nodes[idx]
+        if base + sizes[idx] > limit:
+            if not node.markup:  # long text without tags
+                parts.extend((part, True) for part in split_text(
+                    text[node.start:node.end], limit, size
+                ))
+            elif node.name is None or node.open_end == node.end:
+                parts.append((text[node.start:node.end], False))
+            else:  # open up element, its tags aren't translated
+                parts.append((text[node.start:node.open_end], False))
+                _split_nodes(text, node.children, limit, split_text, size,
+                             parts)
+                parts.append((text[node.close_start:node.end], False))
+            idx += 1
+            continue
+        # as many nodes as fit into limit, the last cut between blocks
+        end = idx + 1
+        cut = None
+        total = base + sizes[idx]
+        while end < len(nodes) and total + sizes[end] <= limit:
+            if nodes[end - 1].block or nodes[end].block:
+                cut = end
+            total += sizes[end]
+            end += 1
+        if end < len(nodes) and (nodes[end - 1].block or nodes[end].block):
+            cut = end
+        if end < len(nodes) and cut is not None:
+            end = cut
+        translate = any(
+            item.name is not None or not item.markup and
+            text[item.start:item.end].strip() for item in nodes[idx:end]
+        )
+        parts.append((text[node.start:nodes[end - 1].end], translate))
+        idx = end
+
+
+def split_html(text: str, limit: int, split_text: callable,
+               size: callable=len) -> list:
+    """
+        Splits HTML document into parts not bigger then limit ('size' of
+        part is its length by default).
+
+        Returns (part, translate) pairs: translate is False for tags of
+        elements which were opened up and for markup without text.
+        split_text(text, limit, size) is used for long texts without tags.
+        Joining all parts gives original document.
+    """
+    parts = []
+    _split_nodes(text, parse(text), limit, split_text, size, parts)
+    return parts
+
+
+__all__ = ["split_html", "parse", "BLOCK_ELEMENTS", "VOID_ELEMENTS"]
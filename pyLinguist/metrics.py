@@ -0,0 +1,139 @@
+"""
+    Instrumentation of API clients.
+
+    Clients report every request (endpoint, latency, traffic, billed
+    characters and error codes) and cache lookups to metrics object.
+    NullMetrics (default) ignores everything, Metrics aggregates counters
+    which could be scraped with snapshot().
+"""
+
+from threading import Lock
+
+# upper bounds of latency histogram buckets (in seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class NullMetrics(object):
+    """Metrics which are not collected."""
+    enabled = False  # clients don't measure requests for disabled metrics
+
+    def observe_request(self, endpoint: str, latency: float, sent: int,
+                        received: int, chars: int, code: int) -> None:
+        pass
+
+    def observe_cache(self, endpoint: str, hit: bool) -> None:
+        pass
+
+    def snapshot(self) -> dict:
+        return {'requests': {}, 'cache': {}}
+
+    def reset(self) -> None:
+        pass
+
+
+class _EndpointStats(object):
+    __slots__ = ("count", "errors", "sent", "received", "chars", "buckets",
+                 "latency")
+
+    def __init__(self, buckets_count: int):
+        self.count = 0
+        self.errors = {}  # code -> count
+        self.sent = 0
+        self.received = 0
+        self.chars = 0
+        self.buckets = [0] * (buckets_count + 1)  # last one is +Inf
+        self.latency = 0.0
+
+
+class Metrics(NullMetrics):
+    """
+        Thread-safe counters of requests and cache lookups per endpoint.
+
+        Could be shared by several clients.
+
+        buckets - upper bounds of latency histogram buckets (in seconds)
+    """
+    enabled = True
+
+    def __init__(self, buckets: tuple=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self._requests = {}  # endpoint -> _EndpointStats
+        self._cache = {}  # endpoint -> [hits, misses]
+
+    def observe_request(self, endpoint: str, latency: float, sent: int,
+                        received: int, chars: int, code: int) -> None:
+        """Records one request sent to API (code 200 for success)."""
+        bucket = len(self.buckets)
+        for idx, bound in enumerate(self.buckets):
+            if latency <= bound:
+                bucket = idx
+                break
+        with self._lock:
+            stats = self._requests.get(endpoint)
+            if stats is None:
+                stats = self._requests[endpoint] = _EndpointStats(
+                    len(self.buckets))
+            stats.count += 1
+            stats.sent += sent
+            stats.received += received
+            stats.chars += chars
+            stats.buckets[bucket] += 1
+            stats.latency += latency
+            if code != 200:
+                stats.errors[code] = stats.errors.get(code, 0) + 1
+
+    def observe_cache(self, endpoint: str, hit: bool) -> None:
+        """Records cache lookup."""
+        with self._lock:
+            counters = self._cache.setdefault(endpoint, [0, 0])
+            counters[0 if hit else 1] += 1
+
+    def snapshot(self) -> dict:
+        """
+            Returns copy of all counters:
+
+            {'requests': {endpoint: {'count', 'errors': {code: count},
+                                     'bytes_sent', 'bytes_received', 'chars',
+                                     'latency': {'buckets', 'sum', 'count'}}},
+             'cache': {endpoint: {'hits', 'misses', 'ratio'}}}
+
+            Latency buckets are cumulative (upper bound, count) pairs,
+            the last bound is float('inf').
+        """
+        bounds = self.buckets + (float("inf"), )
+        with self._lock:
+            requests = {}
+            for endpoint, stats in self._requests.items():
+                cumulative = 0
+                buckets = []
+                for bound, count in zip(bounds, stats.buckets):
+                    cumulative += count
+                    buckets.append((bound, cumulative))
+                requests[endpoint] = {
+                    'count': stats.count,
+                    'errors': stats.errors.copy(),
+                    'bytes_sent': stats.sent,
+                    'bytes_received': stats.received,
+                    'chars': stats.chars,
+                    'latency': {'buckets': buckets, 'sum': stats.latency,
+                                'count': stats.count}
+                }
+            cache = {
+                endpoint: {'hits': hits, 'misses': misses,
+                           'ratio': hits / (hits + misses)}
+                for endpoint, (hits, misses) in self._cache.items()
+            }
+        return {'requests': requests, 'cache': cache}
+
+    def reset(self) -> None:
+        """Drops all counters."""
+        with self._lock:
+            self._requests.clear()
+            self._cache.clear()
+
+
+NULL_METRICS = NullMetrics()
+
+
+__all__ = ["Metrics", "NullMetrics", "NULL_METRICS", "LATENCY_BUCKETS"]
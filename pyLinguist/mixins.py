@@ -1,11 +1,38 @@
-import http
-import json
-from collections import Callable, Container
-from time import time
-from urllib import parse, request
-from xml.etree import ElementTree
+import os
+from copy import deepcopy
+from threading import Lock, RLock
+from time import perf_counter, sleep, time
 
-from .exc import YaTranslateException
+try:
+    from collections.abc import Callable, Container
+except ImportError:  # Python 3.2 and older
+    from collections import Callable, Container
+
+from .decoding import iter_xml_texts, loads_json, parse_xml
+from .exc import YaNetworkException, YaTranslateException
+from .keys import KeyPool
+from .metrics import NULL_METRICS, Metrics
+from .retry import CircuitBreaker, RetryPolicy
+from .transport import (
+    ACCEPT_COMPRESSED, ConnectionPool, Response, get_default_flight,
+    get_default_pool
+)
+
+
+# getLangs results shared by clients: key -> (timestamp, langs, index)
+_LANGS_REGISTRY = {}
+_LANGS_LOCKS = {}  # key -> lock, so only one client requests getLangs
+_LANGS_LOCKS_GUARD = Lock()
+
+
+class _NoLock(object):
+    """Lock replacement for clients used by single thread."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
 
 
 class LoggerMixin(object):
@@ -18,7 +45,9 @@ class LoggerMixin(object):
         fmt = kwargs.pop("format", None)
         if fmt:
             params['format'] = fmt
-        self._logger = Logger(str(self.__class__), **params)
+        self._logger = Logger("{}.{}".format(self.__class__.__module__,
+                                             self.__class__.__name__),
+                              **params)
         super(LoggerMixin, self).__init__(*args, **kwargs)
 
 
@@ -59,20 +88,67 @@ class YaBaseAPIHandler(BaseMeta, LoggerMixin):
         'langs': "getLangs"
     }
 
-    def __init__(self, api_key: str, xml: bool=False, version: str=None,
-                 **kwargs):
+    def __init__(self, api_key: str or list or KeyPool, xml: bool=False,
+                 version: str=None, **kwargs):
         if not api_key:
             raise YaTranslateException(401)
+        # several keys: every request is sent with key selected by pool
+        self._keys = None
+        if isinstance(api_key, KeyPool):
+            self._keys = api_key
+        elif isinstance(api_key, (list, tuple)):
+            self._keys = KeyPool(api_key)
+        if self._keys is not None:
+            api_key = self._keys.keys[0]
         self._api_key = {
             'key': api_key,
             'correct': False,
             'timestamp': time() - 60 * 60 * 24,
             'threshold': kwargs.pop("threshold", 60 * 60 * 24)  # 24 hours
         }
+        # guards lazy initialisation and API key status
+        self._thread_safe = kwargs.pop("thread_safe", True)
+        self._lock = RLock() if self._thread_safe else _NoLock()
         self._json = ".json" if not xml else ""
         self._cache_langs = None
+        self._langs_index = None  # frozenset of languages and directions
+        self._langs_ttl = kwargs.pop("langs_ttl", 60 * 60 * 24)  # 24 hours
+        self._langs_path = kwargs.pop("langs_path", None)  # JSON file
         self._v = version
         self._url = self._base_url
+        # connections are shared between all clients if no pool is given
+        self._pool = kwargs.pop("pool", None) or get_default_pool()
+        # ask for gzip/deflate responses (enabled by default)
+        self._headers = None
+        if kwargs.pop("compress", True):
+            self._headers = {'Accept-Encoding': ACCEPT_COMPRESSED}
+        # identical requests in flight share one call (for all clients)
+        self._flight = kwargs.pop("coalesce", True)
+        if self._flight is True:
+            self._flight = get_default_flight()
+        elif not self._flight:
+            self._flight = None
+        # client-side quota and rate limits (disabled by default)
+        self._limiter = kwargs.pop("limiter", None)
+        # retries of failed requests and circuit breaker (disabled by default)
+        self._retry = kwargs.pop("retry", None)
+        if self._retry is True:
+            self._retry = RetryPolicy()
+        self._breaker = kwargs.pop("breaker", None)
+        if self._breaker is True:
+            self._breaker = CircuitBreaker()
+        # requests and cache metrics (not collected by default)
+        self._metrics = kwargs.pop("metrics", None) or NULL_METRICS
+        if self._metrics is True:
+            self._metrics = Metrics()
+        self._hooks = {'before': [], 'after': []}
+        # results as objects of pyLinguist.results (disabled by default)
+        self._typed = kwargs.pop("typed", False)
+        # results cache (disabled by default)
+        self._cache = kwargs.pop("cache", None)
+        if self._cache is True:
+            from .cache import LRUCache
+            self._cache = LRUCache()
         super(YaBaseAPIHandler, self).__init__(**kwargs)
 
     @property
@@ -112,49 +188,370 @@ class YaBaseAPIHandler(BaseMeta, LoggerMixin):
         if "callback" in params:
             return self._make_request(url=self._make_url("langs", base_url),
                                       **parameters)
-        if update or not self._cache_langs:
-            response = self.make_combined_request(endpoint="langs",
-                                                  **parameters)
-            if self._json:
-                self._cache_langs = response
-            elif response.find('dirs'):
-                self._cache_langs = [direction.text for direction
-                                     in response.find('dirs')]
-            else:
-                self._cache_langs = [lang.text for lang in response]
+        # index is published before results, so both are ready here
+        if not update and self._cache_langs and \
+                self._langs_index is not None:
+            return self._cache_langs
+        key = self._langs_key(parameters)
+        # concurrent first calls wait for the one which makes request
+        with self._langs_lock(key):
+            if not update and not self._cache_langs:
+                self._restore_langs(key)
+            if update or not self._cache_langs:
+                langs = self.make_combined_request(endpoint="langs",
+                                                   **parameters)
+                self._save_langs(key, langs)
         return self._cache_langs
 
+    def _langs_lock(self, key: str) -> ...:
+        """Lock of getLangs results shared by all clients."""
+        if not self._thread_safe:
+            return self._lock
+        with _LANGS_LOCKS_GUARD:
+            return _LANGS_LOCKS.setdefault(key, RLock())
+
+    def _langs_key(self, params: dict) -> str:
+        """Key of getLangs results, same for all clients of one API."""
+        from urllib import parse
+        return "{}?{}".format(self._url, parse.urlencode(sorted(
+            (key, value) for key, value in params.items()
+            if key not in ("key", "post")
+        )))
+
     @staticmethod
-    def _make_request_xml(url: str, post: bool=False,
-                          **params) -> ElementTree.ElementTree:
+    def _build_langs_index(langs: Container) -> frozenset:
+        """Set of all supported directions and languages."""
+        if isinstance(langs, dict):
+            return frozenset(langs.get('dirs', ())) | \
+                frozenset(langs.get('langs', ()))
+        return frozenset(langs)
+
+    def _restore_langs(self, key: str) -> bool:
         """
-        Implements request to API with given params and return content in XML.
+            Loads getLangs results received by other client or stored
+            in 'langs_path' file if they are not outdated.
+        """
+        entry = _LANGS_REGISTRY.get(key)
+        if entry is None and self._langs_path:
+            import json
+            try:
+                with open(self._langs_path, encoding='utf-8') as file:
+                    stored = json.load(file).get(key)
+            except (OSError, ValueError):
+                stored = None
+            if stored:
+                entry = (stored['timestamp'], stored['langs'],
+                         self._build_langs_index(stored['langs']))
+                _LANGS_REGISTRY[key] = entry
+        if entry is None or time() - entry[0] > self._langs_ttl:
+            return False
+        self._publish_langs(entry[1], entry[2])
+        return True
+
+    def _publish_langs(self, langs: Container, index: frozenset) -> None:
+        """
+            Sets getLangs results for lock-free readers: index first,
+            so it is ready when results are seen.
+        """
+        self._langs_index = index
+        self._cache_langs = langs
+
+    def _save_langs(self, key: str, langs: Container) -> None:
+        """Shares received getLangs results and stores them to file."""
+        timestamp = time()
+        index = self._build_langs_index(langs)
+        self._publish_langs(langs, index)
+        _LANGS_REGISTRY[key] = (timestamp, langs, index)
+        if not self._langs_path:
+            return
+        import json
+        try:
+            with open(self._langs_path, encoding='utf-8') as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            stored = {}
+        stored[key] = {'timestamp': timestamp, 'langs': langs}
+        temp_path = "{}.{}.tmp".format(self._langs_path, os.getpid())
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(stored, file, ensure_ascii=False)
+            os.replace(temp_path, self._langs_path)
+        except OSError as err:
+            self._logger.warning(err)
+
+    def _lang_supported(self, lang: str) -> bool:
+        """Checks language (or direction) using languages index."""
+        index = self._langs_index
+        if index is None or not self._cache_langs:
+            self.get_langs()
+            index = self._langs_index
+        return lang in index
+
+    @staticmethod
+    def _parse_langs(body: bytes) -> list:
+        """
+            Extracts directions from XML getLangs response.
+
+            Only directions are used, so the whole tree isn't built.
+        """
+        return list(iter_xml_texts(body, "string"))
+
+    @property
+    def cache(self) -> ...:
+        """Cache of results (None if disabled)"""
+        return self._cache
+
+    def _cache_key(self, endpoint: str, *args, **params) -> tuple or None:
+        """
+            Returns hashable key for cached results of request to endpoint.
+
+            Returns None if result shouldn't be cached.
+        """
+        if self._cache is None or "callback" in params:
+            return None
+        args = tuple(tuple(arg) if isinstance(arg, list) else arg
+                     for arg in args)
+        params = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in params.items()
+        ))
+        return (self._url, endpoint) + args + params
+
+    def _cache_get(self, key: tuple or None, endpoint: str=None) -> ...:
         """
-        response = YaBaseAPIHandler._make_request(url, post, **params)
-        return ElementTree.fromstring(response.read().decode('utf-8'))
+            Returns copy of cached result or None.
+
+            endpoint - name for metrics (taken from key by default)
+        """
+        if key is None:
+            return None
+        value = self._cache.get(key)
+        if self._metrics.enabled:
+            self._metrics.observe_cache(endpoint or key[1], value is not None)
+        if value is None or getattr(self._cache, "serializing", False):
+            return value
+        return deepcopy(value)
+
+    def _cache_set(self, key: tuple or None, value: ...) -> None:
+        if key is None:
+            return
+        if not getattr(self._cache, "serializing", False):
+            value = deepcopy(value)
+        self._cache.set(key, value)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool used for requests"""
+        return self._pool
+
+    def prewarm(self, count: int=1) -> int:
+        """Opens 'count' idle connections to API host in advance."""
+        return self._pool.prewarm(self._url, count)
 
     @staticmethod
-    def _make_request_json(url: str, post: bool=False,
+    def _billed_chars(params: dict) -> int:
+        """Number of characters of texts in request params."""
+        chars = 0
+        for name in ("text", "q"):
+            value = params.get(name)
+            if isinstance(value, str):
+                chars += len(value)
+            elif isinstance(value, (list, tuple)):
+                chars += sum(len(text) for text in value)
+        return chars
+
+    @property
+    def limiter(self) -> ...:
+        """Client-side rate limiter (None if disabled)"""
+        return self._limiter
+
+    @staticmethod
+    def _prepare_request(url: str, post: bool, params: dict) -> tuple:
+        """Returns (method, url, body) for request with given params."""
+        from urllib import parse
+        # lists (e.g. multiple 'text') are passed as repeated params
+        url_params = parse.urlencode(params, doseq=True)
+        if not post:
+            return "GET", "{}?{}".format(url, url_params), None
+        return "POST", url, url_params.encode('utf-8')
+
+    def _make_request_xml(self, url: str, post: bool=False,
+                          **params) -> ...:
+        """
+        Implements request to API with given params and return content in XML.
+        """
+        response = self._make_request(url, post, **params)
+        return parse_xml(response.read())
+
+    def _make_request_json(self, url: str, post: bool=False,
                            **params) -> Container:
         """
         Implements request to API with given params and return content in JSON.
         """
-        response = YaBaseAPIHandler._make_request(url, post, **params)
-        return json.loads(response.read().decode('utf-8'))
+        response = self._make_request(url, post, **params)
+        return loads_json(response.read())
 
-    @staticmethod
-    def _make_request(url: str, post: bool=False,
-                      **params) -> http.client.HTTPResponse:
+    def _make_request_typed(self, url: str, post: bool=False,
+                            **params) -> ...:
+        """
+        Implements request to API with given params and return typed result
+        (response body is parsed on the first access to result).
+        """
+        from .results import TYPES
+        response = self._make_request(url, post, **params)
+        return TYPES[url.rsplit("/", 1)[-1]].from_body(response.read(),
+                                                       xml=not self._json)
+
+    def _make_request_langs(self, url: str, post: bool=False,
+                            **params) -> list:
+        """
+        Implements getLangs request in XML and returns list of directions.
+        """
+        response = self._make_request(url, post, **params)
+        return self._parse_langs(response.read())
+
+    def _request_func(self, url: str) -> Callable:
+        """Method making request of suitable format to url."""
+        endpoint = url.rsplit("/", 1)[-1]
+        if self._typed:
+            from .results import TYPES
+            if endpoint in TYPES:
+                return self._make_request_typed
+        if not self._json:
+            if endpoint == YaBaseAPIHandler._endpoints['langs']:
+                return self._make_request_langs
+            return self._make_request_xml
+        return self._make_request_json
+
+    def _make_request(self, url: str, post: bool=False,
+                      **params) -> Response:
         """Implements request to API with given params."""
-        url_params = parse.urlencode(params)
-        if not post:
-            full_url = "{}?{}".format(url, url_params)
-            response = request.urlopen(full_url)
-        else:
-            response = request.urlopen(url, data=url_params.encode('utf-8'))
-        if response.code != 200:
-            raise YaTranslateException(response.code)
-        return response
+        import http.client
+        from urllib import parse
+        method, full_url, body = self._prepare_request(url, post, params)
+        host = parse.urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if self._keys is not None:
+                params['key'] = self._keys.acquire()
+                method, full_url, body = self._prepare_request(url, post,
+                                                               params)
+            # open circuit rejects request before it's charged by limiter
+            trial = self._breaker is not None and self._breaker.before(host)
+            if self._limiter is not None:
+                try:
+                    self._limiter.acquire(params.get('key'),
+                                          self._billed_chars(params))
+                except BaseException as err:
+                    if trial:  # only requests which are sent are trial
+                        self._breaker.release(host)
+                    if isinstance(err, YaTranslateException) and \
+                            self._failover(params, err):
+                        continue
+                    raise
+            started = perf_counter()
+            try:
+                response = self._pool.urlopen(method, full_url, body=body,
+                                              headers=self._headers)
+            except (OSError, http.client.HTTPException) as err:
+                error = YaNetworkException(err)
+                error.__cause__ = err
+                response = None
+            except BaseException:
+                if trial:
+                    self._breaker.release(host)
+                raise
+            else:
+                error = None
+                if response.code != 200:
+                    error = YaTranslateException(response.code)
+            if self._metrics.enabled:
+                self._observe_request(url, full_url, body, params, response,
+                                      error, started)
+            if error is not None and self._failover(params, error):
+                if self._breaker is not None:
+                    self._breaker.record(host, error.status_code)
+                continue
+            delay = self._attempt_done(host, error, attempt)
+            if error is None:
+                return response
+            sleep(delay)
+            attempt += 1
+
+    @property
+    def keys(self) -> KeyPool or None:
+        """Pool of API keys (None for single key)"""
+        return self._keys
+
+    def _failover(self, params: dict, error: YaTranslateException) -> bool:
+        """
+            Retires key of failed request if error is caused by key.
+
+            Returns True if request should be repeated with another key.
+        """
+        if self._keys is None:
+            return False
+        return self._keys.retire(params.get('key'), error.status_code)
+
+    def _attempt_done(self, host: str, error: YaTranslateException or None,
+                      attempt: int) -> float:
+        """
+            Records request result for circuit breaker.
+
+            Returns time to wait before retrying failed request
+            or raises error if it shouldn't be retried.
+        """
+        if self._breaker is not None:
+            self._breaker.record(host, error.status_code if error else 200)
+        if error is None:
+            return 0
+        if self._retry is None or not self._retry.should_retry(error,
+                                                               attempt):
+            raise error
+        self._logger.warning("Retrying after error: {}".format(error))
+        return self._retry.delay(attempt)
+
+    @property
+    def breaker(self) -> ...:
+        """Circuit breaker (None if disabled)"""
+        return self._breaker
+
+    @property
+    def metrics(self) -> ...:
+        """Requests and cache metrics (NullMetrics if disabled)"""
+        return self._metrics
+
+    def _observe_request(self, url: str, full_url: str, body: bytes or None,
+                         params: dict, response: Response or None,
+                         error: YaTranslateException or None,
+                         started: float) -> None:
+        """Reports request sent to API to metrics."""
+        self._metrics.observe_request(
+            endpoint=url.rsplit("/", 1)[-1],
+            latency=perf_counter() - started,
+            sent=len(full_url) + len(body or b""),
+            received=response.size if response is not None else 0,
+            chars=self._billed_chars(params),
+            code=error.status_code if error is not None else 200
+        )
+
+    def add_hook(self, event: str, func: Callable) -> None:
+        """
+            Adds function called around every API request:
+
+            'before' - func(endpoint, parameters), could change parameters
+            'after' - func(endpoint, parameters, result, error, latency)
+        """
+        if event not in self._hooks:
+            raise ValueError("Unknown event {}".format(event))
+        self._hooks[event].append(func)
+
+    def remove_hook(self, event: str, func: Callable) -> None:
+        self._hooks[event].remove(func)
+
+    def _run_hooks(self, event: str, *args) -> None:
+        for func in self._hooks[event]:
+            func(*args)
 
     def make_combined_request(self, endpoint: str, post: bool=False,
                               **params) -> ...:
@@ -164,30 +561,65 @@ class YaBaseAPIHandler(BaseMeta, LoggerMixin):
             'post': post
         }
         parameters.update(params)
-        if "callback" in params:
+        if not self._hooks['before'] and not self._hooks['after']:
+            return self._combined_request(parameters)
+        self._run_hooks("before", endpoint, parameters)
+        started = perf_counter()
+        try:
+            result = self._combined_request(parameters)
+        except Exception as err:
+            self._run_hooks("after", endpoint, parameters, None, err,
+                            perf_counter() - started)
+            raise
+        self._run_hooks("after", endpoint, parameters, result, None,
+                        perf_counter() - started)
+        return result
+
+    def _combined_request(self, parameters: dict) -> ...:
+        """Makes request of suitable format for make_combined_request."""
+        if "callback" in parameters:
             return self._make_request(**parameters)
-        elif not self._json:
-            return self._make_request_xml(**parameters)
-        return self._make_request_json(**parameters)
+        request = self._request_func(parameters['url'])
+        if self._flight is None:
+            return request(**parameters)
+        return self._flight.do(self._request_key(**parameters),
+                               lambda: request(**parameters))
+
+    @staticmethod
+    def _request_key(url: str, post: bool, **params) -> tuple:
+        """Normalized request, same for identical requests."""
+        return (url, post) + tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in params.items()
+        ))
 
     def _ok(self, url: str=None, func: Callable=None, *args, **params) -> bool:
         """To check that the API key is correct."""
-        force_update = time() - \
-            self._api_key['timestamp'] > self._api_key['threshold']
-        if self._api_key['correct'] and not force_update:
+        if self._key_checked():
             return True
-        try:
-            if func:
-                __ = func(*args, **params)
-            else:
-                __ = self._get_langs(url, update=True, *args, **params)
-        except (YaTranslateException, http.client.HTTPException) as err:
-            self._logger.warning(err)
-            self._api_key['correct'] = False
-            return False
-        self._api_key['timestamp'] = time()
-        self._api_key['correct'] = True
+        import http.client
+        # only one thread checks the key, others use its result
+        with self._lock:
+            if self._key_checked():
+                return True
+            try:
+                if func:
+                    __ = func(*args, **params)
+                else:
+                    __ = self._get_langs(url, update=True, *args, **params)
+            except (YaTranslateException, http.client.HTTPException) as err:
+                self._logger.warning(err)
+                self._api_key = dict(self._api_key, correct=False)
+                return False
+            self._api_key = dict(self._api_key, correct=True,
+                                 timestamp=time())
         return True
 
+    def _key_checked(self) -> bool:
+        """API key was checked recently and it is correct."""
+        api_key = self._api_key  # status is replaced atomically
+        force_update = time() - api_key['timestamp'] > api_key['threshold']
+        return api_key['correct'] and not force_update
+
 
 __all__ = ["YaBaseAPIHandler", "BaseMeta", "LoggerMixin"]
@@ -0,0 +1,228 @@
+"""
+    Client-side rate limiting and daily quota accounting.
+
+    Requests are smoothed by token bucket and counted per API key per day,
+    so clients stop before Yandex starts to answer with 403 (requests limit)
+    and 404 (characters limit) errors.
+"""
+
+import os
+from threading import Lock
+from time import gmtime, sleep, strftime, time
+
+from .exc import YaTranslateException
+
+try:
+    import fcntl
+except ImportError:  # Windows: counters are shared between threads only
+    fcntl = None
+
+
+def _today() -> str:
+    """Current quota window (Yandex limits are daily)."""
+    return strftime("%Y-%m-%d", gmtime())
+
+
+def _key_id(key: str) -> str:
+    """API keys aren't stored as is."""
+    import hashlib
+    return hashlib.sha1(str(key).encode('utf-8')).hexdigest()[:16]
+
+
+class TokenBucket(object):
+    """
+        Token bucket allowing 'rate' requests per second on average
+        with bursts up to 'capacity' requests.
+    """
+
+    def __init__(self, rate: float, capacity: float=None):
+        if rate <= 0:
+            raise ValueError("rate should be positive, got {}".format(rate))
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time()
+        self._lock = Lock()
+
+    def reserve(self, tokens: float=1) -> float:
+        """
+            Takes tokens (possibly in advance).
+
+            Returns time (in seconds) to wait before request could be sent.
+        """
+        with self._lock:
+            now = time()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float=1) -> None:
+        """Blocks until request could be sent."""
+        delay = self.reserve(tokens)
+        if delay:
+            sleep(delay)
+
+
+class QuotaStore(object):
+    """Daily counters of requests and characters in process memory."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._day = None
+        self._counters = {}  # key id -> [requests, chars]
+
+    def _load(self) -> dict:
+        if self._day != _today():
+            self._day = _today()
+            self._counters = {}
+        return self._counters
+
+    def _save(self, counters: dict) -> None:
+        self._counters = counters
+
+    def _locked(self) -> ...:
+        return self._lock
+
+    def add(self, key: str, requests: int, chars: int,
+            max_requests: int=None, max_chars: int=None) -> int or None:
+        """
+            Atomically checks limits and counts request.
+
+            Returns error code (403 or 404) instead of counting if request
+            would exceed the limit, None otherwise.
+        """
+        key = _key_id(key)
+        with self._locked():
+            counters = self._load()
+            used = counters.get(key, [0, 0])
+            if max_requests is not None and used[0] + requests > max_requests:
+                return 403
+            if max_chars is not None and used[1] + chars > max_chars:
+                return 404
+            counters[key] = [used[0] + requests, used[1] + chars]
+            self._save(counters)
+        return None
+
+    def usage(self, key: str) -> dict:
+        """Requests and characters used by key today."""
+        with self._locked():
+            used = self._load().get(_key_id(key), [0, 0])
+        return {'requests': used[0], 'chars': used[1]}
+
+
+class _FileLock(object):
+    def __init__(self, path: str, lock: Lock):
+        self._path = path
+        self._lock = lock
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if fcntl is not None:
+            self._file = open(self._path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+
+class FileQuotaStore(QuotaStore):
+    """
+        Daily counters stored in JSON file, shared by all processes
+        on the host (file locks are not available on Windows).
+    """
+
+    def __init__(self, path: str):
+        super(FileQuotaStore, self).__init__()
+        self.path = path
+
+    def _locked(self) -> _FileLock:
+        return _FileLock(self.path + ".lock", self._lock)
+
+    def _load(self) -> dict:
+        import json
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            stored = {}
+        if stored.get('day') != _today():
+            return {}
+        return stored.get('counters', {})
+
+    def _save(self, counters: dict) -> None:
+        import json
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'day': _today(), 'counters': counters}, file)
+        os.replace(temp_path, self.path)
+
+
+class RateLimiter(object):
+    """
+        Limits requests sent with every API key.
+
+        rate - average requests per second (None for no smoothing)
+        burst - max requests sent at once (rate by default)
+        requests_per_day - daily requests quota of one key
+        chars_per_day - daily characters quota of one key
+        path - file to share daily counters between processes
+    """
+
+    def __init__(self, rate: float=None, burst: float=None,
+                 requests_per_day: int=None, chars_per_day: int=None,
+                 path: str=None):
+        self.requests_per_day = requests_per_day
+        self.chars_per_day = chars_per_day
+        self._rate = rate
+        self._burst = burst
+        self._buckets = {}  # key -> TokenBucket
+        self._lock = Lock()
+        self._store = FileQuotaStore(path) if path else QuotaStore()
+
+    def _bucket(self, key: str) -> TokenBucket or None:
+        if self._rate is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self._rate,
+                                                          self._burst)
+        return bucket
+
+    def reserve(self, key: str, chars: int=0) -> float:
+        """
+            Counts request in daily quota, takes token from bucket.
+
+            Returns time (in seconds) to wait before sending request,
+            raises YaTranslateException(403 or 404) if quota is exceeded.
+        """
+        code = self._store.add(key, 1, chars, self.requests_per_day,
+                               self.chars_per_day)
+        if code is not None:
+            raise YaTranslateException(code)
+        bucket = self._bucket(key)
+        return bucket.reserve() if bucket is not None else 0
+
+    def acquire(self, key: str, chars: int=0) -> None:
+        """Same as reserve, but waits itself."""
+        delay = self.reserve(key, chars)
+        if delay:
+            sleep(delay)
+
+    def usage(self, key: str) -> dict:
+        """Requests and characters used by key today."""
+        return self._store.usage(key)
+
+
+__all__ = ["RateLimiter", "TokenBucket", "QuotaStore", "FileQuotaStore"]
@@ -0,0 +1,374 @@
+"""
+    Typed results of API methods (enabled with 'typed' option of clients).
+
+    Results keep raw response body and parse it on the first access to any
+    field, nested values are built from __slots__ objects and tuples instead
+    of dicts and lists. Results are the same for JSON and XML responses,
+    to_json() returns them in the form of JSON API responses.
+"""
+
+from sys import intern
+
+from .decoding import loads_json, parse_xml
+
+
+def _tag(value: str or None) -> str or None:
+    """Shared copy of repeated short value (part of speech, gender)."""
+    return intern(value) if value is not None else None
+
+
+def _int(value: ...) -> int or None:
+    return int(value) if value is not None else None
+
+
+def _texts(nodes: list) -> tuple:
+    """Texts of <text> children of XML nodes."""
+    return tuple(node.findtext('text', "") for node in nodes)
+
+
+def _json_texts(items: list) -> tuple:
+    return tuple(item.get('text', "") for item in items)
+
+
+class _Result(object):
+    """
+        Base of typed results.
+
+        Fields are listed in __slots__ of subclasses, until the first access
+        they are unset and '_raw' holds (body, xml) pair of response.
+    """
+    __slots__ = ("_raw", )
+
+    def __init__(self, *values):
+        self._raw = None
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_body(cls, body: bytes, xml: bool=False) -> "_Result":
+        """Result parsed lazily from response body."""
+        result = cls.__new__(cls)
+        result._raw = (body, xml)
+        return result
+
+    @classmethod
+    def from_json(cls, data: ...) -> "_Result":
+        """Result built from decoded JSON response."""
+        return cls(*cls._from_json(data))
+
+    @classmethod
+    def from_xml(cls, node: ...) -> "_Result":
+        """Result built from root element of XML response."""
+        return cls(*cls._from_xml(node))
+
+    @staticmethod
+    def _from_json(data: ...) -> tuple:
+        raise NotImplementedError
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        raise NotImplementedError
+
+    def to_json(self) -> ...:
+        """Result in the form of JSON API response."""
+        raise NotImplementedError
+
+    def __getattr__(self, name: str) -> ...:
+        # called only for unset slots (fields of not parsed result)
+        if name.startswith("_") or name not in self.__slots__:
+            raise AttributeError(name)
+        raw = self._raw
+        if raw is not None:
+            body, xml = raw
+            if xml:
+                values = self._from_xml(parse_xml(body))
+            else:
+                values = self._from_json(loads_json(body))
+            for field, value in zip(self.__slots__, values):
+                setattr(self, field, value)
+            self._raw = None  # fields are set before, for other threads
+        return object.__getattribute__(self, name)
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: ...) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __ne__(self, other: ...) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, ) + self._values())
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, ", ".join(
+            "{}={!r}".format(name, getattr(self, name))
+            for name in self.__slots__
+        ))
+
+    def __copy__(self) -> "_Result":
+        # parsed results aren't changed, not parsed ones share body
+        if self._raw is None:
+            return self
+        result = self.__new__(type(self))
+        result._raw = self._raw
+        return result
+
+    def __deepcopy__(self, memo: dict) -> "_Result":
+        return self.__copy__()
+
+    def __getstate__(self) -> dict:
+        if self._raw is not None:
+            return {'_raw': self._raw}
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['_raw'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class _Items(_Result):
+    """Result which is a sequence of its first field."""
+    __slots__ = ()
+
+    def __iter__(self) -> ...:
+        return iter(getattr(self, self.__slots__[0]))
+
+    def __len__(self) -> int:
+        return len(getattr(self, self.__slots__[0]))
+
+    def __getitem__(self, idx: int) -> ...:
+        return getattr(self, self.__slots__[0])[idx]
+
+
+class Translation(_Result):
+    """Result of 'translate': direction and translated texts."""
+    __slots__ = ("lang", "text")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return _tag(data.get('lang')), tuple(data.get('text', ()))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return _tag(node.get('lang')), tuple(text.text or ""
+                                       for text in node.findall('text'))
+
+    def to_json(self) -> dict:
+        return {'lang': self.lang, 'text': list(self.text)}
+
+
+class DictWord(_Result):
+    """Synonym of translation in dictionary entry."""
+    __slots__ = ("text", "pos", "gen")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return (data.get('text', ""), _tag(data.get('pos')),
+                _tag(data.get('gen')))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return (node.findtext('text', ""), _tag(node.get('pos')),
+                _tag(node.get('gen')))
+
+    def to_json(self) -> dict:
+        data = {'text': self.text}
+        if self.pos is not None:
+            data['pos'] = self.pos
+        if self.gen is not None:
+            data['gen'] = self.gen
+        return data
+
+
+class DictExample(_Result):
+    """Usage example with its translations."""
+    __slots__ = ("text", "tr")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return data.get('text', ""), _json_texts(data.get('tr', ()))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return node.findtext('text', ""), _texts(node.findall('tr'))
+
+    def to_json(self) -> dict:
+        return {'text': self.text, 'tr': [{'text': text}
+                                          for text in self.tr]}
+
+
+class DictTranslation(_Result):
+    """Translation in dictionary entry with synonyms, meanings, examples."""
+    __slots__ = ("text", "pos", "gen", "syn", "mean", "ex")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return (data.get('text', ""), _tag(data.get('pos')),
+                _tag(data.get('gen')),
+                tuple(DictWord.from_json(item)
+                      for item in data.get('syn', ())),
+                _json_texts(data.get('mean', ())),
+                tuple(DictExample.from_json(item)
+                      for item in data.get('ex', ())))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return (node.findtext('text', ""), _tag(node.get('pos')),
+                _tag(node.get('gen')),
+                tuple(DictWord.from_xml(item)
+                      for item in node.findall('syn')),
+                _texts(node.findall('mean')),
+                tuple(DictExample.from_xml(item)
+                      for item in node.findall('ex')))
+
+    def to_json(self) -> dict:
+        data = DictWord.to_json(self)
+        for name, items in (("syn", [item.to_json() for item in self.syn]),
+                            ("mean", [{'text': text} for text in self.mean]),
+                            ("ex", [item.to_json() for item in self.ex])):
+            if items:
+                data[name] = items
+        return data
+
+
+class DictEntry(_Result):
+    """Dictionary entry: word, transcription and translations."""
+    __slots__ = ("text", "pos", "ts", "tr")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return (data.get('text', ""), _tag(data.get('pos')), data.get('ts'),
+                tuple(DictTranslation.from_json(item)
+                      for item in data.get('tr', ())))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return (node.findtext('text', ""), _tag(node.get('pos')),
+                node.get('ts'),
+                tuple(DictTranslation.from_xml(item)
+                      for item in node.findall('tr')))
+
+    def to_json(self) -> dict:
+        data = {'text': self.text}
+        if self.pos is not None:
+            data['pos'] = self.pos
+        if self.ts is not None:
+            data['ts'] = self.ts
+        data['tr'] = [item.to_json() for item in self.tr]
+        return data
+
+
+class Lookup(_Items):
+    """Result of 'lookup': sequence of dictionary entries."""
+    __slots__ = ("entries", )
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return tuple(DictEntry.from_json(item)
+                     for item in data.get('def', ())),
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return tuple(DictEntry.from_xml(item)
+                     for item in node.findall('def')),
+
+    def to_json(self) -> dict:
+        return {'def': [entry.to_json() for entry in self.entries]}
+
+
+class SpellError(_Result):
+    """Spelling error with suggested corrections ('s')."""
+    __slots__ = ("code", "pos", "row", "col", "len", "word", "s")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return (data.get('code'), data.get('pos'), data.get('row'),
+                data.get('col'), data.get('len'), data.get('word', ""),
+                tuple(data.get('s', ())))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return (_int(node.get('code')), _int(node.get('pos')),
+                _int(node.get('row')), _int(node.get('col')),
+                _int(node.get('len')), node.findtext('word', ""),
+                tuple(item.text or "" for item in node.findall('s')))
+
+    def to_json(self) -> dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['s'] = list(self.s)
+        return data
+
+
+class SpellCheck(_Items):
+    """Result of 'checkText': sequence of spelling errors of text."""
+    __slots__ = ("errors", )
+
+    @staticmethod
+    def _from_json(data: list) -> tuple:
+        return tuple(SpellError.from_json(item) for item in data),
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return tuple(SpellError.from_xml(item)
+                     for item in node.findall('error')),
+
+    def to_json(self) -> list:
+        return [error.to_json() for error in self.errors]
+
+
+class SpellChecks(_Items):
+    """Result of 'checkTexts': spelling errors of every text."""
+    __slots__ = ("results", )
+
+    @staticmethod
+    def _from_json(data: list) -> tuple:
+        return tuple(SpellCheck.from_json(item) for item in data),
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return tuple(SpellCheck.from_xml(item)
+                     for item in node.findall('SpellResult')),
+
+    def to_json(self) -> list:
+        return [result.to_json() for result in self.results]
+
+
+class Completion(_Result):
+    """Result of 'complete': suggested texts and where to insert them."""
+    __slots__ = ("end_of_word", "pos", "text")
+
+    @staticmethod
+    def _from_json(data: dict) -> tuple:
+        return (data.get('endOfWord', False), data.get('pos', 0),
+                tuple(data.get('text', ())))
+
+    @staticmethod
+    def _from_xml(node: ...) -> tuple:
+        return (node.get('endOfWord') == "true", _int(node.get('pos', 0)),
+                tuple(item.text or "" for item in node.iter('string')))
+
+    def to_json(self) -> dict:
+        return {'endOfWord': self.end_of_word, 'pos': self.pos,
+                'text': list(self.text)}
+
+
+# API method -> type of its result
+TYPES = {
+    'translate': Translation,
+    'lookup': Lookup,
+    'checkText': SpellCheck,
+    'checkTexts': SpellChecks,
+    'complete': Completion,
+}
+
+
+__all__ = ["Translation", "Lookup", "DictEntry", "DictTranslation",
+           "DictWord", "DictExample", "SpellCheck", "SpellChecks",
+           "SpellError", "Completion", "TYPES"]
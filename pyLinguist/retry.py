@@ -0,0 +1,130 @@
+"""
+    Retries of transient failures and circuit breaker.
+
+    Retried requests wait exponentially growing random delays, so clients
+    don't retry all at once, and circuit breaker stops requests to a host
+    which fails constantly until it has time to recover.
+"""
+
+from threading import Lock
+from time import time
+
+from .exc import YaCircuitOpenException
+
+
+class RetryPolicy(object):
+    """
+        Which failures should be retried and when.
+
+        max_attempts - max number of attempts (including the first one)
+        retry_codes - retried error codes (network errors are 503)
+        backoff - base delay (in seconds), doubled after every attempt
+        max_backoff - max delay (in seconds)
+        jitter - use random delay from 0 to computed one ("full jitter")
+    """
+
+    def __init__(self, max_attempts: int=3, retry_codes: set={503},
+                 backoff: float=0.5, max_backoff: float=30,
+                 jitter: bool=True):
+        if max_attempts < 1:
+            raise ValueError("max_attempts should be positive, got {}".format(
+                max_attempts))
+        self.max_attempts = max_attempts
+        self.retry_codes = frozenset(retry_codes)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Checks if request failed with error on attempt should be retried."""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if isinstance(error, YaCircuitOpenException):
+            return False
+        return getattr(error, "status_code", None) in self.retry_codes
+
+    def delay(self, attempt: int) -> float:
+        """Time (in seconds) to wait after failed attempt."""
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            import random
+            return random.uniform(0, delay)
+        return delay
+
+
+class CircuitBreaker(object):
+    """
+        Per-host circuit breaker.
+
+        After 'failure_threshold' consecutive failures (network errors and
+        'failure_codes') requests to host fail immediately for 'reset_timeout'
+        seconds, then one trial request is allowed: success closes circuit,
+        failure opens it again. Trial request which isn't sent or completed
+        should be released, so the next one could be tried instead.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int=5, reset_timeout: float=30,
+                 failure_codes: set={503}):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # other errors (e.g. 501 for not supported direction) are answers
+        # of working service, network errors are 503
+        self.failure_codes = frozenset(failure_codes)
+        self._hosts = {}  # host -> {'state', 'failures', 'opened'}
+        self._lock = Lock()
+
+    def _host(self, host: str) -> dict:
+        return self._hosts.setdefault(host, {
+            'state': self.CLOSED, 'failures': 0, 'opened': None
+        })
+
+    def before(self, host: str) -> bool:
+        """
+            Raises YaCircuitOpenException if requests to host are stopped.
+
+            Returns True for trial request.
+        """
+        with self._lock:
+            state = self._host(host)
+            if state['state'] == self.CLOSED:
+                return False
+            if state['state'] == self.OPEN and \
+                    time() - state['opened'] >= self.reset_timeout:
+                state['state'] = self.HALF_OPEN  # let one request through
+                return True
+        raise YaCircuitOpenException(host)
+
+    def release(self, host: str) -> None:
+        """Ends trial request without result, the next one is allowed."""
+        with self._lock:
+            state = self._host(host)
+            if state['state'] == self.HALF_OPEN:
+                state['state'] = self.OPEN  # reset timeout has passed
+
+    def record(self, host: str, code: int=200) -> None:
+        """Records result of request to host (error code or 200)."""
+        with self._lock:
+            state = self._host(host)
+            if code not in self.failure_codes:
+                state.update(state=self.CLOSED, failures=0, opened=None)
+                return
+            state['failures'] += 1
+            if state['state'] == self.HALF_OPEN or \
+                    state['failures'] >= self.failure_threshold:
+                state.update(state=self.OPEN, opened=time())
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._host(host)['state']
+
+    @property
+    def states(self) -> dict:
+        """State and number of consecutive failures for every host."""
+        with self._lock:
+            return {host: state.copy() for host, state in self._hosts.items()}
+
+
+__all__ = ["RetryPolicy", "CircuitBreaker"]
@@ -0,0 +1,349 @@
+"""
+    Translation of large corpora by several processes.
+
+    Input file is split into shards of lines, worker processes take
+    pending shards from job journal (SQLite database next to output file),
+    translate them into separate part files and mark them as done.
+    Shards of crashed workers are returned to pending and new workers are
+    started, finished job merges parts into output in input order.
+    Interrupted job is resumed: done shards aren't translated again.
+"""
+
+import os
+from collections import deque
+from time import sleep, time
+
+from .cli import FORMATS, _guess_format, _Record
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobJournal(object):
+    """
+        Shards of job and their state stored in SQLite database.
+
+        Could be used by several processes at once.
+
+        path - database file
+        max_attempts - shard is failed after so many unsuccessful attempts
+    """
+
+    def __init__(self, path: str, max_attempts: int=3):
+        import sqlite3
+        self.path = path
+        self.max_attempts = max_attempts
+        self._db = sqlite3.connect(path, timeout=60,
+                                   isolation_level=None)  # autocommit
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job ("
+            "name TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS shards ("
+            "id INTEGER PRIMARY KEY, start INTEGER, end INTEGER, "
+            "lines INTEGER, status TEXT, worker INTEGER, "
+            "attempts INTEGER DEFAULT 0, error TEXT, updated REAL)"
+        )
+
+    def setup(self, job: dict, shards: list) -> bool:
+        """
+            Starts job with (start offset, end offset, lines) shards
+            or continues the same job stored before.
+
+            Returns True if stored job is continued.
+        """
+        import json
+        description = json.dumps(job, sort_keys=True)
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            stored = self._db.execute(
+                "SELECT value FROM job WHERE name = 'job'"
+            ).fetchone()
+            if stored is not None and stored[0] == description:
+                # workers of interrupted run are gone
+                self._db.execute(
+                    "UPDATE shards SET status = ?, worker = NULL "
+                    "WHERE status IN (?, ?)", (PENDING, RUNNING, FAILED)
+                )
+                self._db.execute("UPDATE shards SET attempts = 0")
+                return True
+            self._db.execute("DELETE FROM job")
+            self._db.execute("DELETE FROM shards")
+            self._db.execute("INSERT INTO job VALUES ('job', ?)",
+                             (description, ))
+            self._db.executemany(
+                "INSERT INTO shards (id, start, end, lines, status, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(idx, start, end, lines, PENDING, time())
+                 for idx, (start, end, lines) in enumerate(shards)]
+            )
+        return False
+
+    def claim(self, worker: int) -> tuple or None:
+        """Takes pending shard, returns (id, start, end) or None."""
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            shard = self._db.execute(
+                "SELECT id, start, end FROM shards WHERE status = ? "
+                "ORDER BY id LIMIT 1", (PENDING, )
+            ).fetchone()
+            if shard is not None:
+                self._db.execute(
+                    "UPDATE shards SET status = ?, worker = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    (RUNNING, worker, time(), shard[0])
+                )
+        return shard
+
+    def done(self, shard: int) -> None:
+        self._db.execute(
+            "UPDATE shards SET status = ?, error = NULL, updated = ? "
+            "WHERE id = ?", (DONE, time(), shard)
+        )
+
+    def fail(self, shard: int, error: str) -> None:
+        """Returns shard to pending (or fails it after max_attempts)."""
+        self._db.execute(
+            "UPDATE shards SET status = CASE WHEN attempts < ? THEN ? "
+            "ELSE ? END, worker = NULL, error = ?, updated = ? WHERE id = ?",
+            (self.max_attempts, PENDING, FAILED, error, time(), shard)
+        )
+
+    def release(self, worker: int, error: str="worker crashed") -> int:
+        """Fails shards of worker which has stopped, returns their number."""
+        shards = [shard for shard, in self._db.execute(
+            "SELECT id FROM shards WHERE status = ? AND worker = ?",
+            (RUNNING, worker)
+        )]
+        for shard in shards:
+            self.fail(shard, error)
+        return len(shards)
+
+    def counts(self) -> dict:
+        """Number of shards in every state."""
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        counts.update(self._db.execute(
+            "SELECT status, COUNT(*) FROM shards GROUP BY status"
+        ))
+        return counts
+
+    def shards(self) -> list:
+        """(id, lines, status, error) of all shards in input order."""
+        return self._db.execute(
+            "SELECT id, lines, status, error FROM shards ORDER BY id"
+        ).fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _shard_offsets(path: str, shard_lines: int) -> list:
+    """Splits file into (start offset, end offset, lines) shards."""
+    shards = []
+    start = offset = lines = 0
+    with open(path, 'rb') as file:
+        for line in file:
+            offset += len(line)
+            lines += 1
+            if lines == shard_lines:
+                shards.append((start, offset, lines))
+                start = offset
+                lines = 0
+    if lines:
+        shards.append((start, offset, lines))
+    return shards
+
+
+def _remove_journal(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def _part_path(parts_dir: str, shard: int) -> str:
+    return os.path.join(parts_dir, "{:08d}.part".format(shard))
+
+
+def _make_translator(api_key: str, workers: int) -> ...:
+    """Translator of worker process (connections aren't inherited)."""
+    from .Translate import Translator
+    from .transport import ConnectionPool
+    return Translator(api_key, workers=workers, retry=True,
+                      pool=ConnectionPool())
+
+
+def _translate_shard(translator: ..., settings: dict, start: int, end: int,
+                     output_path: str) -> None:
+    fmt, field, column = settings['fmt'], settings['field'], settings['column']
+    records = deque()  # records with translations in flight
+
+    def texts() -> ...:
+        with open(settings['input'], 'rb') as source:
+            source.seek(start)
+            position = start
+            while position < end:
+                raw = source.readline()
+                if not raw:
+                    break
+                position += len(raw)
+                record = _Record(raw.decode('utf-8'), fmt, field, column)
+                records.append(record)
+                yield record.text
+
+    temp_path = "{}.{}.tmp".format(output_path, os.getpid())
+    with open(temp_path, 'wb') as output:
+        translations = translator.translate_stream(
+            texts(), settings['language'], formatting=settings['formatting'],
+            workers=settings['workers'], max_count=settings['max_count']
+        )
+        for translation in translations:
+            output.write(records.popleft().build(translation, fmt, field,
+                                                 column).encode('utf-8'))
+    os.replace(temp_path, output_path)
+
+
+def _work(settings: dict, worker: int) -> None:
+    """Worker process: translates pending shards until there are any."""
+    journal = JobJournal(settings['journal'], settings['max_attempts'])
+    try:
+        translator = settings['factory']()
+        while True:
+            shard = journal.claim(worker)
+            if shard is None:
+                break
+            shard, start, end = shard
+            try:
+                _translate_shard(translator, settings, start, end,
+                                 _part_path(settings['parts'], shard))
+            except Exception as err:
+                journal.fail(shard, repr(err))
+            else:
+                journal.done(shard)
+    finally:
+        journal.close()
+
+
+def _merge(journal: JobJournal, parts_dir: str, output_path: str) -> None:
+    """Joins part files into output in input order."""
+    import shutil
+    temp_path = "{}.tmp".format(output_path)
+    with open(temp_path, 'wb') as output:
+        for shard, __, __, __ in journal.shards():
+            with open(_part_path(parts_dir, shard), 'rb') as part:
+                shutil.copyfileobj(part, output)
+    os.replace(temp_path, output_path)
+
+
+def translate_corpus(input_path: str, output_path: str, language: str,
+                     api_key: str=None, processes: int=None,
+                     shard_lines: int=10000, fmt: str=None,
+                     field: str="text", column: int=0,
+                     formatting: str="plain", workers: int=4,
+                     max_count: int=50, factory: callable=None,
+                     journal_path: str=None, max_attempts: int=3,
+                     resume: bool=True, poll: float=0.1) -> dict:
+    """
+        Translates file line by line by several processes.
+
+        processes - number of worker processes (number of CPUs by default)
+        shard_lines - lines in one shard (unit of work of worker)
+        workers - concurrent requests of every process
+        factory - picklable function creating translator in worker process
+        (Translator with api_key by default)
+        journal_path - job journal (OUTPUT.journal by default)
+        max_attempts - attempts to translate shard before job fails
+        resume - continue interrupted job (otherwise start from scratch)
+
+        Returns statistics: {'lines': total lines, 'translated': lines
+        translated now, 'resumed': lines done before, 'shards': number of
+        shards, 'restarts': number of crashed workers}.
+        Raises RuntimeError if some shards failed, done shards are kept
+        for the next run.
+    """
+    import multiprocessing
+    from functools import partial
+    fmt = fmt or _guess_format(input_path)
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format {}".format(fmt))
+    if factory is None:
+        if not api_key:
+            from .exc import YaTranslateException
+            raise YaTranslateException(401)
+        factory = partial(_make_translator, api_key, workers)
+    processes = processes or os.cpu_count() or 1
+    journal_path = journal_path or output_path + ".journal"
+    parts_dir = output_path + ".parts"
+    stat = os.stat(input_path)
+    job = {
+        'input': os.path.abspath(input_path), 'size': stat.st_size,
+        'mtime': stat.st_mtime, 'language': language, 'fmt': fmt,
+        'field': field, 'column': column, 'formatting': formatting,
+        'shard_lines': shard_lines
+    }
+    settings = dict(job, journal=journal_path, parts=parts_dir,
+                    factory=factory, workers=workers, max_count=max_count,
+                    max_attempts=max_attempts)
+    if not resume:
+        _remove_journal(journal_path)
+    os.makedirs(parts_dir, exist_ok=True)
+    journal = JobJournal(journal_path, max_attempts)
+    running = {}  # worker id -> process
+    try:
+        journal.setup(job, _shard_offsets(input_path, shard_lines))
+        resumed = sum(lines for __, lines, status, __ in journal.shards()
+                      if status == DONE)
+        context = multiprocessing.get_context()
+        started = restarts = idle_crashes = 0
+        while True:
+            for worker, process in list(running.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                del running[worker]
+                if process.exitcode:
+                    restarts += 1
+                    if not journal.release(worker, "worker crashed with "
+                                           "exit code {}".format(
+                                               process.exitcode)):
+                        idle_crashes += 1
+            # workers crashing before taking shards don't fail them
+            if idle_crashes > max_attempts * processes:
+                raise RuntimeError("Worker processes keep crashing")
+            counts = journal.counts()
+            if not counts[PENDING] and not running:
+                break
+            while counts[PENDING] and len(running) < processes:
+                process = context.Process(target=_work,
+                                          args=(settings, started))
+                process.daemon = True
+                process.start()
+                running[started] = process
+                started += 1
+                counts[PENDING] -= 1
+            sleep(poll)
+        shards = journal.shards()
+        failed = [(shard, error) for shard, __, status, error in shards
+                  if status != DONE]
+        if failed:
+            raise RuntimeError("{} shards failed, first: {} ({})".format(
+                len(failed), *failed[0]
+            ))
+        _merge(journal, parts_dir, output_path)
+    finally:
+        for process in running.values():
+            process.terminate()  # interrupted, shards are resumed later
+        journal.close()
+    import shutil
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    _remove_journal(journal_path)  # job is done
+    lines = sum(shard[1] for shard in shards)
+    return {'lines': lines, 'translated': lines - resumed,
+            'resumed': resumed, 'shards': len(shards),
+            'restarts': restarts}
+
+
+__all__ = ["translate_corpus", "JobJournal"]
@@ -0,0 +1,414 @@
+"""
+    Pooled HTTP/1.1 transport for Yandex APIs.
+
+    Keeps idle keep-alive connections per host, so consecutive requests to
+    the same service don't pay a new TCP (and TLS) handshake every time,
+    and lets identical concurrent requests share one network call.
+
+    Compressed (gzip or deflate) responses are decompressed transparently,
+    redirects are followed and proxies from environment (HTTP_PROXY,
+    HTTPS_PROXY, NO_PROXY) are used like urllib.request.urlopen does.
+
+    http.client is imported with the first request, not with the package.
+"""
+
+from collections import deque
+from copy import deepcopy
+from threading import Event, Lock
+from time import time
+
+
+def _stale_errors() -> tuple:
+    """Errors which mean that kept-alive connection was closed by server."""
+    import http.client
+    # RemoteDisconnected (subclass of BadStatusLine) appeared in Python 3.5
+    return (getattr(http.client, "RemoteDisconnected",
+                    http.client.BadStatusLine),
+            http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+# Accept-Encoding for compressed responses
+ACCEPT_COMPRESSED = "gzip, deflate"
+# redirects which keep method and body of request
+_KEEP_METHOD_CODES = (307, 308)
+_REDIRECT_CODES = (301, 302, 303) + _KEEP_METHOD_CODES
+
+
+class ContentDecodingError(OSError):
+    """Compressed response body is corrupted."""
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    """Decompresses body of response with given Content-Encoding."""
+    import zlib
+    encoding = encoding.strip().lower()
+    try:
+        if encoding in ("gzip", "x-gzip"):
+            return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:  # some servers send raw deflate stream
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+    except zlib.error as err:
+        raise ContentDecodingError("Can't decode {} response: {}".format(
+            encoding, err))
+    return body
+
+
+class Response(object):
+    """
+        Fully read response (connection already returned to the pool).
+
+        Compressed body is decompressed, 'size' is number of body bytes
+        received over network.
+    """
+    __slots__ = ("code", "reason", "headers", "size", "_body")
+
+    def __init__(self, code: int, reason: str, headers: list, body: bytes):
+        self.code = code
+        self.reason = reason
+        self.headers = dict((key.lower(), value) for key, value in headers)
+        self.size = len(body)
+        encoding = self.headers.get("content-encoding")
+        if encoding and body:
+            body = _decompress(body, encoding)
+        self._body = body
+
+    @property
+    def status(self) -> int:
+        return self.code
+
+    def getheader(self, name: str, default: str=None) -> str:
+        return self.headers.get(name.lower(), default)
+
+    def read(self) -> bytes:
+        return self._body
+
+    def __repr__(self) -> str:
+        return "<Response [{}]>".format(self.code)
+
+
+class ConnectionPool(object):
+    """
+        Per-host pool of reusable HTTP/1.1 keep-alive connections.
+
+        maxsize - max number of idle connections stored for each host
+        timeout - socket timeout for new connections
+        idle_timeout - idle connections older than this (in seconds) are closed
+        max_redirects - max number of redirects followed by one request
+        proxies - {scheme: proxy URL}, taken from environment by default
+        (urllib.request.getproxies), empty dict disables proxies
+    """
+
+    def __init__(self, maxsize: int=10, timeout: float=None,
+                 idle_timeout: float=60, max_redirects: int=10,
+                 proxies: dict=None):
+        if maxsize < 1:
+            raise ValueError("maxsize should be positive, got {}".format(
+                maxsize))
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_redirects = max_redirects
+        self.proxies = proxies
+        self._proxy_hosts = {}  # (scheme, host, port) -> proxy or None
+        self._idle = {}  # (scheme, host, port) -> deque of (conn, last used)
+        self._lock = Lock()
+        self._stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+    @staticmethod
+    def _host_key(url: str) -> tuple:
+        from urllib import parse
+        parts = parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError("Unsupported URL scheme: {}".format(scheme))
+        port = parts.port or (443 if scheme == "https" else 80)
+        return scheme, parts.hostname, port
+
+    def _proxy(self, host_key: tuple) -> tuple or None:
+        """
+            Returns (host, port, headers) of proxy for the host
+            or None if request goes directly.
+        """
+        proxy = self._proxy_hosts.get(host_key, False)
+        if proxy is not False:
+            return proxy
+        from urllib import parse, request
+        scheme, host, port = host_key
+        if self.proxies is None:
+            self.proxies = request.getproxies()
+        url = self.proxies.get(scheme)
+        proxy = None
+        if url and not request.proxy_bypass(host):
+            if "://" not in url:
+                url = "http://" + url
+            parts = parse.urlsplit(url)
+            headers = {}
+            if parts.username is not None:
+                from base64 import b64encode
+                credentials = "{}:{}".format(
+                    parse.unquote(parts.username),
+                    parse.unquote(parts.password or ""))
+                token = b64encode(credentials.encode('utf-8')).decode('ascii')
+                headers['Proxy-Authorization'] = "Basic " + token
+            proxy = (parts.hostname, parts.port or 80, headers)
+        self._proxy_hosts[host_key] = proxy
+        return proxy
+
+    def _new_connection(self, host_key: tuple) -> ...:
+        import http.client
+        scheme, host, port = host_key
+        if scheme == "https":
+            conn_class = http.client.HTTPSConnection
+        else:
+            conn_class = http.client.HTTPConnection
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        with self._lock:
+            self._stats['created'] += 1
+        proxy = self._proxy(host_key)
+        if proxy is None:
+            return conn_class(host, port, **kwargs)
+        proxy_host, proxy_port, proxy_headers = proxy
+        conn = conn_class(proxy_host, proxy_port, **kwargs)
+        if scheme == "https":  # CONNECT tunnel through proxy
+            conn.set_tunnel(host, port, headers=proxy_headers)
+        return conn
+
+    def _get_connection(self, host_key: tuple) -> tuple:
+        """Returns (connection, reused) pair."""
+        expired = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(host_key)
+            now = time()
+            while idle:
+                candidate, last_used = idle.pop()  # most recently used
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                break
+            # everything left is older then the expired ones
+            if idle and expired:
+                expired.extend(item[0] for item in idle)
+                idle.clear()
+            self._stats['discarded'] += len(expired)
+            if conn is not None:
+                self._stats['reused'] += 1
+        for candidate in expired:
+            candidate.close()
+        if conn is not None:
+            return conn, True
+        return self._new_connection(host_key), False
+
+    def _put_connection(self, host_key: tuple, conn: ...) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(host_key, deque())
+            if len(idle) < self.maxsize:
+                idle.append((conn, time()))
+                return
+            self._stats['discarded'] += 1
+        conn.close()
+
+    def urlopen(self, method: str, url: str, body: bytes=None,
+                headers: dict=None) -> Response:
+        """
+            Makes request using pooled connection and reads whole response.
+
+            Redirects are followed, 301, 302 and 303 ones turn request
+            into GET without body (as browsers and urllib do).
+        """
+        from urllib import parse
+        headers = dict(headers or {})
+        if body is not None:
+            headers.setdefault("Content-Type",
+                               "application/x-www-form-urlencoded")
+        redirects = 0
+        while True:
+            response = self._urlopen(method, url, body, headers)
+            location = response.getheader("location")
+            if response.code not in _REDIRECT_CODES or not location or \
+                    redirects >= self.max_redirects:
+                return response
+            redirects += 1
+            url = parse.urljoin(url, location)
+            if response.code not in _KEEP_METHOD_CODES and \
+                    method not in ("GET", "HEAD"):
+                method = "GET"
+                body = None
+                headers = dict((name, value)
+                               for name, value in headers.items()
+                               if name.lower() not in ("content-type",
+                                                       "content-length"))
+
+    def _urlopen(self, method: str, url: str, body: bytes,
+                 headers: dict) -> Response:
+        from urllib import parse
+        host_key = self._host_key(url)
+        parts = parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        proxy = self._proxy(host_key)
+        if proxy is not None and host_key[0] == "http":
+            # plain HTTP proxy gets absolute URL instead of tunnel
+            path = parse.urlunsplit(parts[:2] + (path, "", ""))
+            headers = dict(headers, **proxy[2])
+        conn, reused = self._get_connection(host_key)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            raw = conn.getresponse()
+        except _stale_errors():
+            conn.close()
+            if not reused:
+                raise
+            # server has closed idle connection, try once on a fresh one
+            conn = self._new_connection(host_key)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                raw = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        try:
+            data = raw.read()
+        except Exception:
+            conn.close()
+            raise
+        response = Response(raw.status, raw.reason, raw.getheaders(), data)
+        if raw.will_close:
+            conn.close()
+        else:
+            self._put_connection(host_key, conn)
+        return response
+
+    def prewarm(self, url: str, count: int=1) -> int:
+        """
+            Opens up to 'count' idle connections to the host of 'url'.
+
+            Returns number of opened connections.
+        """
+        host_key = self._host_key(url)
+        with self._lock:
+            free = self.maxsize - len(self._idle.get(host_key, ()))
+        opened = 0
+        for __ in range(min(count, free)):
+            conn = self._new_connection(host_key)
+            conn.connect()
+            self._put_connection(host_key, conn)
+            opened += 1
+        return opened
+
+    def clear(self) -> None:
+        """Closes all idle connections."""
+        with self._lock:
+            connections = [item[0] for idle in self._idle.values()
+                           for item in idle]
+            self._idle.clear()
+        for conn in connections:
+            conn.close()
+
+    @property
+    def stats(self) -> dict:
+        """Counters of created, reused and discarded connections."""
+        with self._lock:
+            stats = self._stats.copy()
+            stats['idle'] = sum(len(idle) for idle in self._idle.values())
+        return stats
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """
+        Deduplicates identical calls in flight: while the first call with
+        some key is running, others with the same key wait for its result
+        instead of calling the function again.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> _Call
+        self._lock = Lock()
+        self._stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key: tuple, func: callable) -> ...:
+        """
+            Calls func (without arguments) or waits for result of the same
+            call in flight.
+
+            Every caller gets own copy of result if it was shared.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['calls'] += 1
+            else:
+                call.waiters += 1
+                self._stats['shared'] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.result)
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]  # no new waiters after that
+                waiters = call.waiters
+            call.done.set()
+        if waiters:
+            return deepcopy(call.result)
+        return call.result
+
+    @property
+    def stats(self) -> dict:
+        """Number of made calls and calls which got shared result."""
+        with self._lock:
+            return self._stats.copy()
+
+
+_default_pool = None
+_default_pool_lock = Lock()
+
+
+_default_flight = SingleFlight()
+
+
+def get_default_flight() -> SingleFlight:
+    """Deduplication group shared by all clients."""
+    return _default_flight
+
+
+def get_default_pool() -> ConnectionPool:
+    """Connection pool shared by all clients without own pool."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ConnectionPool()
+    return _default_pool
+
+
+__all__ = ["ConnectionPool", "Response", "SingleFlight", "get_default_pool",
+           "get_default_flight", "ContentDecodingError", "ACCEPT_COMPRESSED"]
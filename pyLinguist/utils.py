@@ -22,13 +22,38 @@ ERROR_CODES = {
 }
 
 
-def Logger(name: str, level: int=LEVELS["DEBUG"], **kwargs) -> ...:
+_formatted = set()  # names of loggers with own handler
+
+
+def Logger(name: str, level: int or str=None, **kwargs) -> ...:
+    """
+        Returns logger without changing logging configuration of application
+        (root logger isn't touched, package logger has only NullHandler).
+
+        level - level of this logger (inherited by default)
+        format - format of messages, adds own handler to this logger
+    """
     import logging
-    logging.basicConfig(
-        format=kwargs.get(
-            "format",
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        ),
-        level=level
-    )
-    return logging.getLogger(name)
+    package_logger = logging.getLogger(__name__.split(".")[0])
+    if not package_logger.handlers:
+        package_logger.addHandler(logging.NullHandler())
+    logger = logging.getLogger(name)
+    if level is not None:
+        logger.setLevel(LEVELS.get(level, level))
+    fmt = kwargs.get("format")
+    if fmt and name not in _formatted:
+        _formatted.add(name)
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt))
+        logger.addHandler(handler)
+    return logger
+
+
+def parallel_map(func: callable, items: list, workers: int=4) -> list:
+    """Applies func to every item using thread pool, keeps items order."""
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
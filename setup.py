@@ -33,5 +33,14 @@ setup(
     ],
     license="MIT License",
     platforms=["All"],
-    python_requires=">=3.3"
+    package_data={
+        'pyLinguist': ["data/*.json"]
+    },
+    python_requires=">=3.3",
+    extras_require={
+        'fast': ["orjson"]
+    },
+    entry_points={
+        'console_scripts': ["pylinguist = pyLinguist.cli:main"]
+    }
 )
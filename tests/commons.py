@@ -1,4 +1,7 @@
-from collections import Callable
+try:
+    from collections.abc import Callable
+except ImportError:  # Python 3.2 and older
+    from collections import Callable
 
 from . import Logger
 
@@ -15,3 +18,127 @@ def assert_correct_import(import_func: Callable) -> Callable:
             exceptions_happend = True
         assert not exceptions_happend
     return wrapper
+
+
+class StubServer(object):
+    """
+        Local HTTP/1.1 server answering with canned responses.
+
+        'responder' gets (method, path, params, headers) and returns
+        (code, body) or (code, body, headers) tuple.
+    """
+
+    def __init__(self, responder: Callable=None):
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from socketserver import ThreadingMixIn
+        from urllib import parse
+
+        stub = self
+        self.responder = responder or (lambda *args: (200, b"{}"))
+        self.requests = []
+        self.connections = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _answer(self, method: str) -> None:
+                parts = parse.urlsplit(self.path)
+                query = parts.query
+                if method == "POST":
+                    size = int(self.headers.get("Content-Length", 0))
+                    query = self.rfile.read(size).decode('utf-8')
+                params = parse.parse_qs(query, keep_blank_values=True)
+                stub.requests.append((method, parts.path, params))
+                stub.connections.add(self.client_address)
+                result = stub.responder(method, parts.path, params,
+                                        self.headers)
+                code, body = result[:2]
+                headers = result[2] if len(result) > 2 else {}
+                self.send_response(code)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                self._answer("GET")
+
+            def do_POST(self) -> None:
+                self._answer("POST")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}/".format(self._server.server_address[1])
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def fake_api(method: str, path: str, params: dict, headers: dict) -> tuple:
+    """
+        Responder for StubServer imitating Yandex APIs.
+
+        Translation is upper-cased text, speller marks every text as wrong
+        word, path prefix "/xml/" switches response format to XML.
+    """
+    import json
+    xml = path.startswith("/xml/")
+    endpoint = path.rsplit("/", 1)[-1]
+    texts = params.get('text', [])
+    if endpoint == "getLangs":
+        if xml:
+            return 200, (b"<Langs><dirs><string>en-ru</string>"
+                         b"<string>en</string></dirs></Langs>")
+        return 200, json.dumps(["en-ru", "en"]).encode('utf-8')
+    elif endpoint == "translate":
+        lang = params['lang'][0]
+        if xml:
+            return 200, '<Translation code="200" lang="{}">{}</Translation>'\
+                .format(lang, "".join("<text>{}</text>".format(text.upper())
+                                      for text in texts)).encode('utf-8')
+        return 200, json.dumps({
+            'code': 200, 'lang': lang, 'text': [t.upper() for t in texts]
+        }).encode('utf-8')
+    elif endpoint == "detect":
+        if xml:
+            return 200, b'<DetectedLang code="200" lang="en"/>'
+        return 200, b'{"code": 200, "lang": "en"}'
+    elif endpoint == "lookup":
+        return 200, json.dumps({'head': {}, 'def': []}).encode('utf-8')
+    elif endpoint == "complete":
+        return 200, b'{"endOfWord": false, "pos": -2, "text": ["hello"]}'
+    elif endpoint == "checkText":
+        if xml:
+            return 200, "<SpellResult><error><word>{}</word></error>"\
+                "</SpellResult>".format(texts[0]).encode('utf-8')
+        return 200, json.dumps([{'word': texts[0]}]).encode('utf-8')
+    elif endpoint == "checkTexts":
+        if xml:
+            return 200, "<ArrayOfSpellResult>{}</ArrayOfSpellResult>".format(
+                "".join("<SpellResult><error><word>{}</word></error>"
+                        "</SpellResult>".format(text) for text in texts)
+            ).encode('utf-8')
+        return 200, json.dumps([[{'word': text}] for text in texts])\
+            .encode('utf-8')
+    return 404, b""
+
+
+def stub_client(client_class: type, server: StubServer, *args, **kwargs):
+    """Creates client making requests to StubServer."""
+    client = client_class(*args, **kwargs)
+    client._url = "{}{}/".format(server.url, "json" if client._json else "xml")
+    return client
@@ -0,0 +1,4 @@
+import sys
+
+# asyncio clients use async generators, which appeared in Python 3.6
+collect_ignore = [] if sys.version_info >= (3, 6) else ["test_aio.py"]
@@ -112,12 +112,12 @@ class TestTranslator:
         assert translation
         assert 'text' in translation
         assert isinstance(translation['text'], list)
-        # assert len(translation['text']) == 3  # until not realized
+        assert len(translation['text']) == 3
         translation = self.t_json.translate(['hello, "abs"', 'cat'], 'de')
         assert translation
         assert 'text' in translation
         assert isinstance(translation['text'], list)
-        # assert len(translation['text']) == 2)
+        assert len(translation['text']) == 2
 
     def test_translate_xml(self):
         translation = self.t_xml.translate("hello, world", 'de', options=1)
@@ -0,0 +1,196 @@
+import asyncio
+from xml.etree import ElementTree
+
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.aio import (
+    AsyncConnectionPool, AsyncDictionary, AsyncPredictor, AsyncSpeller,
+    AsyncTranslator
+)
+from pyLinguist.quota import RateLimiter
+from pyLinguist.results import Translation
+from pyLinguist.retry import CircuitBreaker
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncClients:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_translate(self):
+        async def translate_all(client: AsyncTranslator) -> list:
+            return await asyncio.gather(*[
+                client.translate("text {}".format(idx), 'en-ru')
+                for idx in range(20)
+            ])
+
+        translator = stub_client(AsyncTranslator, self.server, "123",
+                                 concurrency=4)
+        results = run(translate_all(translator))
+        assert len(results) == 20
+        assert results[3] == {'lang': 'en-ru', 'text': ["TEXT 3"]}
+        assert translator.pool.stats['created'] <= 4
+        assert translator.pool.stats['reused'] >= 16
+
+    def test_detect_xml(self):
+        translator = stub_client(AsyncTranslator, self.server, "123",
+                                 xml=True)
+        response = run(translator.detect("hello"))
+        assert isinstance(response, ElementTree.Element)
+        assert response.attrib['lang'] == 'en'
+
+    def test_lookup(self):
+        dictionary = stub_client(AsyncDictionary, self.server, "123")
+        assert run(dictionary.lookup("hello", "en-ru")) == {'def': []}
+        with pytest.raises(YaTranslateException):
+            run(dictionary.lookup("hello", "cpp"))
+
+    def test_complete(self):
+        predictor = stub_client(AsyncPredictor, self.server, "123")
+        response = run(predictor.complete("en", "he"))
+        assert response['text'] == ["hello"]
+
+    def test_check_text(self):
+        speller = stub_client(AsyncSpeller, self.server)
+        assert run(speller.check_text("hello")) == [{'word': "hello"}]
+        assert run(speller.check_texts(["a", "b"])) == \
+            [[{'word': "a"}], [{'word': "b"}]]
+        assert run(speller.check())
+
+    def test_typed(self):
+        translator = stub_client(AsyncTranslator, self.server, "123",
+                                 typed=True)
+        assert run(translator.translate("hello", "en-ru")) == \
+            Translation("en-ru", ("HELLO", ))
+        dictionary = stub_client(AsyncDictionary, self.server, "123",
+                                 typed=True)
+        assert run(dictionary.definitions("hello", "en-ru")) == ()
+
+    def test_cache(self):
+        translator = stub_client(AsyncTranslator, self.server, "123",
+                                 cache=True)
+        dictionary = stub_client(AsyncDictionary, self.server, "123",
+                                 cache=True)
+        run(dictionary.get_langs())
+        requests_count = len(self.server.requests)
+        for __ in range(2):
+            assert run(translator.translate("cat", 'en-ru'))['text'] == \
+                ["CAT"]
+            assert run(translator.detect("cat")) == 'en'
+            assert run(dictionary.lookup("cat", "en-ru")) == {'def': []}
+        assert len(self.server.requests) - requests_count == 3
+
+    def test_translate_long(self):
+        translator = stub_client(AsyncTranslator, self.server, "123")
+        text = " ".join("Sentence {}.".format(idx) for idx in range(2000))
+        requests_count = len(self.server.requests)
+        translation = run(translator.translate(text, 'en-ru', post=True))
+        assert translation == {'lang': 'en-ru', 'text': [text.upper()]}
+        assert len(self.server.requests) - requests_count > 1
+        texts = ["text {}".format(idx) for idx in range(300)] + [text]
+        assert run(translator.translate_many(texts, 'en-ru', max_count=50)) \
+            == [text.upper() for text in texts]
+
+    def test_errors(self):
+        pool = AsyncConnectionPool()
+        response = run(pool.urlopen("GET", self.server.url + "unknown"))
+        assert response.code == 404
+        with pytest.raises(ValueError):
+            run(pool.urlopen("GET", "ftp://localhost/"))
+
+    def test_open_circuit_not_charged(self):
+        async def translate_all(client: AsyncTranslator) -> int:
+            errors = 0
+            for __ in range(10):
+                try:
+                    await client.translate("hi", 'en-ru')
+                except YaTranslateException:
+                    errors += 1
+            return errors
+
+        server = StubServer(lambda *args: (503, b""))
+        limiter = RateLimiter(rate=1, burst=2)
+        try:
+            translator = stub_client(
+                AsyncTranslator, server, "123", limiter=limiter,
+                breaker=CircuitBreaker(failure_threshold=2)
+            )
+            assert run(translate_all(translator)) == 10
+            assert limiter.usage("123")['requests'] == 2
+            assert len(server.requests) == 2
+        finally:
+            server.close()
+
+    def test_translate_stream(self):
+        async def texts() -> ...:
+            for idx in range(100):
+                yield "text {}".format(idx)
+
+        async def collect(client: AsyncTranslator, source: ...,
+                          **params) -> list:
+            return [item async for item in client.translate_stream(
+                source, 'en-ru', max_count=7, **params
+            )]
+
+        translator = stub_client(AsyncTranslator, self.server, "123")
+        expected = ["TEXT {}".format(idx) for idx in range(100)]
+        assert run(collect(translator, texts())) == expected
+        pairs = run(collect(translator, ["text {}".format(idx)
+                                         for idx in range(100)],
+                            ordered=False, workers=3))
+        assert sorted(pairs) == list(enumerate(expected))
+        # too long text is translated by parts
+        text = " ".join("Sentence {}.".format(idx) for idx in range(2000))
+        assert run(collect(translator, ["short", text, ""])) == \
+            ["SHORT", text.upper(), ""]
+
+    def test_coalescing(self):
+        async def translate_same(client: AsyncTranslator) -> list:
+            return await asyncio.gather(*[
+                client.translate("same", 'en-ru') for __ in range(10)
+            ])
+
+        translator = stub_client(AsyncTranslator, self.server, "123")
+        requests_count = len(self.server.requests)
+        results = run(translate_same(translator))
+        assert all(result['text'] == ["SAME"] for result in results)
+        assert len(self.server.requests) - requests_count == 1
+
+    def test_coalescing_cancel(self):
+        async def cancel_first(client: AsyncTranslator) -> dict:
+            first = asyncio.ensure_future(client.translate("cancel", 'en-ru'))
+            second = asyncio.ensure_future(client.translate("cancel",
+                                                            'en-ru'))
+            await asyncio.sleep(0)  # both are waiting for the same request
+            first.cancel()
+            result = await second
+            assert first.cancelled()
+            return result
+
+        async def cancel_all(client: AsyncTranslator) -> None:
+            tasks = [asyncio.ensure_future(client.translate("all", 'en-ru'))
+                     for __ in range(2)]
+            await asyncio.sleep(0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(0)
+            assert not client._inflight
+
+        translator = stub_client(AsyncTranslator, self.server, "123")
+        requests_count = len(self.server.requests)
+        assert run(cancel_first(translator))['text'] == ["CANCEL"]
+        assert len(self.server.requests) - requests_count == 1
+        run(cancel_all(translator))
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.Vocabulary import Speller, SpellerBatcher
+
+
+class TestSpellerBatcher:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def _check_all(self, batcher: SpellerBatcher, texts: list) -> list:
+        with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+            return list(pool.map(batcher.check_text, texts))
+
+    def test_batching(self):
+        speller = stub_client(Speller, self.server)
+        batcher = SpellerBatcher(speller, window=0.2, max_texts=10)
+        texts = ["word{}".format(idx) for idx in range(20)]
+        results = self._check_all(batcher, texts)
+        assert results == [[{'word': text}] for text in texts]
+        assert batcher.stats['texts'] == 20
+        assert batcher.stats['requests'] < 20
+        assert self.server.requests[-1][1].endswith("checkTexts")
+
+    def test_xml(self):
+        speller = stub_client(Speller, self.server, xml=True)
+        batcher = SpellerBatcher(speller, window=0.2, max_chars=12)
+        texts = ["word{}".format(idx) for idx in range(6)]
+        results = self._check_all(batcher, texts)
+        assert [result.find('error/word').text for result in results] == \
+            texts
+        assert batcher.stats['requests'] >= 3
+
+    def test_single(self):
+        speller = stub_client(Speller, self.server)
+        batcher = SpellerBatcher(speller, window=0)
+        assert batcher.check_text("hello") == [{'word': "hello"}]
+        assert self.server.requests[-1][1].endswith("checkText")
@@ -0,0 +1,248 @@
+"""
+    Micro-benchmarks of client-side overhead (no network involved).
+
+    Requests are answered by in-process StubPool, so only parameters
+    forming, URL building and encoding, decoding and client logic are
+    measured. As tests benchmarks check generous per-call budgets to
+    catch regressions, for comparison of optimizations run:
+
+    python -m tests.test_benchmarks
+
+    Offline language detector is measured on hand-labelled texts
+    (tests/data/detect_answers.json), including texts in languages outside
+    of its model which shouldn't be answered.
+"""
+
+import json
+import os
+from timeit import Timer
+
+import pytest
+
+from pyLinguist.decoding import loads_json, parse_xml
+from pyLinguist.langid import _SCRIPT_LANGUAGES, LanguageDetector
+from pyLinguist.Prediction import Predictor
+from pyLinguist.transport import Response
+from pyLinguist.Translate import Translator
+from pyLinguist.Vocabulary import Dictionary, Speller
+
+TEXT = "The quick brown fox jumps over the lazy dog"
+
+# canned responses: endpoint -> (JSON body, XML body)
+RESPONSES = {
+    'getLangs': (
+        json.dumps({'dirs': ["en-ru", "ru-en"],
+                    'langs': {'en': "English", 'ru': "Russian"}}),
+        "<ArrayOfString><string>en-ru</string><string>ru-en</string>"
+        "<string>en</string><string>ru</string></ArrayOfString>"
+    ),
+    'translate': (
+        json.dumps({'code': 200, 'lang': "en-ru", 'text': [TEXT.upper()]}),
+        '<Translation code="200" lang="en-ru"><text>{}</text></Translation>'
+        .format(TEXT.upper())
+    ),
+    'lookup': (
+        json.dumps({'head': {}, 'def': [
+            {'text': "fox", 'pos': "noun", 'tr': [
+                {'text': "лиса", 'pos': "noun", 'syn': [{'text': "лис"}],
+                 'mean': [{'text': "fox"}]}
+            ]} for __ in range(5)
+        ]}, ensure_ascii=False),
+        "<DicResult><head/>{}</DicResult>".format("".join(
+            '<def pos="noun"><text>fox</text><tr pos="noun"><text>лиса</text>'
+            '</tr></def>' for __ in range(5)
+        ))
+    ),
+    'complete': (
+        json.dumps({'endOfWord': False, 'pos': -3, 'text': ["brown"]}),
+        '<CompleteResponse endOfWord="false" pos="-3"><text><string>brown'
+        '</string></text></CompleteResponse>'
+    ),
+    'detect': (
+        json.dumps({'code': 200, 'lang': "en"}),
+        '<DetectedLang code="200" lang="en"/>'
+    ),
+    'checkText': (
+        json.dumps([{'code': 1, 'pos': 4, 'row': 0, 'col': 4, 'len': 5,
+                     'word': "quikc", 's': ["quick"]}]),
+        '<SpellResult><error code="1" pos="4" row="0" col="4" len="5">'
+        '<word>quikc</word><s>quick</s></error></SpellResult>'
+    ),
+}
+
+
+class StubPool(object):
+    """Connection pool answering with canned responses in process."""
+
+    def __init__(self):
+        self.requests = 0
+        self._responses = dict(
+            ((endpoint, xml), Response(200, "OK", [], body.encode('utf-8')))
+            for endpoint, bodies in RESPONSES.items()
+            for xml, body in zip((False, True), bodies)
+        )
+
+    def urlopen(self, method: str, url: str, body: bytes=None,
+                headers: dict=None) -> Response:
+        self.requests += 1
+        path = url.split("?", 1)[0]
+        endpoint = path.rsplit("/", 1)[-1]
+        return self._responses[(endpoint, ".json/" not in path)]
+
+    def prewarm(self, url: str, count: int=1) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+
+def measure(func: callable, number: int=None, repeat: int=3) -> float:
+    """Best time of one call (in seconds)."""
+    timer = Timer(func)
+    if number is None:
+        number = timer.autorange()[0]
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def make_clients(xml: bool=False) -> dict:
+    pool = StubPool()
+    return {
+        'Translator': Translator("key", xml=xml, pool=pool),
+        'Dictionary': Dictionary("key", xml=xml, pool=pool),
+        'Predictor': Predictor("key", xml=xml, pool=pool),
+        'Speller': Speller(xml=xml, pool=pool),
+    }
+
+
+# client -> (endpoint, request params, API call)
+CALLS = {
+    'Translator': ("translate", {'text': TEXT, 'lang': "en-ru"},
+                   lambda client: client.translate(TEXT, "en-ru")),
+    'Dictionary': ("lookup", {'text': "fox", 'lang': "en-ru"},
+                   lambda client: client.lookup("fox", "en-ru")),
+    'Predictor': ("complete", {'q': "the quick bro", 'lang': "en"},
+                  lambda client: client.complete("en", "the quick bro")),
+    'Speller': ("text", {'text': TEXT, 'lang': "en"},
+                lambda client: client.check_text(TEXT, ["en"])),
+}
+
+
+def benchmarks(xml: bool=False) -> list:
+    """Returns (name, function) pairs for all measured operations."""
+    cases = []
+    clients = make_clients(xml)
+    fmt = "xml" if xml else "json"
+    for name, client in sorted(clients.items()):
+        endpoint, params, call = CALLS[name]
+        url = client._make_url(endpoint)
+        form = client._form_params(**params)
+        api_method = client._endpoints[endpoint]
+        body = RESPONSES.get(api_method, RESPONSES['translate'])[xml]
+        body = body.encode('utf-8')
+        decode = parse_xml if xml else loads_json
+        cases.extend([
+            ("{}._form_params".format(name),
+             lambda client=client, params=params:
+                client._form_params(**params)),
+            ("{}._make_url".format(name),
+             lambda client=client, endpoint=endpoint:
+                client._make_url(endpoint)),
+            ("{}._prepare_request".format(name),
+             lambda client=client, url=url, form=form:
+                client._prepare_request(url, False, form)),
+            ("{}.decode[{}]".format(name, fmt),
+             lambda body=body, decode=decode: decode(body)),
+            ("{}.call[{}]".format(name, fmt),
+             lambda client=client, call=call: call(client)),
+        ])
+    return cases
+
+
+# max time of one call in seconds (far above expected, catches only
+# significant regressions on slow machines)
+BUDGETS = {
+    '_form_params': 0.0005,
+    '_make_url': 0.0005,
+    '_prepare_request': 0.001,
+    'decode': 0.002,
+    'call': 0.005,
+}
+
+
+@pytest.mark.parametrize("xml", [False, True], ids=["json", "xml"])
+def test_overhead(xml: bool):
+    for name, func in benchmarks(xml):
+        func()  # warm up (e.g. get languages list)
+        per_call = measure(func, number=100)
+        operation = name.split(".", 1)[1].split("[")[0]
+        assert per_call < BUDGETS[operation], name
+
+
+def detector_report(number: int=None) -> dict:
+    """Accuracy and speed of offline detection on hand-labelled texts."""
+    path = os.path.join(os.path.dirname(__file__), "data",
+                        "detect_answers.json")
+    with open(path, encoding='utf-8') as file:
+        answers = json.load(file)
+    detector = LanguageDetector()
+    translator = Translator("key", pool=StubPool())
+    known = set(detector.model['languages']) | set(_SCRIPT_LANGUAGES.values())
+    answered = correct = foreign = foreign_answered = 0
+    for text, lang in answers:
+        detected = detector.detect(text)[0]
+        if lang not in known:
+            foreign += 1
+            foreign_answered += detected is not None
+            continue
+        answered += detected is not None
+        correct += detected == lang
+    return {
+        'texts': len(answers) - foreign,
+        'answered': answered,
+        'correct': correct,
+        'foreign': foreign,
+        'foreign_answered': foreign_answered,
+        'local': measure(lambda: [detector.detect(text)
+                                  for text, __ in answers],
+                         number) / len(answers),
+        'api': measure(lambda: [translator.detect(text)
+                                for text, __ in answers],
+                       number) / len(answers),
+    }
+
+
+def test_local_detect():
+    report = detector_report(number=3)
+    assert report['answered'] >= 0.75 * report['texts']
+    assert report['correct'] >= 0.95 * report['answered']
+    # close relatives (Faroese, Low German) are answered with API language
+    assert report['foreign_answered'] <= 0.3 * report['foreign']
+    # far below round trip to API (tens of milliseconds)
+    assert report['local'] < 0.002
+
+
+def test_stub_pool():
+    clients = make_clients()
+    translator = clients['Translator']
+    assert translator.translate(TEXT, "en-ru")['text'] == [TEXT.upper()]
+    assert translator._pool.requests == 1
+    assert clients['Speller'].check_text(TEXT, ["en"])[0]['s'] == ["quick"]
+
+
+def main() -> None:
+    for xml in (False, True):
+        for name, func in benchmarks(xml):
+            func()
+            print("{:<36}{:>10.2f} us".format(name, measure(func) * 1e6))
+    report = detector_report()
+    print("LanguageDetector: {answered} of {texts} texts answered offline, "
+          "{correct} correct, {foreign_answered} of {foreign} texts in "
+          "other languages answered".format(**report))
+    print("{:<36}{:>10.2f} us".format("LanguageDetector.detect",
+                                      report['local'] * 1e6))
+    print("{:<36}{:>10.2f} us".format("Translator.detect (stub API)",
+                                      report['api'] * 1e6))
+
+
+if __name__ == "__main__":
+    main()
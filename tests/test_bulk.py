@@ -0,0 +1,142 @@
+from xml.etree import ElementTree
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.Translate import Translator
+
+
+class TestBulkTranslation:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+        self.t_json = stub_client(Translator, self.server, "123")
+        self.t_xml = stub_client(Translator, self.server, "123", xml=True)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test__separate_texts(self):
+        texts = ["a" * 3, "b" * 4, "c" * 2, "d" * 10, "e"]
+        assert Translator._separate_texts(texts, 7) == [[0, 1], [2], [3], [4]]
+        assert Translator._separate_texts(texts, 100) == [[0, 1, 2, 3, 4]]
+        assert Translator._separate_texts(texts, 100, 2) == \
+            [[0, 1], [2, 3], [4]]
+        assert Translator._separate_texts([], 10) == []
+
+    def test_translate_list(self):
+        translation = self.t_json.translate(["hello", "world, cat"], 'en-de')
+        assert translation['text'] == ["HELLO", "WORLD, CAT"]
+        translation = self.t_xml.translate(["hello", "world"], 'en-de')
+        assert isinstance(translation, ElementTree.Element)
+        assert len(translation.findall('text')) == 2
+
+    def test_translate_many(self):
+        texts = ["text number {}".format(idx) for idx in range(1000)]
+        requests_count = len(self.server.requests)
+        translated = self.t_json.translate_many(texts, 'en-ru')
+        assert translated == [text.upper() for text in texts]
+        # 14K symbols in total
+        assert len(self.server.requests) - requests_count == 2
+        translated = self.t_xml.translate_many(texts, 'en-ru', post=False,
+                                               max_count=100)
+        assert translated == [text.upper() for text in texts]
+        assert self.t_json.translate_many([], 'en-ru') == []
+
+    def test__separate_text(self):
+        text = "First sentence. Second one!\n\nNew paragraph here."
+        parts = Translator._separate_text(text, 30)
+        assert "".join(parts) == text
+        assert parts == ["First sentence. Second one!\n\n",
+                         "New paragraph here."]
+        parts = Translator._separate_text("word " * 100, 42)
+        assert "".join(parts) == "word " * 100
+        assert all(len(part) <= 42 and part.endswith(" ") for part in parts)
+        parts = Translator._separate_text("x" * 25, 10)
+        assert parts == ["x" * 10, "x" * 10, "x" * 5]
+        assert Translator._separate_text("", 10) == [""]
+
+    def test_translate_long(self):
+        text = "\n\n".join(
+            " ".join("Sentence {} of paragraph {}.".format(idx, par)
+                     for idx in range(30))
+            for par in range(50)
+        ) + "\n"
+        assert len(text) > 2 * Translator._POST_LIMIT
+        translation = self.t_json.translate(text, 'en-ru', post=True)
+        assert translation['text'] == [text.upper()]
+        assert translation['lang'] == 'en-ru'
+        translation = self.t_xml.translate(text, 'en-ru')
+        assert [node.text for node in translation.findall('text')] == \
+            [text.upper()]
+        translated = self.t_json.translate_many(["short", text], 'en-ru')
+        assert translated == ["SHORT", text.upper()]
+
+    def test_get_limit(self):
+        # Cyrillic symbol takes 6 bytes in URL
+        from urllib.parse import urlencode
+        texts = ["Привет, мир {}".format(idx) for idx in range(500)]
+        text = "".join("Предложение номер {}. ".format(idx)
+                       for idx in range(150))
+        assert len(text) < Translator._GET_LIMIT < len(urlencode(
+            {'text': text}
+        ))
+        requests_count = len(self.server.requests)
+        assert self.t_json.translate_many(texts, 'ru-en', post=False) == \
+            [text.upper() for text in texts]
+        assert self.t_json.translate(text, 'ru-en')['text'] == [text.upper()]
+        requests = self.server.requests[requests_count:]
+        assert len(requests) > 4
+        for method, __, params in requests:
+            assert method == "GET"
+            assert len(urlencode({'text': params['text']}, doseq=True)) < \
+                Translator._GET_LIMIT
+
+    def test_translate_html(self):
+        page = '<html><body><div class="page" title="a > b">{}</div>' \
+            '<script>var html = "<p>";</script></body></html>'.format(
+                "".join("<h2>Part {}</h2>\n<p>Sentence with <a href='/{}'>"
+                        "link</a> and <b>bold</b> text.</p>\n".format(idx, idx)
+                        for idx in range(600))
+            )
+        assert len(page) > 3 * Translator._POST_LIMIT
+        requests_count = len(self.server.requests)
+        translation = self.t_json.translate(page, 'en-ru', 'html', post=True)
+        assert translation['text'][0].lower() == page.lower()
+        # tags of opened up elements aren't translated
+        assert translation['text'][0].startswith(
+            '<html><body><div class="page" title="a > b"><H2>PART 0</H2>'
+        )
+        assert '<script>var html = "<p>";</script>' in translation['text'][0]
+        sent = [text for __, __, params in
+                self.server.requests[requests_count:]
+                for text in params['text']]
+        assert len(sent) > 3
+        for text in sent:
+            assert len(text) <= Translator._POST_LIMIT
+            # parts are cut between blocks
+            assert text.startswith(("<h2>", "<p>"))
+            assert text.endswith(("</h2>", "</p>"))
+            for tag in ("h2", "p", "a", "b"):
+                assert text.count("<{}".format(tag)) == \
+                    text.count("</{}>".format(tag))
+
+    def test_translate_stream(self):
+        consumed = []
+
+        def texts() -> ...:
+            for idx in range(500):
+                consumed.append(idx)
+                yield "text {}".format(idx)
+
+        stream = self.t_json.translate_stream(texts(), 'en-ru', workers=2,
+                                              max_count=10)
+        assert next(stream) == "TEXT 0"
+        # backpressure: only few packs are read in advance
+        assert len(consumed) <= 3 * 10 + 1
+        assert list(stream) == ["TEXT {}".format(idx)
+                                for idx in range(1, 500)]
+        pairs = list(self.t_xml.translate_stream(
+            ("text {}".format(idx) for idx in range(100)), 'en-ru',
+            ordered=False, max_count=7
+        ))
+        assert sorted(pairs) == [(idx, "TEXT {}".format(idx))
+                                 for idx in range(100)]
+        assert list(self.t_json.translate_stream([], 'en-ru')) == []
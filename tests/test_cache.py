@@ -0,0 +1,208 @@
+from time import sleep
+from xml.etree import ElementTree
+
+import pytest
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.cache import CompletionCache, LRUCache, SQLiteCache
+from pyLinguist.Prediction import Predictor
+from pyLinguist.Translate import Translator
+from pyLinguist.Vocabulary import Dictionary
+
+
+class TestLRUCache:
+    def test_lru(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+        assert cache.stats == {'hits': 3, 'misses': 1, 'evictions': 1,
+                               'expirations': 0, 'size': 2}
+        cache.clear()
+        assert not len(cache)
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        sleep(0.02)
+        assert cache.get("a", "default") == "default"
+        assert cache.stats['expirations'] == 1
+
+
+class TestTranslatorCache:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_translate(self):
+        translator = stub_client(Translator, self.server, "123", cache=True)
+        assert isinstance(translator.cache, LRUCache)
+        requests_count = len(self.server.requests)
+        first = translator.translate("hello", 'en-ru')
+        first['text'].append("changed")
+        second = translator.translate("hello", 'en-ru')
+        assert second == {'lang': 'en-ru', 'text': ["HELLO"]}
+        translator.translate("hello", 'en-de')
+        assert len(self.server.requests) - requests_count == 2
+        assert translator.cache.stats['hits'] == 1
+
+    def test_detect(self):
+        translator = stub_client(Translator, self.server, "123", xml=True,
+                                 cache=LRUCache(maxsize=10))
+        requests_count = len(self.server.requests)
+        assert translator.detect("hello").attrib['lang'] == 'en'
+        assert translator.detect("hello").attrib['lang'] == 'en'
+        assert len(self.server.requests) - requests_count == 1
+
+    def test_translate_many(self):
+        translator = stub_client(Translator, self.server, "123", cache=True)
+        assert translator.translate_many(["a", "b"], 'en-ru') == ["A", "B"]
+        requests_count = len(self.server.requests)
+        assert translator.translate_many(["b", "c", "a"], 'en-ru') == \
+            ["B", "C", "A"]
+        assert self.server.requests[-1][2]['text'] == ["c"]
+        assert translator.translate_many(["a", "c"], 'en-ru') == ["A", "C"]
+        assert len(self.server.requests) - requests_count == 1
+
+    def test_disabled(self):
+        translator = stub_client(Translator, self.server, "123")
+        assert translator.cache is None
+        requests_count = len(self.server.requests)
+        translator.translate("hello", 'en-ru')
+        translator.translate("hello", 'en-ru')
+        assert len(self.server.requests) - requests_count == 2
+
+
+class TestSQLiteCache:
+    def test_persistence(self, tmpdir):
+        path = str(tmpdir.join("cache.db"))
+        cache = SQLiteCache(path)
+        cache.set(("a", 1), {'def': [{'text': "hello"}]})
+        cache.set(("b", 2), ElementTree.fromstring("<a><b>c</b></a>"))
+        cache.close()
+        cache = SQLiteCache(path)
+        assert cache.get(("a", 1)) == {'def': [{'text': "hello"}]}
+        assert cache.get(("b", 2)).find('b').text == "c"
+        assert cache.get(("c", 3)) is None
+        assert cache.stats == {'hits': 2, 'misses': 1, 'evictions': 0,
+                               'expirations': 0, 'size': 2}
+
+    def test_compaction(self):
+        cache = SQLiteCache(":memory:", maxsize=3, compact_every=5)
+        for idx in range(4):
+            cache.set(idx, idx)
+        assert len(cache) == 4
+        assert cache.get(0) == 0  # recently used
+        cache.set(4, 4)  # compaction
+        assert len(cache) == 3
+        assert cache.get(0) == 0
+        assert cache.get(1) is None
+        assert cache.stats['evictions'] == 2
+        cache.ttl = -1
+        cache.compact(vacuum=True)
+        assert not len(cache)
+        cache.ttl = None
+        cache.set(5, 5)
+        cache.ttl = -1
+        assert cache.get(5) is None
+        assert cache.stats['expirations'] == 4
+
+
+class TestDictionaryCache:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_lookup(self, tmpdir):
+        path = str(tmpdir.join("lookup.db"))
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 cache=SQLiteCache(path))
+        requests_count = len(self.server.requests)
+        assert dictionary.lookup("hello", 'en-ru') == {'def': []}
+        assert dictionary.definitions("hello", 'en-ru') == []
+        assert len(self.server.requests) - requests_count == 2  # + getLangs
+        # warm start without network requests at all
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 cache=SQLiteCache(path))
+        assert dictionary.lookup("hello", 'en-ru') == {'def': []}
+        assert len(self.server.requests) - requests_count == 2
+
+
+class TestCompletionCache:
+    def test_exact(self):
+        cache = CompletionCache()
+        response = {'endOfWord': False, 'pos': -3, 'text': ["hello", "help"]}
+        cache.set(('en', "hel", 2), response)
+        assert cache.get(('en', "hel", 2)) == response
+        assert cache.get(('en', "hel", 1))['text'] == ["hello"]
+        assert cache.get(('en', "hel", 5)) is None  # could be more
+        assert cache.get(('ru', "hel", 1)) is None
+        assert cache.stats['hits'] == 2
+
+    def test_derived(self):
+        cache = CompletionCache()
+        cache.set(('en', "say hel", 3), {
+            'endOfWord': False, 'pos': -3, 'text': ["hello", "helpful"]
+        })
+        # less then limit returned: list is full
+        assert cache.get(('en', "say hell", 5)) == \
+            {'endOfWord': False, 'pos': -4, 'text': ["hello"]}
+        assert cache.get(('en', "say help", 1))['text'] == ["helpful"]
+        assert cache.get(('en', "say helm", 1)) is None
+        assert cache.get(('en', "say hello", 1)) is None  # end of word
+        assert cache.get(('en', "say hel w", 1)) is None  # new word
+        cache.set(('en', "he", 2), {
+            'endOfWord': False, 'pos': -2, 'text': ["hello", "her"]
+        })
+        assert cache.get(('en', "hel", 1))['text'] == ["hello"]
+        assert cache.get(('en', "hel", 2)) is None  # truncated list
+        cache.set(('en', "go ", 2), {
+            'endOfWord': False, 'pos': 0, 'text': ["home", "away"]
+        })
+        assert cache.get(('en', "go a", 1))['text'] == ["away"]
+        assert cache.stats['derived'] == 4
+
+    def test_memory_budget(self):
+        cache = CompletionCache(memory_budget=2000)
+        for idx in range(100):
+            cache.set(('en', "word{}".format(idx), 1), {
+                'endOfWord': False, 'pos': -5, 'text': ["word{}0".format(idx)]
+            })
+        assert cache.memory <= 2000
+        assert 0 < len(cache) < 100
+        assert cache.get(('en', "word99", 1))
+        assert cache.get(('en', "word0", 1)) is None
+        assert cache.stats['evictions'] == 100 - len(cache)
+        cache.clear()
+        assert not cache.memory
+        assert not cache._roots
+
+
+class TestPredictorCache:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_complete(self):
+        predictor = stub_client(Predictor, self.server, "123",
+                                cache=CompletionCache())
+        requests_count = len(self.server.requests)
+        assert predictor.complete('en', "he", limit=5)['text'] == ["hello"]
+        assert predictor.complete('en', "hel", limit=5) == \
+            {'endOfWord': False, 'pos': -3, 'text': ["hello"]}
+        assert predictor.complete('en', "hell")['text'] == ["hello"]
+        assert len(self.server.requests) - requests_count == 2  # + getLangs
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.cli import main, translate_file
+from pyLinguist.Translate import Translator
+
+
+class TestCLI:
+    def setup_class(self):
+        self.fail_after = [None]
+
+        def responder(*args) -> tuple:
+            if self.fail_after[0] is not None:
+                if not self.fail_after[0]:
+                    return 401, b""
+                self.fail_after[0] -= 1
+            return fake_api(*args)
+
+        self.server = StubServer(responder)
+        self.translator = stub_client(Translator, self.server, "123")
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_text(self, tmpdir):
+        source = tmpdir.join("input.txt")
+        source.write_text("hello\n\nпривет мир\nlast", encoding='utf-8')
+        output = str(tmpdir.join("output.txt"))
+        stats = translate_file(self.translator, str(source), output, 'en-ru',
+                               max_count=2, checkpoint_every=1)
+        assert stats == {'lines': 4, 'translated': 4, 'resumed': 0}
+        with open(output, encoding='utf-8') as file:
+            assert file.read() == "HELLO\n\nПРИВЕТ МИР\nLAST"
+        assert not os.path.exists(output + ".checkpoint")
+
+    def test_jsonl_tsv(self, tmpdir):
+        source = tmpdir.join("input.jsonl")
+        rows = ['{"id": 2}', '[1, "text"]', '"text"', '3', "",
+                '{"text": null}']
+        source.write_text('{"id": 1, "text": "cat"}\n' + "\n".join(rows) +
+                          "\n", encoding='utf-8')
+        output = str(tmpdir.join("output.jsonl"))
+        translate_file(self.translator, str(source), output, 'en-ru')
+        with open(output, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        # rows without translated field are kept as is
+        assert [json.loads(lines[0])] + lines[1:] == \
+            [{'id': 1, 'text': "CAT"}] + rows
+        source = tmpdir.join("input.tsv")
+        source.write_text("1\tcat\n2\tdog\n", encoding='utf-8')
+        output = str(tmpdir.join("output.tsv"))
+        translate_file(self.translator, str(source), output, 'en-ru',
+                       column=1)
+        with open(output, encoding='utf-8') as file:
+            assert file.read() == "1\tCAT\n2\tDOG\n"
+
+    def test_resume(self, tmpdir):
+        lines = ["line {}".format(idx) for idx in range(100)]
+        source = tmpdir.join("input.txt")
+        source.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        output = str(tmpdir.join("output.txt"))
+        self.fail_after[0] = 5
+        with pytest.raises(Exception):
+            translate_file(self.translator, str(source), output, 'en-ru',
+                           workers=1, max_count=10, checkpoint_every=10)
+        self.fail_after[0] = None
+        assert os.path.exists(output + ".checkpoint")
+        requests_count = len(self.server.requests)
+        stats = translate_file(self.translator, str(source), output, 'en-ru',
+                               workers=1, max_count=10, checkpoint_every=10)
+        assert stats['resumed'] == 50
+        assert len(self.server.requests) - requests_count == 5
+        with open(output, encoding='utf-8') as file:
+            assert file.read().splitlines() == [line.upper()
+                                                for line in lines]
+
+    def test_main(self, tmpdir, capsys):
+        with pytest.raises(SystemExit):
+            main([])
+        assert main(["in.txt", "out.txt", "-l", "ru", "--key", ""]) == 2
+        result = subprocess.run(
+            [sys.executable, "-m", "pyLinguist", "--help"],
+            stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__)
+            ))
+        )
+        assert result.returncode == 0
+        assert b"checkpoint" in result.stdout
+        assert b"--processes" in result.stdout
@@ -0,0 +1,95 @@
+import asyncio
+import gzip
+import sys
+import zlib
+
+import pytest
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.exc import YaNetworkException
+from pyLinguist.metrics import Metrics
+from pyLinguist.transport import ContentDecodingError, Response
+from pyLinguist.Vocabulary import Dictionary
+
+BIG_LOOKUP = ('{"head": {}, "def": [' + ", ".join(
+    '{"text": "fox", "pos": "noun", "tr": [{"text": "лиса"}]}'
+    for __ in range(200)
+) + ']}').encode('utf-8')
+
+
+def compressing_api(method: str, path: str, params: dict,
+                    headers: dict) -> tuple:
+    if not path.endswith("lookup"):
+        return fake_api(method, path, params, headers)
+    accepted = headers.get("Accept-Encoding", "")
+    if "gzip" in accepted:
+        return 200, gzip.compress(BIG_LOOKUP), {'Content-Encoding': "gzip"}
+    elif "deflate" in accepted:
+        return 200, zlib.compress(BIG_LOOKUP), {'Content-Encoding': "deflate"}
+    return 200, BIG_LOOKUP
+
+
+class TestResponse:
+    def test_decompress(self):
+        response = Response(200, "OK", [("Content-Encoding", "gzip")],
+                            gzip.compress(BIG_LOOKUP))
+        assert response.read() == BIG_LOOKUP
+        assert response.size < len(BIG_LOOKUP)
+        raw_deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        body = raw_deflate.compress(BIG_LOOKUP) + raw_deflate.flush()
+        response = Response(200, "OK", [("Content-Encoding", "deflate")],
+                            body)
+        assert response.read() == BIG_LOOKUP
+        with pytest.raises(ContentDecodingError):
+            Response(200, "OK", [("Content-Encoding", "gzip")], b"garbage")
+
+
+class TestCompressedClient:
+    def setup_class(self):
+        self.server = StubServer(compressing_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_enabled(self):
+        metrics = Metrics()
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 metrics=metrics)
+        assert len(dictionary.lookup("fox", "en-ru")['def']) == 200
+        stats = metrics.snapshot()['requests']['lookup']
+        assert stats['bytes_received'] < len(BIG_LOOKUP) // 5
+
+    def test_disabled(self):
+        metrics = Metrics()
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 compress=False, metrics=metrics)
+        assert len(dictionary.lookup("fox", "en-ru")['def']) == 200
+        stats = metrics.snapshot()['requests']['lookup']
+        assert stats['bytes_received'] == len(BIG_LOOKUP)
+
+    def test_corrupted(self):
+        server = StubServer(lambda *args: (
+            200, b"not gzip", {'Content-Encoding': "gzip"}
+        ))
+        try:
+            dictionary = stub_client(Dictionary, server, "123")
+            with pytest.raises(YaNetworkException):
+                dictionary.get_langs()
+        finally:
+            server.close()
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="asyncio clients require Python 3.6+")
+    def test_async(self):
+        from pyLinguist.aio import AsyncDictionary
+
+        async def lookup() -> dict:
+            async with stub_client(AsyncDictionary, self.server,
+                                   "123") as dictionary:
+                return await dictionary.lookup("fox", "en-ru")
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert len(loop.run_until_complete(lookup())['def']) == 200
+        finally:
+            loop.close()
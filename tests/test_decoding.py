@@ -0,0 +1,91 @@
+import json
+import tracemalloc
+from xml.etree import ElementTree
+
+import pytest
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist import decoding
+from pyLinguist.Vocabulary import Dictionary
+
+
+def peak_memory(func: callable) -> int:
+    tracemalloc.start()
+    try:
+        __ = func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+LOOKUP = json.dumps({'head': {}, 'def': [
+    {'text': "привет{}".format(idx), 'pos': "noun", 'tr': [
+        {'text': "hello", 'pos': "noun", 'syn': [{'text': "hi"}]}
+    ]} for idx in range(2000)
+]}, ensure_ascii=False).encode('utf-8')
+CHECK_TEXTS = "<ArrayOfSpellResult>{}</ArrayOfSpellResult>".format("".join(
+    '<SpellResult><error code="1" pos="0" row="0" col="0" len="7">'
+    '<word>превед{}</word><s>привет</s></error></SpellResult>'.format(idx)
+    for idx in range(3000)
+)).encode('utf-8')
+
+
+class TestDecoding:
+    def teardown_method(self):
+        decoding.set_json_backend()
+
+    def test_json(self):
+        assert decoding.loads_json(b'{"text": ["\xd0\xb0"]}') == \
+            {'text': ["а"]}
+        assert decoding.set_json_backend("json") == "json"
+        assert decoding.json_backend() == "json"
+        assert decoding.loads_json(LOOKUP) == json.loads(LOOKUP.decode())
+        with pytest.raises(ValueError):
+            decoding.set_json_backend("yaml")
+
+    def test_json_str_only(self):
+        # json.loads of Python before 3.6 doesn't accept bytes
+        json_bytes = decoding._JSON_BYTES
+        decoding._JSON_BYTES = False
+        try:
+            decoding.set_json_backend("json")
+        finally:
+            decoding._JSON_BYTES = json_bytes
+        assert decoding.loads_json(b'{"text": ["\xd0\xb0"]}') == \
+            {'text': ["а"]}
+        assert decoding.loads_json('{"code": 200}') == {'code': 200}
+
+    def test_xml(self):
+        tree = decoding.parse_xml(CHECK_TEXTS)
+        assert tree.find('SpellResult/error/word').text == "превед0"
+        texts = list(decoding.iter_xml_texts(CHECK_TEXTS, "word"))
+        assert texts == ["превед{}".format(idx) for idx in range(3000)]
+        assert list(decoding.iter_xml_texts(
+            b"<Langs><dirs><string>en-ru</string></dirs></Langs>", "string"
+        )) == ["en-ru"]
+        with pytest.raises(ElementTree.ParseError):
+            list(decoding.iter_xml_texts(b"<Langs><dirs>", "string"))
+
+    def test_xml_allocations(self):
+        old = peak_memory(
+            lambda: ElementTree.fromstring(CHECK_TEXTS.decode('utf-8'))
+        )
+        assert peak_memory(lambda: decoding.parse_xml(CHECK_TEXTS)) < old
+        assert peak_memory(lambda: list(decoding.iter_xml_texts(
+            CHECK_TEXTS, "word"
+        ))) < old // 4
+
+    def test_json_allocations(self):
+        pytest.importorskip("orjson")
+        old = peak_memory(lambda: json.loads(LOOKUP.decode('utf-8')))
+        assert decoding.set_json_backend() == "orjson"
+        assert peak_memory(lambda: decoding.loads_json(LOOKUP)) < old
+
+    def test_xml_langs(self):
+        server = StubServer(fake_api)
+        try:
+            dictionary = stub_client(Dictionary, server, "123", xml=True)
+            dictionary._url += "decoding/"  # not shared with other tests
+            assert dictionary.get_langs() == ["en-ru", "en"]
+        finally:
+            server.close()
@@ -65,3 +65,52 @@ class TestImports:
         assert "Prediction" in locals()
         assert Prediction.Predictor
         del Prediction
+
+
+class TestImportCost:
+    # modules which should be imported only with the first request
+    HEAVY_MODULES = ("http.client", "ssl", "json", "xml.etree.ElementTree",
+                     "urllib.parse", "asyncio", "random")
+    IMPORT_BUDGET = 0.2  # seconds, generous for slow CI machines
+    CONSTRUCTION_BUDGET = 0.001  # seconds per client
+
+    def _run(self, code: str) -> dict:
+        # result is printed by repr(), so json isn't imported by script
+        import ast
+        import subprocess
+        import sys
+        output = subprocess.check_output([sys.executable, "-c", code])
+        return ast.literal_eval(output.decode('utf-8'))
+
+    def test_import(self):
+        result = self._run(
+            "import sys, time\n"
+            "loaded = set(sys.modules)\n"
+            "start = time.perf_counter()\n"
+            "import pyLinguist\n"
+            "duration = time.perf_counter() - start\n"
+            "print(repr({'time': duration, "
+            "'modules': sorted(set(sys.modules) - loaded)}))\n"
+        )
+        assert result['time'] < self.IMPORT_BUDGET
+        for module in self.HEAVY_MODULES:
+            assert module not in result['modules']
+
+    def test_construction(self):
+        result = self._run(
+            "import logging, sys, time\n"
+            "import pyLinguist\n"
+            "loaded = set(sys.modules)\n"
+            "start = time.perf_counter()\n"
+            "for __ in range(1000):\n"
+            "    pyLinguist.Translator('key')\n"
+            "    pyLinguist.Dictionary('key')\n"
+            "duration = (time.perf_counter() - start) / 2000\n"
+            "print(repr({'time': duration, "
+            "'modules': sorted(set(sys.modules) - loaded), "
+            "'handlers': len(logging.getLogger().handlers)}))\n"
+        )
+        assert result['time'] < self.CONSTRUCTION_BUDGET
+        assert result['handlers'] == 0  # root logger isn't configured
+        for module in self.HEAVY_MODULES:
+            assert module not in result['modules']
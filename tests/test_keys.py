@@ -0,0 +1,102 @@
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.keys import KeyPool
+from pyLinguist.quota import RateLimiter
+from pyLinguist.Translate import Translator
+
+
+def keyed_api(method: str, path: str, params: dict, headers: dict) -> tuple:
+    """Key 'blocked' is blocked, key 'limited' has reached requests limit."""
+    code = {'blocked': 402, 'limited': 403}.get(params['key'][0])
+    if code:
+        return code, b""
+    return fake_api(method, path, params, headers)
+
+
+class TestKeyPool:
+    def test_round_robin(self):
+        pool = KeyPool(["a", "b", "c", "a"])
+        assert pool.keys == ["a", "b", "c"]
+        assert [pool.acquire() for __ in range(4)] == ["a", "b", "c", "a"]
+        assert pool.retire("b", 403)
+        assert not pool.retire("c", 503)
+        assert not pool.retire("unknown", 403)
+        assert pool.active == ["a", "c"]
+        assert pool.stats['b'] == {'requests': 1, 'retired': 403}
+
+    def test_least_used(self):
+        pool = KeyPool(["a", "b"], strategy=KeyPool.LEAST_USED)
+        assert pool.acquire() == "a"
+        assert pool.acquire() == "b"
+        pool.retire("b", 404)
+        assert [pool.acquire() for __ in range(3)] == ["a"] * 3
+        with pytest.raises(ValueError):
+            KeyPool(["a"], strategy="random")
+        with pytest.raises(YaTranslateException):
+            KeyPool([])
+
+    def test_exhausted(self):
+        pool = KeyPool(["a", "b"])
+        pool.retire("a", 402)
+        pool.retire("b", 404)
+        with pytest.raises(YaTranslateException) as info:
+            pool.acquire()
+        assert info.value.status_code == 404
+
+    def test_daily_reset(self, monkeypatch):
+        pool = KeyPool(["a", "b"])
+        pool.retire("a", 403)
+        assert pool.active == ["b"]
+        monkeypatch.setattr("pyLinguist.keys._today", lambda: "2100-01-01")
+        assert pool.active == ["a", "b"]
+        assert pool.stats['a'] == {'requests': 0, 'retired': None}
+
+
+class TestFailover:
+    def setup_class(self):
+        self.server = StubServer(keyed_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def _keys_used(self, count: int) -> list:
+        return [request[2]['key'][0]
+                for request in self.server.requests[-count:]]
+
+    def test_failover(self):
+        translator = stub_client(Translator, self.server,
+                                 ["blocked", "good", "limited"])
+        assert translator.keys.keys == ["blocked", "good", "limited"]
+        for __ in range(3):
+            assert translator.translate("hi", "en-ru")['text'] == ["HI"]
+        assert translator.keys.active == ["good"]
+        assert translator.keys.stats['blocked']['retired'] == 402
+        assert translator.keys.stats['limited']['retired'] == 403
+
+    def test_all_retired(self):
+        translator = stub_client(Translator, self.server,
+                                 ("blocked", "limited"))
+        with pytest.raises(YaTranslateException) as info:
+            translator.translate("hi", "en-ru")
+        assert info.value.status_code in (402, 403)
+
+    def test_shared_pool(self):
+        keys = KeyPool(["first", "second"])
+        first = stub_client(Translator, self.server, keys)
+        second = stub_client(Translator, self.server, keys)
+        first.translate("one", "en-ru")
+        second.translate("two", "en-ru")
+        assert self._keys_used(2) == ["first", "second"]
+
+    def test_local_quota(self):
+        limiter = RateLimiter(requests_per_day=1)
+        translator = stub_client(Translator, self.server, ["k1", "k2"],
+                                 limiter=limiter)
+        for __ in range(2):
+            translator.translate("hi", "en-ru")
+        assert self._keys_used(2) == ["k1", "k2"]
+        with pytest.raises(YaTranslateException) as info:
+            translator.translate("hi", "en-ru")
+        assert info.value.status_code == 403
@@ -0,0 +1,140 @@
+import json
+import os
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist import langid
+from pyLinguist.langid import LanguageDetector
+from pyLinguist.Translate import Translator
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data")
+
+
+def load_data(name: str) -> ...:
+    with open(os.path.join(DATA_PATH, name), encoding='utf-8') as file:
+        return json.load(file)
+
+
+class TestLanguageDetector:
+    def setup_class(self):
+        self.detector = LanguageDetector()
+
+    def test_shipped_model(self):
+        # shipped model is built from tests/data/langid_corpus.json
+        corpus = load_data("langid_corpus.json")
+        assert langid.train(corpus) == langid.load_model()
+
+    def test_scripts(self):
+        assert self.detector.detect("Καλημέρα σας, τι κάνετε σήμερα;") == \
+            ("el", 1.0)
+        assert self.detector.detect("今晩二人用のテーブルを予約したい")[0] == "ja"
+        assert self.detector.detect("Привет") == (None, 0.0)  # too short
+        assert self.detector.detect("أود حجز طاولة لشخصين هذا المساء") == \
+            (None, 0.0)
+        # Hebrew script is shared with Yiddish
+        assert self.detector.detect("מחר נלך לים אם מזג האוויר יהיה טוב")[0] \
+            == "he"
+        assert self.detector.detect("מאָרגן פֿאָרן מיר צום ים אויב דאָס "
+                                    "וועטער איז גוט")[0] == "yi"
+
+    def test_ngrams(self):
+        lang, confidence = self.detector.detect(
+            "Мій брат працює лікарем у великій лікарні"
+        )
+        assert lang == "uk" and confidence >= self.detector.threshold
+        scores = self.detector.scores("The weather is nice today")
+        assert scores[0][0] == "en"
+        assert abs(sum(probability for __, probability in scores) - 1) < 1e-9
+
+    def test_hint(self):
+        text = "Мама мыла раму вчера вечером дома"
+        assert self.detector.detect(text)[0] is None  # ru or mhr
+        assert self.detector.candidates(text) == ["ru", "mhr"]
+        assert self.detector.detect(text, hint=["ru", "en"])[0] == "ru"
+        assert self.detector.detect(text, hint=["ru", "mhr"])[0] is None
+        # hint only chooses between probable languages
+        assert self.detector.detect("Je voudrais réserver une table pour "
+                                    "deux personnes",
+                                    hint=["en", "de"])[0] == "fr"
+        assert self.detector.detect("Καλημέρα σας, τι κάνετε σήμερα;",
+                                    hint=["en"]) == ("el", 1.0)
+
+    def test_related(self):
+        # close relatives of each other, mistaken for larger languages
+        # by model which didn't know all Latin languages of API
+        for text, lang in (
+                ("Minggu depan kami akan pergi ke pantai jika cuaca bagus.",
+                 "id"),
+                ("Kami akan makan malam bersama keluarga besar pada hari "
+                 "Minggu.", "id"),
+                ("Pupunta kami sa dalampasigan sa susunod na linggo kung "
+                 "maganda ang panahon.", "tl"),
+                ("Gusto kong bumili ng bagong sapatos para sa kasal ng "
+                 "kapatid ko.", "tl"),
+                ("Mi volas lerni la lingvon de mia patrino kaj patro.", "eo"),
+                ("Venontan semajnon ni iros al la maro se la vetero estos "
+                 "bona.", "eo"),
+                ("Mir ginn nächst Woch op d'Plage, wann d'Wieder gutt ass.",
+                 "lb"),
+                ("Ech wunnen zanter zwee Joer mat menger Fra zu "
+                 "Lëtzebuerg.", "lb"),
+                ("Myn broer wennet al jierren yn in lyts doarp by de see.",
+                 "fy"),
+                ("Ons gaan volgende week strand toe as die weer mooi is.",
+                 "af"),
+                ("Ek het gister die hele middag in die tuin gewerk.", "af"),
+                ("Toget var forsinket og vi rakk ikke forbindelsen til "
+                 "Bergen.", "no"),
+                ("Vi skal spise middag hos besteforeldrene mine i morgen "
+                 "kveld.", "no")):
+            assert self.detector.detect(text)[0] in (None, lang), text
+
+    def test_foreign(self):
+        # languages outside of model (and of API)
+        for text in ("Mañana vamos dir a la playa si fai bon tiempu",  # ast
+                     "Doman o larìn al mâr se al fâs biel timp",  # fur
+                     "Jutře pojědźemy k morju, jeli budźe rjane "
+                     "wjedro",  # hsb
+                     "Sabah an dê biçin behrê heke hewa xweş be",  # ku
+                     "Yarın eger hava yahşı olsa, deñizge barırmız"):  # crh
+            assert self.detector.scores(text)  # some language is the best
+            assert self.detector.detect(text)[0] is None, text
+            assert self.detector.detect(text, hint=["es", "tr"])[0] is None
+            assert self.detector.candidates(text) == [], text
+
+
+class TestLocalDetect:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def _detect_requests(self) -> list:
+        return [request for request in self.server.requests
+                if request[1].endswith("detect")]
+
+    def test_offline(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 local_detect=True)
+        requests_count = len(self._detect_requests())
+        assert translator.detect("Wir fahren dieses Wochenende in die "
+                                 "Berge") == "de"
+        assert len(self._detect_requests()) == requests_count
+        translator = stub_client(Translator, self.server, "123", xml=True,
+                                 local_detect=True)
+        response = translator.detect("Nous allons à la montagne ce week-end")
+        assert response.attrib == {'code': "200", 'lang': "fr"}
+
+    def test_fallback(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 local_detect=LanguageDetector(threshold=1.1))
+        assert translator.detect("Ich möchte einen Tisch reservieren") == \
+            "en"  # stub always answers "en"
+        assert self._detect_requests()[-1][2]['hint'] == ["de,lb"]
+        assert translator.detect("Hi", hint=["en"]) == "en"
+        assert self._detect_requests()[-1][2]['hint'] == ["en"]  # user's
+        assert translator.detect("مرحبا بكم") == "en"
+        assert "hint" not in self._detect_requests()[-1][2]  # no guesses
+        assert translator.detect("Yarın eger hava yahşı olsa, deñizge "
+                                 "barırmız") == "en"  # crimean tatar
+        assert "hint" not in self._detect_requests()[-1][2]
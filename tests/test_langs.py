@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.Translate import Translator
+from pyLinguist.Vocabulary import Dictionary
+
+
+class TestLangsIndex:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def _langs_requests(self) -> int:
+        return len([request for request in self.server.requests
+                    if request[1].endswith("getLangs")])
+
+    def test_index(self):
+        assert Translator._build_langs_index({
+            'dirs': ["en-ru"], 'langs': {'en': "English"}
+        }) == frozenset(["en-ru", "en"])
+        assert Dictionary._build_langs_index(["en-ru"]) == \
+            frozenset(["en-ru"])
+
+    def test_shared(self):
+        requests_count = self._langs_requests()
+        first = stub_client(Dictionary, self.server, "123", xml=True)
+        assert first._lang_supported("en-ru")
+        assert not first._lang_supported("cpp")
+        second = stub_client(Dictionary, self.server, "123", xml=True)
+        with pytest.raises(YaTranslateException):
+            second.lookup("hello", "cpp")
+        assert second._langs_index is first._langs_index
+        assert self._langs_requests() - requests_count == 1
+        second.get_langs(update=True)
+        assert self._langs_requests() - requests_count == 2
+
+    def test_persistence(self, tmpdir):
+        from pyLinguist import mixins
+        path = str(tmpdir.join("langs.json"))
+        requests_count = self._langs_requests()
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 langs_path=path)
+        assert dictionary._lang_supported("en-ru")
+        with open(path) as file:
+            assert list(json.load(file).values())[0]['langs'] == \
+                ["en-ru", "en"]
+        mixins._LANGS_REGISTRY.clear()  # same as new process
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 langs_path=path)
+        assert dictionary.get_langs() == ["en-ru", "en"]
+        assert self._langs_requests() - requests_count == 1
+        mixins._LANGS_REGISTRY.clear()
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 langs_path=path, langs_ttl=-1)
+        assert dictionary.get_langs() == ["en-ru", "en"]
+        assert self._langs_requests() - requests_count == 2
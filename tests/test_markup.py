@@ -0,0 +1,70 @@
+from pyLinguist.markup import parse, split_html
+from pyLinguist.Translate import Translator
+
+
+def split(text: str, limit: int, size: callable=len) -> list:
+    parts = split_html(text, limit, Translator._separate_text, size)
+    assert "".join(part for part, __ in parts) == text
+    return parts
+
+
+class TestMarkup:
+    def test_parse(self):
+        text = '<div title="a > b"><p>One<br>two</p><!-- <p> -->' \
+               '<p>unclosed<img src="x"/></div></i>tail'
+        div, stray, tail = parse(text)
+        assert (div.name, text[div.start:div.open_end]) == \
+            ("div", '<div title="a > b">')
+        assert text[div.close_start:div.end] == "</div>"
+        first, comment, second = div.children
+        assert [child.name for child in first.children] == [None, "br", None]
+        assert comment.markup and comment.name is None
+        # not closed element ends with its parent
+        assert text[second.start:second.end] == '<p>unclosed<img src="x"/>'
+        assert second.close_start == second.end
+        assert stray.markup and text[stray.start:stray.end] == "</i>"
+        assert not tail.markup and text[tail.start:] == "tail"
+
+    def test_split(self):
+        assert split("<p>short</p>", 100) == [("<p>short</p>", True)]
+        assert split("", 10) == []
+        text = "<p>{}</p><p>{}</p>".format("a" * 10, "b" * 10)
+        assert split(text, 20) == [("<p>aaaaaaaaaa</p>", True),
+                                   ("<p>bbbbbbbbbb</p>", True)]
+        # cuts are between blocks
+        text = "<p>x</p><p>a <b>b</b></p><p>c</p>"
+        assert split(text, 25) == [("<p>x</p><p>a <b>b</b></p>", True),
+                                   ("<p>c</p>", True)]
+        # inline text isn't cut if it could be kept together
+        assert split("<p>aaaa</p>bb <b>c</b> dd", 20) == [
+            ("<p>aaaa</p>", True), ("bb <b>c</b> dd", True)
+        ]
+        text = "<div><p>{}</p><p>{}</p></div>".format("a" * 10, "b" * 10)
+        assert split(text, 20) == [("<div>", False),
+                                   ("<p>aaaaaaaaaa</p>", True),
+                                   ("<p>bbbbbbbbbb</p>", True),
+                                   ("</div>", False)]
+        # size of parts is measured by given function
+        text = "<p>{}</p><p>{}</p>".format("я" * 5, "б" * 5)
+        assert split(text, 20, lambda part: len(part.encode('utf-8'))) == \
+            [("<p>яяяяя</p>", True), ("<p>ббббб</p>", True)]
+        assert split("<p>{}</p>".format("я" * 20), 70,
+                     Translator._url_size) == [("<p>", False),
+                                               ("я" * 10, True),
+                                               ("я" * 10, True),
+                                               ("</p>", False)]
+
+    def test_long_nodes(self):
+        script = "<script>{}</script>".format("x" * 50)
+        parts = split("<p>a</p>{}<p>{}</p>".format(
+            script, "Sentence here. " * 5
+        ), 30)
+        assert ("<p>a</p>", True) in parts
+        assert (script, False) in parts
+        assert all(len(part) <= 30 for part, translate in parts if translate)
+        assert [part for part, __ in parts[-4:-1]] == [
+            "Sentence here. " * 2, "Sentence here. " * 2, "Sentence here. "
+        ]
+        # markup without text isn't translated
+        assert split("<!DOCTYPE html>\n<html>{}</html>".format(script), 20)[0] \
+            == ("<!DOCTYPE html>\n", False)
@@ -0,0 +1,103 @@
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.metrics import NULL_METRICS, Metrics
+from pyLinguist.Translate import Translator
+
+
+class TestMetrics:
+    def test_histogram(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.observe_request("translate", 0.05, 10, 20, 5, 200)
+        metrics.observe_request("translate", 0.5, 10, 0, 5, 503)
+        metrics.observe_request("translate", 5, 10, 0, 5, 503)
+        stats = metrics.snapshot()['requests']['translate']
+        assert stats['count'] == 3
+        assert stats['errors'] == {503: 2}
+        assert stats['bytes_sent'] == 30
+        assert stats['bytes_received'] == 20
+        assert stats['chars'] == 15
+        assert stats['latency']['buckets'] == \
+            [(0.1, 1), (1, 2), (float("inf"), 3)]
+        assert stats['latency']['sum'] == pytest.approx(5.55)
+        metrics.reset()
+        assert metrics.snapshot() == {'requests': {}, 'cache': {}}
+
+    def test_null(self):
+        NULL_METRICS.observe_request("translate", 1, 1, 1, 1, 200)
+        assert not NULL_METRICS.enabled
+        assert NULL_METRICS.snapshot() == {'requests': {}, 'cache': {}}
+
+
+class TestInstrumentedClient:
+    def setup_class(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_disabled(self):
+        translator = stub_client(Translator, self.server, "123")
+        assert translator.metrics is NULL_METRICS
+
+    def test_requests(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 metrics=True, cache=True)
+        for __ in range(2):
+            assert translator.translate("hello", "en-ru")['text'] == \
+                ["HELLO"]
+        translator.detect("hello")
+        snapshot = translator.metrics.snapshot()
+        stats = snapshot['requests']['translate']
+        assert stats['count'] == 1
+        assert stats['chars'] == 5
+        assert stats['bytes_sent'] > 0 and stats['bytes_received'] > 0
+        assert snapshot['requests']['detect']['count'] == 1
+        assert snapshot['cache']['translate'] == \
+            {'hits': 1, 'misses': 1, 'ratio': 0.5}
+
+    def test_errors(self):
+        server = StubServer(lambda *args: (401, b""))
+        metrics = Metrics()
+        try:
+            translator = stub_client(Translator, server, "123",
+                                     metrics=metrics)
+            with pytest.raises(YaTranslateException):
+                translator.translate("hello", "en-ru")
+        finally:
+            server.close()
+        assert metrics.snapshot()['requests']['translate']['errors'] == \
+            {401: 1}
+
+    def test_hooks(self):
+        calls = []
+
+        def before(endpoint: str, parameters: dict) -> None:
+            parameters['options'] = 1
+            calls.append(("before", endpoint))
+
+        def after(endpoint: str, parameters: dict, result: ...,
+                  error: Exception, latency: float) -> None:
+            calls.append(("after", endpoint, result is not None, error,
+                          latency >= 0))
+
+        translator = stub_client(Translator, self.server, "123")
+        translator.add_hook("before", before)
+        translator.add_hook("after", after)
+        translator.translate("hello", "en-ru")
+        assert calls == [("before", "translate"),
+                         ("after", "translate", True, None, True)]
+        assert self.server.requests[-1][2]['options'] == ["1"]
+        translator.remove_hook("before", before)
+        translator.remove_hook("after", after)
+        translator.translate("hello", "en-ru")
+        assert len(calls) == 2
+        with pytest.raises(ValueError):
+            translator.add_hook("never", before)
+        # getLangs in XML is made by the same way
+        translator = stub_client(Translator, self.server, "123", xml=True,
+                                 langs_ttl=0)
+        translator.add_hook("after", after)
+        assert translator.get_langs() == ["en-ru", "en"]
+        assert calls[-1] == ("after", "langs", True, None, True)
@@ -0,0 +1,65 @@
+from time import time
+
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.quota import RateLimiter, TokenBucket
+from pyLinguist.Translate import Translator
+
+
+class TestTokenBucket:
+    def test_bucket(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0 < bucket.reserve() <= 0.01
+        start = time()
+        bucket.acquire()
+        assert time() - start >= 0.01
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    def test_daily_quota(self):
+        limiter = RateLimiter(requests_per_day=2, chars_per_day=10)
+        limiter.acquire("key", 5)
+        with pytest.raises(YaTranslateException) as excinfo:
+            limiter.acquire("key", 6)
+        assert excinfo.value.args[1] == 404
+        limiter.acquire("key", 5)
+        with pytest.raises(YaTranslateException) as excinfo:
+            limiter.acquire("key", 0)
+        assert excinfo.value.args[1] == 403
+        limiter.acquire("other", 10)
+        assert limiter.usage("key") == {'requests': 2, 'chars': 10}
+
+    def test_shared_file(self, tmpdir):
+        path = str(tmpdir.join("quota.json"))
+        first = RateLimiter(requests_per_day=3, path=path)
+        second = RateLimiter(requests_per_day=3, path=path)
+        first.acquire("key", 1)
+        second.acquire("key", 2)
+        first.acquire("key", 3)
+        assert second.usage("key") == {'requests': 3, 'chars': 6}
+        with pytest.raises(YaTranslateException):
+            second.acquire("key")
+        with open(path) as file:
+            assert "key" not in file.read()
+
+    def test_client(self):
+        server = StubServer(fake_api)
+        try:
+            limiter = RateLimiter(rate=1000, chars_per_day=12)
+            translator = stub_client(Translator, server, "123",
+                                     limiter=limiter)
+            assert translator.limiter is limiter
+            translator.translate(["hello", "world"], 'en-ru')
+            assert limiter.usage("123") == {'requests': 1, 'chars': 10}
+            requests_count = len(server.requests)
+            with pytest.raises(YaTranslateException):
+                translator.translate("hello", 'en-ru')
+            assert len(server.requests) == requests_count
+        finally:
+            server.close()
@@ -0,0 +1,180 @@
+import json
+import pickle
+import tracemalloc
+from copy import deepcopy
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist import results
+from pyLinguist.cache import CompletionCache, LRUCache, SQLiteCache
+from pyLinguist.decoding import loads_json
+from pyLinguist.Prediction import Predictor
+from pyLinguist.Translate import Translator
+from pyLinguist.Vocabulary import Dictionary, Speller
+
+# the same responses in JSON and XML
+TRANSLATE = (
+    b'{"code": 200, "lang": "en-ru", "text": ["a", "b"]}',
+    b'<Translation code="200" lang="en-ru"><text>a</text><text>b</text>'
+    b'</Translation>'
+)
+LOOKUP = (
+    json.dumps({'head': {}, 'def': [{
+        'text': "time", 'pos': "noun", 'ts': "taɪm", 'tr': [{
+            'text': "время", 'pos': "noun", 'gen': "ср",
+            'syn': [{'text': "раз", 'pos': "noun", 'gen': "м"}],
+            'mean': [{'text': "timing"}],
+            'ex': [{'text': "prehistoric time",
+                    'tr': [{'text': "доисторическое время"}]}]
+        }]
+    }]}, ensure_ascii=False).encode('utf-8'),
+    '<DicResult><head/><def pos="noun" ts="taɪm"><text>time</text>'
+    '<tr pos="noun" gen="ср"><text>время</text>'
+    '<syn pos="noun" gen="м"><text>раз</text></syn>'
+    '<mean><text>timing</text></mean>'
+    '<ex><text>prehistoric time</text><tr><text>доисторическое время</text>'
+    '</tr></ex></tr></def></DicResult>'.encode('utf-8')
+)
+CHECK_TEXT = (
+    b'[{"code": 1, "pos": 4, "row": 0, "col": 4, "len": 5, "word": "quikc",'
+    b' "s": ["quick", "quack"]}]',
+    b'<SpellResult><error code="1" pos="4" row="0" col="4" len="5">'
+    b'<word>quikc</word><s>quick</s><s>quack</s></error></SpellResult>'
+)
+CHECK_TEXTS = (
+    b'[[], [{"code": 1, "pos": 4, "row": 0, "col": 4, "len": 5,'
+    b' "word": "quikc", "s": ["quick", "quack"]}]]',
+    b'<ArrayOfSpellResult><SpellResult/><SpellResult>'
+    b'<error code="1" pos="4" row="0" col="4" len="5"><word>quikc</word>'
+    b'<s>quick</s><s>quack</s></error></SpellResult></ArrayOfSpellResult>'
+)
+COMPLETE = (
+    b'{"endOfWord": false, "pos": -3, "text": ["brown", "bronze"]}',
+    b'<CompleteResponse endOfWord="false" pos="-3"><text><string>brown'
+    b'</string><string>bronze</string></text></CompleteResponse>'
+)
+
+
+def retained_memory(func: callable) -> int:
+    """Memory taken by result of func."""
+    tracemalloc.start()
+    try:
+        __ = func()
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+class TestResults:
+    def test_json_and_xml(self):
+        for result_type, bodies in ((results.Translation, TRANSLATE),
+                                    (results.Lookup, LOOKUP),
+                                    (results.SpellCheck, CHECK_TEXT),
+                                    (results.SpellChecks, CHECK_TEXTS),
+                                    (results.Completion, COMPLETE)):
+            from_json = result_type.from_body(bodies[0])
+            from_xml = result_type.from_body(bodies[1], xml=True)
+            assert from_json == from_xml
+            assert hash(from_json) == hash(from_xml)
+            assert from_json.to_json() == from_xml.to_json()
+            assert result_type.from_json(from_json.to_json()) == from_json
+
+    def test_fields(self):
+        translation = results.Translation.from_body(TRANSLATE[0])
+        assert translation.lang == "en-ru"
+        assert translation.text == ("a", "b")
+        entry = results.Lookup.from_body(LOOKUP[1], xml=True)[0]
+        assert (entry.text, entry.pos, entry.ts) == ("time", "noun", "taɪm")
+        tr = entry.tr[0]
+        assert (tr.text, tr.gen, tr.mean) == ("время", "ср", ("timing", ))
+        assert tr.syn == (results.DictWord("раз", "noun", "м"), )
+        assert tr.ex[0].tr == ("доисторическое время", )
+        error = results.SpellCheck.from_body(CHECK_TEXT[1], xml=True)[0]
+        assert (error.code, error.len, error.word) == (1, 5, "quikc")
+        assert error.s == ("quick", "quack")
+        checks = results.SpellChecks.from_body(CHECK_TEXTS[0])
+        assert [len(check) for check in checks] == [0, 1]
+        completion = results.Completion.from_body(COMPLETE[1], xml=True)
+        assert (completion.end_of_word, completion.pos) == (False, -3)
+        assert completion.text == ("brown", "bronze")
+        assert repr(completion) == "Completion(end_of_word=False, pos=-3, " \
+            "text=('brown', 'bronze'))"
+
+    def test_lazy(self):
+        lookup = results.Lookup.from_body(LOOKUP[0])
+        assert lookup._raw is not None
+        copy = deepcopy(lookup)  # shares body, parsed separately
+        assert copy is not lookup and copy._raw is lookup._raw
+        assert len(lookup) == 1
+        assert lookup._raw is None and copy._raw is not None
+        assert deepcopy(lookup) is lookup
+        assert pickle.loads(pickle.dumps(copy))._raw == copy._raw
+        assert pickle.loads(pickle.dumps(lookup)) == lookup
+        assert lookup.entries[0].text == "time"
+
+    def test_memory(self):
+        body = json.dumps({'head': {}, 'def': [
+            {'text': "word{}".format(idx), 'pos': "noun", 'tr': [
+                {'text': "слово", 'pos': "noun", 'syn': [{'text': "речь"}],
+                 'ex': [{'text': "a word", 'tr': [{'text': "слово"}]}]}
+            ]} for idx in range(20)
+        ]}, ensure_ascii=False).encode('utf-8')
+
+        def parse(body: bytes) -> results.Lookup:
+            lookup = results.Lookup.from_body(body)
+            lookup.entries
+            return lookup
+
+        raw = retained_memory(lambda: [loads_json(body)
+                                       for __ in range(200)])
+        lazy = retained_memory(lambda: [results.Lookup.from_body(body)
+                                        for __ in range(200)])
+        parsed = retained_memory(lambda: [parse(body) for __ in range(200)])
+        assert lazy < raw // 20
+        assert parsed < raw * 2 // 3
+
+
+class TestTypedClients:
+    def setup_method(self):
+        self.server = StubServer(fake_api)
+
+    def teardown_method(self):
+        self.server.close()
+
+    def test_translator(self):
+        for xml in (False, True):
+            translator = stub_client(Translator, self.server, "123", xml=xml,
+                                     typed=True)
+            result = translator.translate("hello", "en-ru")
+            assert isinstance(result, results.Translation)
+            assert result == results.Translation("en-ru", ("HELLO", ))
+            assert translator.translate_many(["a", "b"], "en-ru") == \
+                ["A", "B"]
+            long_text = "hello. " * 1000
+            assert translator.translate(long_text, "en-ru").text == \
+                (long_text.upper(), )
+
+    def test_clients(self):
+        dictionary = stub_client(Dictionary, self.server, "123", typed=True)
+        assert dictionary.lookup("time", "en-ru") == results.Lookup(())
+        assert dictionary.definitions("time", "en-ru") == ()
+        predictor = stub_client(Predictor, self.server, "123", typed=True,
+                                cache=CompletionCache())
+        completion = predictor.complete("en", "he")
+        assert completion == results.Completion(False, -2, ("hello", ))
+        assert predictor.complete("en", "hel").text == ("hello", )
+        # the second result is derived from the first one
+        assert [path for __, path, __ in self.server.requests
+                if path.endswith("complete")] == ["/json/complete"]
+        for xml in (False, True):
+            speller = stub_client(Speller, self.server, xml=xml, typed=True)
+            assert speller.check_text("helo")[0].word == "helo"
+            checks = speller.check_texts(["helo", "wrld"])
+            assert [check[0].word for check in checks] == ["helo", "wrld"]
+
+    def test_cache(self):
+        for cache in (LRUCache(), SQLiteCache(":memory:")):
+            translator = stub_client(Translator, self.server, "123",
+                                     typed=True, cache=cache)
+            first = translator.translate("hello", "en-ru")
+            assert translator.translate("hello", "en-ru") == first
+        assert len(self.server.requests) == 2
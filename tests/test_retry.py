@@ -0,0 +1,151 @@
+import socket
+from time import sleep, time
+
+import pytest
+
+from . import YaTranslateException
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.exc import YaCircuitOpenException, YaNetworkException
+from pyLinguist.quota import RateLimiter
+from pyLinguist.retry import CircuitBreaker, RetryPolicy
+from pyLinguist.Translate import Translator
+
+
+class TestRetryPolicy:
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3)
+        assert policy.should_retry(YaTranslateException(503), 0)
+        assert policy.should_retry(YaNetworkException(OSError()), 1)
+        assert not policy.should_retry(YaTranslateException(503), 2)
+        assert not policy.should_retry(YaTranslateException(401), 0)
+        assert not policy.should_retry(YaCircuitOpenException("host"), 0)
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        assert [policy.delay(attempt) for attempt in range(5)] == \
+            [1, 2, 4, 5, 5]
+        policy.jitter = True
+        assert all(0 <= policy.delay(3) <= 5 for __ in range(100))
+
+
+class TestCircuitBreaker:
+    def test_states(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.01)
+        breaker.record("host", 503)
+        breaker.record("host", 400)  # resets failures
+        breaker.record("host", 503)
+        breaker.record("host", 501)  # not supported direction isn't outage
+        assert breaker.states["host"]['failures'] == 0
+        breaker.record("host", 503)
+        breaker.before("host")
+        breaker.record("host", 503)
+        assert breaker.state("host") == CircuitBreaker.OPEN
+        with pytest.raises(YaCircuitOpenException):
+            breaker.before("host")
+        breaker.before("other")
+        sleep(0.01)
+        breaker.before("host")  # trial request
+        assert breaker.state("host") == CircuitBreaker.HALF_OPEN
+        with pytest.raises(YaCircuitOpenException):
+            breaker.before("host")
+        breaker.record("host", 503)
+        assert breaker.state("host") == CircuitBreaker.OPEN
+        sleep(0.01)
+        assert breaker.before("host")
+        breaker.release("host")  # trial request wasn't sent
+        assert breaker.state("host") == CircuitBreaker.OPEN
+        assert breaker.before("host")
+        breaker.record("host")
+        assert not breaker.before("host")
+        assert breaker.states["host"] == {
+            'state': CircuitBreaker.CLOSED, 'failures': 0, 'opened': None
+        }
+
+
+class TestClientRetries:
+    def setup_class(self):
+        failures = self.failures = [0]
+
+        def responder(*args) -> tuple:
+            if failures[0]:
+                failures[0] -= 1
+                return 503, b""
+            return fake_api(*args)
+
+        self.server = StubServer(responder)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_retry(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 retry=RetryPolicy(backoff=0.001))
+        self.failures[0] = 2
+        assert translator.translate("hi", 'en-ru')['text'] == ["HI"]
+        self.failures[0] = 3
+        with pytest.raises(YaTranslateException) as excinfo:
+            translator.translate("hi", 'en-ru')
+        assert excinfo.value.status_code == 503
+        self.failures[0] = 0
+
+    def test_breaker(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 breaker=CircuitBreaker(failure_threshold=1))
+        self.failures[0] = 1
+        with pytest.raises(YaTranslateException):
+            translator.translate("hi", 'en-ru')
+        requests_count = len(self.server.requests)
+        with pytest.raises(YaCircuitOpenException):
+            translator.translate("hi", 'en-ru')
+        assert len(self.server.requests) == requests_count
+
+    def test_breaker_and_limiter(self):
+        # trial request stopped by limiter doesn't keep circuit half-open
+        limiter = RateLimiter(requests_per_day=1)
+        translator = stub_client(
+            Translator, self.server, "123", limiter=limiter,
+            breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        )
+        self.failures[0] = 1
+        with pytest.raises(YaTranslateException):
+            translator.translate("hi", 'en-ru')
+        sleep(0.05)
+        with pytest.raises(YaTranslateException) as excinfo:
+            translator.translate("hi", 'en-ru')
+        assert excinfo.value.status_code == 403
+        limiter.requests_per_day = None
+        assert translator.translate("hi", 'en-ru')['text'] == ["HI"]
+        assert [state['state'] for state
+                in translator.breaker.states.values()] == \
+            [CircuitBreaker.CLOSED]
+
+    def test_open_circuit_not_charged(self):
+        # requests rejected by open circuit don't use quota or tokens
+        limiter = RateLimiter(rate=1, burst=2)
+        translator = stub_client(
+            Translator, self.server, "123", limiter=limiter,
+            breaker=CircuitBreaker(failure_threshold=2)
+        )
+        self.failures[0] = 2
+        started = time()
+        for __ in range(10):
+            with pytest.raises(YaTranslateException):
+                translator.translate("hi", 'en-ru')
+        assert time() - started < 0.5  # no waiting for tokens
+        assert limiter.usage("123")['requests'] == 2
+
+    def test_network_error(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()  # nobody listens this port
+        translator = Translator("123", retry=True, breaker=True)
+        translator._url = "http://127.0.0.1:{}/".format(port)
+        translator._retry.backoff = 0.001
+        with pytest.raises(YaNetworkException) as excinfo:
+            translator.translate("hi", 'en-ru')
+        assert isinstance(excinfo.value.error, OSError)
+        assert translator.breaker.states["127.0.0.1:{}".format(port)][
+            'failures'] == 3
@@ -0,0 +1,123 @@
+import json
+import os
+from functools import partial
+
+import pytest
+
+from .commons import StubServer, fake_api
+from pyLinguist.runner import JobJournal, translate_corpus
+
+
+def make_translator(url: str, crash_marker: str=None, fail: bool=False):
+    """Translator of worker process making requests to StubServer."""
+    from pyLinguist.Translate import Translator
+    from pyLinguist.transport import ConnectionPool
+    translator = Translator("123" if not fail else "fail",
+                            pool=ConnectionPool())
+    translator._url = "{}json/".format(url)
+    if crash_marker:
+        translate_stream = translator.translate_stream
+
+        def crash_once(*args, **kwargs) -> ...:
+            if not os.path.exists(crash_marker):
+                open(crash_marker, 'w').close()
+                os._exit(3)  # worker dies in the middle of shard
+            return translate_stream(*args, **kwargs)
+
+        translator.translate_stream = crash_once
+    return translator
+
+
+class TestJobJournal:
+    def test_shards(self, tmpdir):
+        journal = JobJournal(str(tmpdir.join("job.journal")), max_attempts=2)
+        shards = [(0, 10, 2), (10, 20, 2), (20, 25, 1)]
+        assert not journal.setup({'input': "a"}, shards)
+        assert journal.claim(1) == (0, 0, 10)
+        assert journal.claim(2) == (1, 10, 20)
+        journal.done(0)
+        assert journal.release(2) == 1
+        assert journal.counts() == {'pending': 2, 'running': 0, 'done': 1,
+                                    'failed': 0}
+        assert journal.claim(3) == (1, 10, 20)
+        journal.fail(1, "error")  # the second attempt
+        assert journal.shards()[1][2:] == ("failed", "error")
+        # the same job is continued, failed shards are tried again
+        assert journal.setup({'input': "a"}, shards)
+        assert journal.counts()['done'] == 1
+        assert not journal.setup({'input': "b"}, shards[:1])
+        assert journal.counts()['pending'] == 1
+        journal.close()
+
+
+class TestRunner:
+    def setup_class(self):
+        def responder(method: str, path: str, params: dict,
+                      headers: dict) -> tuple:
+            # translator with "fail" key can't translate the last shard
+            if params.get('key') == ["fail"] and \
+                    "line 17" in params.get('text', []):
+                return 401, b""
+            return fake_api(method, path, params, headers)
+
+        self.server = StubServer(responder)
+        self.factory = partial(make_translator, self.server.url)
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_corpus(self, tmpdir):
+        lines = ["line {}".format(idx) for idx in range(95)]
+        source = tmpdir.join("input.txt")
+        source.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        output = str(tmpdir.join("output.txt"))
+        stats = translate_corpus(str(source), output, "en-ru", processes=3,
+                                 shard_lines=10, factory=self.factory,
+                                 poll=0.01)
+        assert stats == {'lines': 95, 'translated': 95, 'resumed': 0,
+                         'shards': 10, 'restarts': 0}
+        with open(output, encoding='utf-8') as file:
+            assert file.read().splitlines() == [line.upper()
+                                                for line in lines]
+        assert not os.path.exists(output + ".journal")
+        assert not os.path.exists(output + ".parts")
+
+    def test_jsonl(self, tmpdir):
+        source = tmpdir.join("input.jsonl")
+        source.write_text("".join(
+            json.dumps({'id': idx, 'text': "cat {}".format(idx)}) + "\n"
+            for idx in range(7)
+        ), encoding='utf-8')
+        output = str(tmpdir.join("output.jsonl"))
+        translate_corpus(str(source), output, "en-ru", processes=2,
+                         shard_lines=3, factory=self.factory, poll=0.01)
+        with open(output, encoding='utf-8') as file:
+            assert [json.loads(line)['text'] for line in file] == \
+                ["CAT {}".format(idx) for idx in range(7)]
+
+    def test_crash_and_resume(self, tmpdir):
+        source = tmpdir.join("input.txt")
+        source.write_text("".join("line {}\n".format(idx)
+                                  for idx in range(20)), encoding='utf-8')
+        output = str(tmpdir.join("output.txt"))
+        stats = translate_corpus(
+            str(source), output, "en-ru", processes=2, shard_lines=5,
+            factory=partial(make_translator, self.server.url,
+                            str(tmpdir.join("crashed"))),
+            poll=0.01
+        )
+        assert stats['restarts'] == 1 and stats['translated'] == 20
+        # failed job keeps done shards for the next run
+        with pytest.raises(RuntimeError):
+            translate_corpus(str(source), output, "en-ru", processes=2,
+                             shard_lines=5, max_attempts=1, poll=0.01,
+                             factory=partial(make_translator,
+                                             self.server.url, fail=True))
+        assert os.path.exists(output + ".journal")
+        stats = translate_corpus(str(source), output, "en-ru", processes=2,
+                                 shard_lines=5, factory=self.factory,
+                                 poll=0.01)
+        assert (stats['resumed'], stats['translated']) == (15, 5)
+        with open(output, encoding='utf-8') as file:
+            assert file.read() == "".join("LINE {}\n".format(idx)
+                                          for idx in range(20))
@@ -0,0 +1,89 @@
+from threading import Barrier, Thread
+from time import sleep
+
+from .commons import StubServer, fake_api, stub_client
+from pyLinguist.Translate import Translator
+from pyLinguist.Vocabulary import Dictionary
+
+
+def slow_api(method: str, path: str, params: dict, headers: dict) -> tuple:
+    if path.endswith("getLangs"):
+        sleep(0.1)
+    return fake_api(method, path, params, headers)
+
+
+def run_threads(func: callable, count: int=16) -> list:
+    barrier = Barrier(count)
+    results = [None] * count
+
+    def target(idx: int) -> None:
+        barrier.wait()
+        results[idx] = func()
+
+    threads = [Thread(target=target, args=(idx, )) for idx in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSharedClient:
+    def setup_method(self):
+        self.server = StubServer(slow_api)
+
+    def teardown_method(self):
+        self.server.close()
+
+    def _langs_requests(self) -> int:
+        return len([request for request in self.server.requests
+                    if request[1].endswith("getLangs")])
+
+    def test_langs_loaded_once(self):
+        # without coalescing only locks prevent duplicated requests
+        first = stub_client(Dictionary, self.server, "123", coalesce=False)
+        second = stub_client(Dictionary, self.server, "123", coalesce=False)
+        results = run_threads(
+            lambda: first._lang_supported("en-ru") and
+            second._lang_supported("en-ru")
+        )
+        assert all(results)
+        assert self._langs_requests() == 1
+
+    def test_langs_published_with_index(self):
+        # client asking in the middle of saving results sees both or none
+        dictionary = stub_client(Dictionary, self.server, "123")
+        build_index = dictionary._build_langs_index
+
+        def slow_build_index(langs: list) -> frozenset:
+            sleep(0.2)
+            return build_index(langs)
+
+        dictionary._build_langs_index = slow_build_index
+        loader = Thread(target=dictionary._lang_supported, args=("en", ))
+        loader.start()
+        sleep(0.15)  # getLangs takes 0.1 seconds
+        try:
+            assert dictionary._lang_supported("en-ru")
+        finally:
+            loader.join()
+
+    def test_key_checked_once(self):
+        translator = stub_client(Translator, self.server, "123",
+                                 coalesce=False)
+        assert all(run_threads(lambda: translator.ok))
+        assert self._langs_requests() == 1
+        assert translator._api_key['correct']
+
+    def test_lookups(self):
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 coalesce=False, cache=True)
+        results = run_threads(lambda: dictionary.lookup("hello", "en-ru"))
+        assert all(result == {'def': []} for result in results)
+        assert self._langs_requests() == 1
+
+    def test_not_thread_safe(self):
+        dictionary = stub_client(Dictionary, self.server, "123",
+                                 thread_safe=False)
+        assert dictionary._lang_supported("en-ru")
+        assert dictionary.ok
@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+import pytest
+
+from . import YaBaseAPIHandler, YaTranslateException
+from .commons import StubServer
+from pyLinguist.transport import ConnectionPool, SingleFlight
+
+
+class TestConnectionPool:
+    def setup_class(self):
+        self.server = StubServer(
+            lambda method, path, params, headers:
+            (200, b'{"ok": true}') if path != "/fail" else (503, b"")
+        )
+
+    def teardown_class(self):
+        self.server.close()
+
+    def test_reuse(self):
+        pool = ConnectionPool(maxsize=2)
+        for __ in range(5):
+            response = pool.urlopen("GET", self.server.url + "ok")
+            assert response.code == 200
+            assert response.read() == b'{"ok": true}'
+        assert pool.stats['created'] == 1
+        assert pool.stats['reused'] == 4
+        assert pool.stats['idle'] == 1
+        pool.clear()
+        assert pool.stats['idle'] == 0
+
+    def test_idle_eviction(self):
+        pool = ConnectionPool(idle_timeout=-1)
+        pool.urlopen("GET", self.server.url)
+        pool.urlopen("GET", self.server.url)
+        assert pool.stats['created'] == 2
+        assert pool.stats['reused'] == 0
+        assert pool.stats['discarded'] == 1
+
+    def test_prewarm(self):
+        pool = ConnectionPool(maxsize=3)
+        assert pool.prewarm(self.server.url, 5) == 3
+        assert pool.stats['idle'] == 3
+        pool.urlopen("GET", self.server.url)
+        assert pool.stats['reused'] == 1
+        assert pool.stats['created'] == 3
+        pool.clear()
+
+    def test_wrong_scheme(self):
+        with pytest.raises(ValueError):
+            ConnectionPool().urlopen("GET", "ftp://localhost/")
+        with pytest.raises(ValueError):
+            ConnectionPool(maxsize=0)
+
+    def test_redirect(self):
+        def responder(method: str, path: str, params: dict,
+                      headers: dict) -> tuple:
+            if path == "/new":
+                return 200, method.encode('ascii')
+            if path == "/loop":
+                return 302, b"", {'Location': "/loop"}
+            return int(path[1:]), b"", {'Location': "/new"}
+
+        server = StubServer(responder)
+        pool = ConnectionPool(max_redirects=3)
+        try:
+            response = pool.urlopen("GET", server.url + "301")
+            assert (response.code, response.read()) == (200, b"GET")
+            response = pool.urlopen("POST", server.url + "302", b"text=a")
+            assert (response.code, response.read()) == (200, b"GET")
+            assert server.requests[-1][2] == {}  # body is dropped
+            response = pool.urlopen("POST", server.url + "307", b"text=a")
+            assert (response.code, response.read()) == (200, b"POST")
+            assert server.requests[-1][2] == {'text': ["a"]}
+            count = len(server.requests)
+            assert pool.urlopen("GET", server.url + "loop").code == 302
+            assert len(server.requests) == count + 4
+        finally:
+            server.close()
+
+    def test_proxy(self):
+        hosts = []
+        proxy = StubServer(lambda method, path, params, headers:
+                           hosts.append(headers['Host']) or (200, b"proxied"))
+        try:
+            pool = ConnectionPool(proxies={'http': proxy.url})
+            response = pool.urlopen("GET", "http://example.invalid/path")
+            assert response.read() == b"proxied"
+            assert proxy.requests[-1][1] == "/path"
+            assert hosts == ["example.invalid"]
+            pool = ConnectionPool(proxies={})
+            assert pool.urlopen("GET", self.server.url).code == 200
+        finally:
+            proxy.close()
+
+    def test_handler(self):
+        pool = ConnectionPool()
+        handler = YaBaseAPIHandler("123", pool=pool)
+        assert handler.pool is pool
+        response = handler._make_request_json(self.server.url, text="hello")
+        assert response == {'ok': True}
+        response = handler._make_request_json(self.server.url, post=True,
+                                              text="hello")
+        assert response == {'ok': True}
+        assert self.server.requests[-1][0] == "POST"
+        assert self.server.requests[-1][2]['text'] == ["hello"]
+        assert pool.stats['reused'] == 1
+        with pytest.raises(YaTranslateException):
+            handler._make_request(self.server.url + "fail")
+
+
+class TestSingleFlight:
+    def test_do(self):
+        flight = SingleFlight()
+        started = Event()
+        release = Event()
+        calls = []
+
+        def slow() -> dict:
+            calls.append(1)
+            started.set()
+            release.wait()
+            return {'text': ["result"]}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            first = pool.submit(flight.do, "key", slow)
+            started.wait()
+            others = [pool.submit(flight.do, "key", slow) for __ in range(4)]
+            while flight.stats['shared'] < 4:
+                sleep(0.001)
+            release.set()
+            results = [first.result()] + [other.result() for other in others]
+        assert len(calls) == 1
+        assert all(result == {'text': ["result"]} for result in results)
+        assert len(set(id(result) for result in results)) == 5  # copies
+        assert flight.stats == {'calls': 1, 'shared': 4}
+        assert flight.do("key", lambda: 1) == 1
+        with pytest.raises(ZeroDivisionError):
+            flight.do("key", lambda: 1 / 0)
+
+    def test_client(self):
+        release = Event()
+
+        def responder(*args) -> tuple:
+            release.wait()
+            return 200, b'{"code": 200, "lang": "en-ru", "text": ["A"]}'
+
+        server = StubServer(responder)
+        try:
+            handler = YaBaseAPIHandler("123")
+            handler._url = server.url
+            handler._endpoints = {'translate': "translate"}
+            with ThreadPoolExecutor(max_workers=10) as pool:
+                futures = [pool.submit(handler.make_combined_request,
+                                       "translate", text="a", lang="en-ru")
+                           for __ in range(10)]
+                sleep(0.1)
+                release.set()
+                results = [future.result() for future in futures]
+            assert len(server.requests) == 1
+            assert all(result['text'] == ["A"] for result in results)
+            handler = YaBaseAPIHandler("123", coalesce=False)
+            assert handler._flight is None
+        finally:
+            server.close()